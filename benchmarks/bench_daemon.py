@@ -0,0 +1,53 @@
+"""
+Compare the latency of checking a single file with a new standalone command process against
+asking a running daemon, as an editor checking on save would.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_daemon
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+from benchmarks.corpus import make_corpus
+from flake8_quotes.daemon import Daemon, check_paths, get_parser, is_running, send
+
+
+def main(repeat=5, number=10):
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'module.py')
+        # A typical module rather than the smallest one
+        _, file_contents = sorted(make_corpus(files=9), key=lambda item: len(item[1]))[4]
+        with open(filename, 'w') as f:
+            f.writelines(file_contents)
+
+        socket_path = os.path.join(directory, 'daemon.sock')
+        daemon = Daemon(socket_path, get_parser().parse_args(['serve', socket_path]))
+        thread = threading.Thread(target=asyncio.run, args=(daemon.serve(),))
+        thread.start()
+        while not is_running(socket_path):
+            time.sleep(0.01)
+
+        def command():
+            subprocess.run([sys.executable, '-m', 'flake8_quotes', filename], stdout=subprocess.DEVNULL, check=False)
+
+        def warm_daemon():
+            check_paths(socket_path, [filename])
+
+        try:
+            for name, func in (('command', command), ('daemon', warm_daemon)):
+                best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+                print('{0:<8} {1:8.3f} ms/check ({2} lines)'.format(name, best * 1000, len(file_contents)))
+        finally:
+            send(socket_path, {'shutdown': True})
+            thread.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare finding docstrings with the token state machine against looking them up in the AST
+flake8 has already parsed, on the generated corpus.
+
+Parsing is not part of the AST timings as flake8 does it anyway, it is printed for reference.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_docstring_detection
+"""
+import ast
+import io
+import timeit
+import tokenize
+
+from benchmarks.corpus import make_corpus
+from flake8_quotes import get_ast_docstring_positions, mark_docstring_positions, mark_docstring_tokens
+
+
+def main(repeat=5, number=5):
+    files = []
+    for _, file_contents in make_corpus():
+        source = ''.join(file_contents)
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+        files.append((source, ast.parse(source), tokens))
+    token_count = sum(len(tokens) for _, _, tokens in files)
+
+    for _, tree, tokens in files:
+        assert (list(mark_docstring_positions(tokens, get_ast_docstring_positions(tree))) ==
+                list(mark_docstring_tokens(tokens)))
+
+    def by_tokens():
+        for _, _, tokens in files:
+            for _ in mark_docstring_tokens(tokens):
+                pass
+
+    def by_ast():
+        for _, tree, tokens in files:
+            for _ in mark_docstring_positions(tokens, get_ast_docstring_positions(tree)):
+                pass
+
+    def ast_index_only():
+        for _, tree, _ in files:
+            get_ast_docstring_positions(tree)
+
+    def parse():
+        for source, _, _ in files:
+            ast.parse(source)
+
+    for name, func in (('tokens', by_tokens), ('ast', by_ast), ('ast index', ast_index_only), ('(ast.parse)', parse)):
+        best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+        print('{0:<12} {1:8.3f} ms/corpus ({2} files, {3} tokens)'.format(
+            name, best * 1000, len(files), token_count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Compare checking a legacy file written in the other quote style in full against stopping at its
+first error with `--quotes-max-errors-per-file 1`, as `--fail-fast` does.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_early_termination
+"""
+import timeit
+
+from benchmarks.corpus import make_string_heavy_file
+from flake8_quotes import QuoteChecker
+
+
+class Options():
+    # DEV: Most strings of the file are errors when expecting double quotes
+    inline_quotes = '"'
+    quotes_max_errors_per_file = 0
+
+
+def main(repeat=5, number=10):
+    file_contents = make_string_heavy_file()
+
+    def check():
+        return sum(1 for _ in QuoteChecker(None, lines=file_contents).get_records())
+
+    for name, max_errors in (('full', 0), ('first error', 1)):
+        Options.quotes_max_errors_per_file = max_errors
+        QuoteChecker.parse_options(Options)
+        error_count = check()
+        best = min(timeit.repeat(check, repeat=repeat, number=number)) / number
+        print('{0:<12} {1:8.3f} ms/file ({2} lines, {3} errors)'.format(
+            name, best * 1000, len(file_contents), error_count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare getting top-level f-strings by slicing them out of their source lines against
+joining the strings of all of their tokens, as it was done before, on f-string heavy code.
+
+F-strings are only split into tokens with PEP 701, so this needs Python 3.12+.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fstrings
+"""
+import io
+import sys
+import timeit
+import tokenize
+
+from benchmarks.corpus import make_fstring_heavy_file
+from flake8_quotes import QuoteChecker, mark_docstring_tokens
+
+
+def join_fstrings(marked_tokens, check_inside_f_strings=False):
+    """`QuoteChecker._iter_strings()` as it was before"""
+    fstring_start = None
+    fstring_nesting = 0
+    fstring_buffer = []
+    for token, is_docstring in marked_tokens:
+        if token.type == tokenize.FSTRING_START:
+            if fstring_nesting == 0:
+                fstring_start = token.start
+            fstring_nesting += 1
+            fstring_buffer.append(token.string)
+        elif token.type == tokenize.FSTRING_END:
+            fstring_nesting -= 1
+            fstring_buffer.append(token.string)
+        elif fstring_nesting > 0:
+            fstring_buffer.append(token.string)
+
+        if token.type == tokenize.FSTRING_END and fstring_nesting == 0:
+            token_string = ''.join(fstring_buffer)
+            fstring_buffer[:] = []
+            if not check_inside_f_strings:
+                yield token_string, fstring_start, token.end, is_docstring
+                continue
+
+        if token.type in (tokenize.STRING, tokenize.FSTRING_START,):
+            if fstring_nesting > 0:
+                if check_inside_f_strings:
+                    yield token.string, token.start, token.end, is_docstring
+            else:
+                yield token.string, token.start, token.end, is_docstring
+
+
+class Options():
+    inline_quotes = "'"
+
+
+def main(repeat=5, number=20):
+    if not hasattr(tokenize, 'FSTRING_START'):
+        print('F-strings are single tokens before Python 3.12, nothing to compare')
+        return
+
+    QuoteChecker.parse_options(Options)
+    file_contents = make_fstring_heavy_file()
+    tokens = list(tokenize.generate_tokens(io.StringIO(''.join(file_contents)).readline))
+    checker = QuoteChecker(None, lines=file_contents)
+    marked_tokens = list(mark_docstring_tokens(tokens))
+    assert list(join_fstrings(marked_tokens)) == list(checker._iter_strings(marked_tokens))
+
+    def joined():
+        for _ in join_fstrings(marked_tokens):
+            pass
+
+    def sliced():
+        for _ in checker._iter_strings(marked_tokens):
+            pass
+
+    for name, func in (('joined', joined), ('sliced', sliced)):
+        best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+        print('{0:<8} {1:8.3f} ms/file ({2} tokens)'.format(name, best * 1000, len(tokens)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
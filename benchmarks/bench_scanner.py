@@ -0,0 +1,53 @@
+"""
+Compare tokenizing the generated corpus with `tokenize` against the string scanner, on their own
+and as part of checking each file with `--quotes-lexer`.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scanner
+"""
+import io
+import timeit
+import tokenize
+
+from benchmarks.corpus import make_corpus
+from flake8_quotes import QuoteChecker
+from flake8_quotes.scanner import scan_tokens
+
+
+class Options():
+    inline_quotes = "'"
+    quotes_lexer = 'tokenize'
+
+
+def main(repeat=5, number=3):
+    corpus = make_corpus()
+    sources = [''.join(file_contents) for _, file_contents in corpus]
+    line_count = sum(len(file_contents) for _, file_contents in corpus)
+
+    def tokenize_only():
+        for source in sources:
+            for _ in tokenize.generate_tokens(io.StringIO(source).readline):
+                pass
+
+    def scanner_only():
+        for source in sources:
+            for _ in scan_tokens(source):
+                pass
+
+    def check():
+        for _, file_contents in corpus:
+            for _ in QuoteChecker(None, lines=file_contents).get_records():
+                pass
+
+    benchmarks = [('tokenize', None, tokenize_only), ('scanner', None, scanner_only)]
+    benchmarks.extend(('check ({0})'.format(lexer), lexer, check) for lexer in QuoteChecker.LEXERS)
+    for name, lexer, func in benchmarks:
+        Options.quotes_lexer = lexer or 'tokenize'
+        QuoteChecker.parse_options(Options)
+        best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+        print('{0:<18} {1:8.3f} ms/corpus ({2} files, {3} lines)'.format(name, best * 1000, len(corpus), line_count))
+
+
+if __name__ == '__main__':
+    main()
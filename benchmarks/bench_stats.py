@@ -0,0 +1,47 @@
+"""
+Measure the overhead of counting tokens, strings and errors with `--quotes-stats` over the
+generated corpus.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_stats
+"""
+import os
+import tempfile
+import timeit
+
+from benchmarks.corpus import make_corpus
+from flake8_quotes import QuoteChecker
+
+
+class Options():
+    inline_quotes = "'"
+    quotes_stats = None
+
+
+def main(repeat=5, number=2):
+    corpus = make_corpus()
+
+    def check():
+        for _, file_contents in corpus:
+            for _ in QuoteChecker(None, lines=file_contents).get_records():
+                pass
+
+    stats_path = os.path.join(tempfile.mkdtemp(), 'stats.json')
+    # DEV: Runs are interleaved, so that both are equally affected by whatever else the machine does
+    timings = {None: [], stats_path: []}
+    for _ in range(repeat):
+        for path in timings:
+            Options.quotes_stats = path
+            QuoteChecker.parse_options(Options)
+            timings[path].append(timeit.timeit(check, number=number) / number)
+            if QuoteChecker.stats is not None:
+                QuoteChecker.stats.finish()
+    for path, name in ((None, 'off'), (stats_path, 'stats')):
+        print('{0:<6} {1:8.3f} ms/corpus ({2} files)'.format(name, min(timings[path]) * 1000, len(corpus)))
+    os.remove(stats_path)
+    os.rmdir(os.path.dirname(stats_path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare checking string literals with the config compiled into a specialized function
+against looking everything up in the config dict for each string, as it was before, and
+against the compiled function remembering its verdicts for repeated strings.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_string_checks
+"""
+import io
+import timeit
+import tokenize
+
+from benchmarks.corpus import make_corpus, make_string_heavy_file
+from flake8_quotes import QuoteChecker, get_docstring_positions
+from flake8_quotes.string_checks import compile_string_check, get_verdict_cache_stats
+
+
+def dict_lookup_check_string(config, token_string, token_start, is_docstring):
+    """`QuoteChecker._check_string()` as it was before compiling the config"""
+    last_quote_char = token_string[-1]
+    first_quote_index = token_string.index(last_quote_char)
+    prefix = token_string[:first_quote_index].lower()
+    unprefixed_string = token_string[first_quote_index:]
+    is_multiline_string = unprefixed_string[0] * 3 == unprefixed_string[0:3]
+    start_row, start_col = token_start
+
+    if is_docstring:
+        if config['good_docstring'] in unprefixed_string:
+            return
+        yield {'message': 'Q002 ' + config['docstring_error_message'], 'line': start_row, 'col': start_col}
+    elif is_multiline_string:
+        if config['good_multiline'] in unprefixed_string:
+            return
+        if unprefixed_string.endswith(config['good_multiline_ending']):
+            return
+        yield {'message': 'Q001 ' + config['multiline_error_message'], 'line': start_row, 'col': start_col}
+    else:
+        string_contents = unprefixed_string[1:-1]
+        if last_quote_char == config['good_single']:
+            if not config['avoid_escape'] or 'r' in prefix:
+                return
+            if config['good_single'] in string_contents and not config['bad_single'] in string_contents:
+                yield {'message': 'Q003 Change outer quotes to avoid escaping inner quotes',
+                       'line': start_row, 'col': start_col}
+            return
+        if config['good_single'] not in string_contents:
+            yield {'message': 'Q000 ' + config['single_error_message'], 'line': start_row, 'col': start_col}
+
+
+def get_strings(file_contents):
+    tokens = list(tokenize.generate_tokens(io.StringIO(''.join(file_contents)).readline))
+    docstring_positions = get_docstring_positions(tokens)
+    return [(token.string, token.start, token.start in docstring_positions)
+            for token in tokens if token.type == tokenize.STRING]
+
+
+def main(repeat=5, number=20):
+    # Every string of the string heavy file is different, unlike in the corpus where most are repeated
+    corpus = [line for _, file_contents in make_corpus(files=10) for line in file_contents]
+    datasets = (('strings', get_strings(make_string_heavy_file())), ('corpus', get_strings(corpus)))
+
+    for inline_quotes in ("'", '"'):
+        class Options():
+            pass
+        Options.inline_quotes = inline_quotes
+        QuoteChecker.parse_options(Options)
+        config = QuoteChecker.config
+
+        for dataset, strings in datasets:
+            def dict_lookups():
+                for token_string, token_start, is_docstring in strings:
+                    for error in dict_lookup_check_string(config, token_string, token_start, is_docstring):
+                        pass
+
+            def compiled():
+                check_string = compile_string_check(config, cache_size=0)
+                for token_string, token_start, is_docstring in strings:
+                    check_string(token_string, is_docstring)
+
+            cached_check_string = compile_string_check(config)
+            cached_check_string.cache_clear()
+
+            def cached():
+                check_string = cached_check_string
+                for token_string, token_start, is_docstring in strings:
+                    check_string(token_string, is_docstring)
+
+            for name, func in (('dict lookups', dict_lookups), ('compiled', compiled), ('cached', cached)):
+                best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+                print('{0} {1:<8} {2:<13} {3:8.3f} ms ({4} strings)'.format(
+                    inline_quotes, dataset, name, best * 1000, len(strings)))
+            stats = get_verdict_cache_stats(cached_check_string)
+            print('{0} {1:<8} verdict cache: {2:.1f}% hit rate'.format(
+                inline_quotes, dataset, 100.0 * stats['hits'] / (stats['hits'] + stats['misses'])))
+
+
+if __name__ == '__main__':
+    main()
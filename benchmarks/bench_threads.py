@@ -0,0 +1,52 @@
+"""
+Measure how checking the generated corpus scales with the number of threads or processes, via
+`check_sources()`.
+
+Threads only run in parallel on free-threaded Python 3.13+ (e.g. `python3.13t`), elsewhere they
+take turns on the GIL and this shows the overhead of the thread pool.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_threads
+"""
+import multiprocessing
+import sys
+import timeit
+
+from benchmarks.corpus import make_corpus
+from flake8_quotes.api import POOL_MIN_SOURCES, check_sources
+
+
+def _get_job_counts(max_jobs):
+    job_counts = [1]
+    while job_counts[-1] * 2 <= max_jobs:
+        job_counts.append(job_counts[-1] * 2)
+    return job_counts
+
+
+def main(repeat=3, number=1, max_jobs=None):
+    corpus = [(name, ''.join(file_contents)) for name, file_contents in make_corpus()]
+    # Enough copies of the corpus for batches to be spread over the pool
+    sources = corpus * (POOL_MIN_SOURCES // len(corpus) + 1)
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('{0} sources, GIL {1}'.format(len(sources), 'enabled' if is_gil_enabled else 'disabled'))
+
+    baseline = None
+    for jobs in _get_job_counts(max_jobs or multiprocessing.cpu_count()):
+        for name, threads in (('threads', True), ('processes', False)):
+            if jobs == 1 and not threads:
+                continue
+
+            def check():
+                for _ in check_sources(sources, jobs=jobs, threads=threads):
+                    pass
+
+            best = min(timeit.repeat(check, repeat=repeat, number=number)) / number
+            if baseline is None:
+                baseline = best
+            print('{0:>3} {1:<10} {2:8.1f} ms ({3:.2f}x)'.format(
+                jobs, name if jobs > 1 else 'serial', best * 1000, baseline / best))
+
+
+if __name__ == '__main__':
+    main()
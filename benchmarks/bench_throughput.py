@@ -0,0 +1,166 @@
+"""
+Throughput and peak memory of `QuoteChecker.run()` and `get_docstring_tokens()` over a synthetic corpus.
+
+Times are also reported relative to plain `tokenize`, which is what the baseline in `baseline.json`
+stores per Python version: unlike files/sec it hardly depends on the machine running the benchmark.
+With `FLAKE8_QUOTES_BENCHMARKS=1`, `test/test_benchmarks.py` fails when a result regresses past the baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_throughput
+    # Update the baseline after an intended change
+    python -m benchmarks.bench_throughput --save-baseline
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import sys
+import time
+import tokenize
+import tracemalloc
+
+from benchmarks.corpus import make_corpus
+from flake8_quotes import QuoteChecker, get_docstring_tokens
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+# How much worse than the baseline a result may get before it counts as a regression, timings
+# being noisy on shared machines
+TIME_TOLERANCE = 2.0
+MEMORY_TOLERANCE = 1.25
+# Corpus the baseline is measured on, small enough for the test suite
+BASELINE_FILES = 18
+BASELINE_SEED = 0
+
+
+class Options():
+    inline_quotes = "'"
+
+
+def _tokenize(lines):
+    return list(tokenize.generate_tokens(io.StringIO(''.join(lines)).readline))
+
+
+def _time(func, corpus):
+    start = time.perf_counter()
+    for item in corpus:
+        func(item)
+    return time.perf_counter() - start
+
+
+def _peak_memory(func, item):
+    """Get the most memory allocated at once by `func(item)`"""
+    # Don't let a collection of earlier garbage happen while tracing
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(item)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(files=BASELINE_FILES, seed=BASELINE_SEED, repeat=5):
+    """Get `{benchmark: {'files_per_second', 'tokens_per_second', 'relative_time', 'peak_memory'}}`."""
+    QuoteChecker.parse_options(Options)
+    corpus = [lines for _, lines in make_corpus(files=files, seed=seed)]
+    tokenized_corpus = [_tokenize(lines) for lines in corpus]
+    token_count = sum(len(tokens) for tokens in tokenized_corpus)
+
+    def run(lines):
+        list(QuoteChecker(None, lines=lines).run())
+
+    benchmarks = (
+        ('tokenize', _tokenize, corpus),
+        ('run', run, corpus),
+        ('get_docstring_tokens', get_docstring_tokens, tokenized_corpus),
+    )
+    # DEV: The benchmarks take turns, so that a busy machine slows all of them down alike
+    times = {name: [] for name, _, _ in benchmarks}
+    for _ in range(repeat):
+        for name, func, inputs in benchmarks:
+            times[name].append(_time(func, inputs))
+
+    results = {}
+    tokenize_time = min(times['tokenize'])
+    for name, func, inputs in benchmarks:
+        elapsed = min(times[name])
+        results[name] = {
+            'files_per_second': len(inputs) / elapsed,
+            'tokens_per_second': token_count / elapsed,
+            'relative_time': elapsed / tokenize_time,
+            # DEV: Tracing allocations is slow, and the biggest file is the one which matters
+            'peak_memory': _peak_memory(func, max(inputs, key=len)),
+        }
+    return results
+
+
+def get_python_version():
+    return '{0}.{1}'.format(*sys.version_info)
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Get the baseline results for the running Python version, or `None` if there are none."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f).get(get_python_version())
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    baselines = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            baselines = json.load(f)
+    baselines[get_python_version()] = {
+        name: {'relative_time': round(result['relative_time'], 3), 'peak_memory': result['peak_memory']}
+        for name, result in results.items() if name != 'tokenize'
+    }
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def get_regressions(results, baseline):
+    """Get a message for each result which is worse than the baseline by more than the tolerance."""
+    regressions = []
+    for name, expected in sorted(baseline.items()):
+        result = results[name]
+        for key, tolerance in (('relative_time', TIME_TOLERANCE), ('peak_memory', MEMORY_TOLERANCE)):
+            if result[key] > expected[key] * tolerance:
+                regressions.append('{0} {1} regressed: {2:.3f} > {3} * {4}'.format(
+                    name, key, result[key], expected[key], tolerance))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=BASELINE_FILES,
+                        help='Number of files in the corpus, only the default one is compared to the baseline')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed passes to take the best of')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline')
+    args = parser.parse_args(argv)
+
+    results = measure(files=args.files, seed=BASELINE_SEED, repeat=args.repeat)
+
+    print('{0:<22} {1:>10} {2:>12} {3:>10} {4:>10}'.format('', 'files/s', 'tokens/s', 'x tokenize', 'peak KiB'))
+    for name, result in results.items():
+        print('{0:<22} {1:10.0f} {2:12.0f} {3:10.2f} {4:10.0f}'.format(
+            name, result['files_per_second'], result['tokens_per_second'], result['relative_time'],
+            result['peak_memory'] / 1024))
+
+    if args.save_baseline:
+        save_baseline(results)
+        return 0
+    baseline = load_baseline()
+    if baseline and args.files == BASELINE_FILES:
+        regressions = get_regressions(results, baseline)
+        for regression in regressions:
+            print(regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Micro-benchmarks for the token representation used by the checker.
+
+Compares the previous property-based `Token` wrapper (with docstrings looked up in
+a set of wrappers) against plain `tokenize.TokenInfo` tuples (with docstrings
+looked up by start position).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_token_representation
+"""
+import tokenize
+import timeit
+
+from benchmarks.bench_tokenization import make_source
+from flake8_quotes import get_docstring_positions, get_docstring_tokens
+
+
+class PropertyToken:
+    """The `Token` wrapper as it was before switching to plain `TokenInfo`"""
+    def __init__(self, token):
+        self.token = token
+
+    @property
+    def type(self):
+        return self.token[0]
+
+    @property
+    def string(self):
+        return self.token[1]
+
+    @property
+    def start(self):
+        return self.token[2]
+
+
+def wrapped_tokens(token_infos):
+    tokens = [PropertyToken(t) for t in token_infos]
+    docstring_tokens = get_docstring_tokens(tokens)
+    for token in tokens:
+        if token.type == tokenize.STRING:
+            token.string, token.start, token in docstring_tokens
+
+
+def plain_tokens(token_infos):
+    docstring_positions = get_docstring_positions(token_infos)
+    for token in token_infos:
+        if token.type == tokenize.STRING:
+            token.string, token.start in docstring_positions
+
+
+def main(repeat=5, number=50):
+    file_contents = make_source()
+    token_infos = list(tokenize.generate_tokens(lambda L=iter(file_contents): next(L)))
+
+    for name, func in (('wrapper', wrapped_tokens), ('TokenInfo', plain_tokens)):
+        best = min(timeit.repeat(lambda: func(token_infos), repeat=repeat, number=number)) / number
+        print('{0:<10} {1:8.3f} ms/file ({2} tokens)'.format(name, best * 1000, len(token_infos)))
+
+
+if __name__ == '__main__':
+    main()
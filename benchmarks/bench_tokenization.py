@@ -0,0 +1,51 @@
+"""
+Compare the per-file time of tokenizing once in `QuoteChecker.run()` against
+tokenizing separately for noqa collection and quote checking.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tokenization
+"""
+import timeit
+
+from flake8_quotes import QuoteChecker
+
+
+def make_source(functions=200):
+    lines = ['"""Synthetic module docstring."""\n']
+    for i in range(functions):
+        lines.extend([
+            'def function_{0}(value):\n'.format(i),
+            '    """Function docstring."""\n',
+            "    key = 'key_{0}'\n".format(i),
+            '    other = "double_{0}"  # noqa\n'.format(i),
+            "    return {key: value, 'other': other}\n",
+            '\n',
+        ])
+    return lines
+
+
+class Options():
+    inline_quotes = "'"
+
+
+def main(repeat=5, number=20):
+    QuoteChecker.parse_options(Options)
+    file_contents = make_source()
+    checker = QuoteChecker(None, lines=file_contents)
+
+    def two_passes():
+        noqa_line_numbers = checker.get_noqa_lines(file_contents)
+        for error in checker.get_quotes_errors(file_contents):
+            error.get('line') not in noqa_line_numbers
+
+    def single_pass():
+        list(checker.run())
+
+    for name, func in (('two passes', two_passes), ('single pass', single_pass)):
+        best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+        print('{0:<12} {1:8.3f} ms/file ({2} lines)'.format(name, best * 1000, len(file_contents)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Compare feeding `tokenize.generate_tokens()` lines through a Python readline callback against
+`flake8_quotes.generate_tokens()`, which drives the C tokenizer directly on Python 3.12+, on
+large files made of the generated corpus.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tokenizer_input
+"""
+import timeit
+import tokenize
+
+from benchmarks.corpus import make_corpus
+from flake8_quotes import generate_tokens
+
+
+def main(repeat=5, number=2, files=3):
+    corpus = [line for _, file_contents in make_corpus() for line in file_contents]
+    # The whole corpus split in a few large files
+    size = len(corpus) // files + 1
+    large_files = [corpus[i:i + size] for i in range(0, len(corpus), size)]
+
+    def readline_callback():
+        for file_contents in large_files:
+            for _ in tokenize.generate_tokens(lambda L=iter(file_contents): next(L)):
+                pass
+
+    def direct():
+        for file_contents in large_files:
+            for _ in generate_tokens(file_contents):
+                pass
+
+    # DEV: Runs are interleaved, so that both are equally affected by whatever else the machine does
+    funcs = (('readline', readline_callback), ('direct', direct))
+    timings = {name: [] for name, _ in funcs}
+    for _ in range(repeat):
+        for name, func in funcs:
+            timings[name].append(timeit.timeit(func, number=number) / number)
+    for name, _ in funcs:
+        print('{0:<10} {1:8.3f} ms/corpus ({2} files, {3} lines)'.format(
+            name, min(timings[name]) * 1000, len(large_files), len(corpus)))
+
+
+if __name__ == '__main__':
+    main()
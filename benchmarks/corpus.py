@@ -0,0 +1,114 @@
+"""
+Deterministic synthetic corpus of Python files for benchmarks.
+
+Files vary in size from a handful of lines to a few thousand, and mix the constructs the
+checker spends its time on: docstrings of every kind, inline and multiline strings in both
+quote styles, nested f-strings, escaped quotes and `noqa` comments.
+"""
+import random
+
+# Number of top-level blocks in the files of the corpus, from tiny modules to big generated ones
+FILE_SIZES = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+MODULE_DOCSTRINGS = (
+    '"""Synthetic module {0}."""\n',
+    "'''\nSynthetic module {0}.\n\nWith a longer description.\n'''\n",
+    '# A comment before the docstring\n"""Synthetic module {0}."""\n',
+    '',
+)
+
+
+def _function(random_, i):
+    docstring = random_.choice((
+        '    """Function {0}."""\n',
+        "    '''\n    Function {0}.\n\n    :param value: Anything\n    '''\n",
+        "    'Function {0}.'\n",
+        '',
+    )).format(i)
+    body = random_.sample((
+        "    key = 'key_{0}'\n",
+        '    other = "double_{0}"\n',
+        '    noqa = "double_{0}"  # noqa\n',
+        "    escaped = 'it\\'s {0}'\n",
+        '    quoted = "say \'{0}\'"\n',
+        "    name = f'{{value}}_{0}'\n",
+        '    nested = f"{{value!r:>{{10}}}} {{\'inner\'}} {0}"\n',
+        "    multi = f'''{{value}}\n    line {0}\n    '''\n",
+        '    text = """\n    Not a docstring {0}\n    """\n',
+        "    raw = r'\\d+{0}'\n",
+        "    data = b'bytes_{0}'\n",
+    ), 4)
+    lines = ['def function_{0}(value, default="default_{0}"):\n'.format(i), docstring]
+    lines.extend(line.format(i) for line in body)
+    lines.append("    return {{key: value, 'other': other, 'index': {0}}}\n".format(i))
+    lines.append('\n\n')
+    return lines
+
+
+def _class(random_, i):
+    lines = [
+        'class Class{0}(object):\n'.format(i),
+        random_.choice(('    """Class {0}."""\n', "    '''Class {0}.'''\n", '')).format(i),
+        "    name = 'class_{0}'\n".format(i),
+        '\n',
+        '    def method(self, value):\n',
+        random_.choice(('        """Method."""\n', "        'Method.'\n", '')),
+        "        return f'{self.name}: {value}'\n",
+        '\n\n',
+    ]
+    return lines
+
+
+def make_file(random_, blocks, index):
+    lines = [random_.choice(MODULE_DOCSTRINGS).format(index), 'import os\n', '\n\n']
+    for i in range(blocks):
+        lines.extend(_function(random_, i) if random_.random() < 0.75 else _class(random_, i))
+    return ''.join(lines).splitlines(True)
+
+
+def make_corpus(files=45, seed=0):
+    """Get a list of `(filename, lines)` for `files` generated files, the same ones for the same `seed`."""
+    random_ = random.Random(seed)
+    return [('file_{0}.py'.format(index), make_file(random_, FILE_SIZES[index % len(FILE_SIZES)], index))
+            for index in range(files)]
+
+
+STRING_LITERALS = (
+    "'plain {0}'",
+    '"double {0}"',
+    "'it\\'s {0}'",
+    '"say \'{0}\'"',
+    "r'\\d+{0}'",
+    "b'bytes {0}'",
+    "f'{{value}} {0}'",
+    "'''multiline\n{0}\n'''",
+    '"""multiline\n{0}\n"""',
+    "'''ends with \"{0}\"'''",
+)
+
+
+def make_string_heavy_file(strings=5000, seed=0):
+    """Get the lines of a module made of nothing but assignments of string literals of every kind."""
+    random_ = random.Random(seed)
+    lines = ['"""String heavy module."""\n']
+    for i in range(strings):
+        lines.append('value_{0} = {1}\n'.format(i, random_.choice(STRING_LITERALS).format(i)))
+    return ''.join(lines).splitlines(True)
+
+
+FSTRING_TEMPLATES = (
+    "f'{{name}}_{0}'",
+    'f"{{value!r:>{{width}}}} {0}"',
+    "f'{{user}} has {{len(items)}} items, {{f\"{{count}} new\"}} {0}'",
+    "f'''\n    SELECT {{columns}}\n    FROM table_{0}\n    WHERE id = {{record_id}} AND name = '{{name}}'\n    '''",
+    'f"""\n    <div class="item-{0}">\n      <span>{{title}}</span> {{f"<b>{{count}}</b>"}}\n    </div>\n    """',
+)
+
+
+def make_fstring_heavy_file(strings=2000, seed=0):
+    """Get the lines of a module made of assignments of inline, nested and templated multiline f-strings."""
+    random_ = random.Random(seed)
+    lines = ['"""F-string heavy module."""\n']
+    for i in range(strings):
+        lines.append('value_{0} = {1}\n'.format(i, random_.choice(FSTRING_TEMPLATES).format(i)))
+    return ''.join(lines).splitlines(True)
@@ -1,5 +1,10 @@
+import collections
+import functools
+import io
+import itertools
 import optparse
 import sys
+import time
 import tokenize
 import warnings
 
@@ -15,11 +20,69 @@ except ImportError:
     stdin_get_value = utils.stdin_get_value
     readlines = pycodestyle.readlines
 
+# The C tokenizer behind `tokenize` from Python 3.12, which can be driven without its Python wrapper
+try:
+    from _tokenize import TokenizerIter
+except ImportError:
+    TokenizerIter = None
+
 from flake8_quotes.__about__ import __version__
-from flake8_quotes.docstring_detection import get_docstring_tokens
+from flake8_quotes.cache import DEFAULT_MAX_ENTRIES, ResultCache
+from flake8_quotes.docstring_detection import (  # noqa: F401
+    get_ast_docstring_positions, get_docstring_positions, get_docstring_tokens, mark_docstring_positions,
+    mark_docstring_tokens,
+)
+from flake8_quotes.noqa import NoqaIndex
+from flake8_quotes.prefilter import is_trivially_compliant
+from flake8_quotes.profiling import FileProfile, Profiler
+from flake8_quotes.records import QuoteError
+from flake8_quotes.scanner import scan_tokens
+from flake8_quotes.settings import QuoteSettings, freeze_config
+from flake8_quotes.stats import FORMATS as STATS_FORMATS, FileStats, RunStats
+from flake8_quotes.string_checks import (
+    DEFAULT_VERDICT_CACHE_SIZE, compile_string_check, get_verdict_cache_stats, parse_cache_size,
+)
 
 
 _IS_PEP701 = sys.version_info[:2] >= (3, 12)
+# Lines tokenized when first driving the C tokenizer, which must give the same tokens as `tokenize`
+_C_TOKENIZER_PROBE = ['def f(x: int) -> str:\n', '    return f"{x!r:>{10}}" + \'a\'  # b\n']
+
+
+def generate_tokens(file_contents):
+    """Tokenize an iterable of lines, like `tokenize.generate_tokens()`"""
+    if _IS_PEP701 and _can_use_c_tokenizer():
+        return _generate_c_tokens(iter(file_contents).__next__)
+    return tokenize.generate_tokens(lambda L=iter(file_contents): next(L))
+
+
+@functools.lru_cache(None)
+def _can_use_c_tokenizer():
+    # DEV: `_tokenize.TokenizerIter` is private and may change between Python versions, if it doesn't take the same
+    #   arguments or give the same tokens anymore, `tokenize.generate_tokens()` is used for the rest of the process
+    if TokenizerIter is None:
+        return False
+    try:
+        tokens = list(_generate_c_tokens(iter(_C_TOKENIZER_PROBE).__next__))
+    except Exception:
+        return False
+    return tokens == list(tokenize.generate_tokens(lambda L=iter(_C_TOKENIZER_PROBE): next(L)))
+
+
+def _generate_c_tokens(readline):
+    # DEV: Unlike `tokenize.generate_tokens()`, lines are read without calling back into Python and
+    #   the C tokenizer's tuples become `TokenInfo` without a Python loop around each of them
+    tokens = TokenizerIter(readline, extra_tokens=True)
+    try:
+        yield from map(tuple.__new__, itertools.repeat(tokenize.TokenInfo), tokens)
+    except SyntaxError as e:
+        # Raise the same errors as `tokenize.generate_tokens()`, indentation errors included
+        if type(e) is not SyntaxError:
+            raise
+        message = e.msg
+        if 'unterminated triple-quoted string literal' in message:
+            message = 'EOF in multi-line string'
+        raise tokenize.TokenError(message, (e.lineno, e.offset)) from None
 
 
 class QuoteChecker(object):
@@ -83,9 +146,46 @@ class QuoteChecker(object):
     DOCSTRING_QUOTES["'''"] = DOCSTRING_QUOTES["'"]
     DOCSTRING_QUOTES['"""'] = DOCSTRING_QUOTES['"']
 
-    def __init__(self, tree, lines=None, filename='(none)'):
+    # Ways to find docstrings, `ast` needs the tree parsed by flake8
+    DOCSTRING_DETECTIONS = ('tokens', 'ast')
+    # Ways to tokenize files flake8 didn't already tokenize, `scanner` only finds what the checks need
+    LEXERS = ('tokenize', 'scanner')
+
+    # `QuoteSettings` of the checkers created without their own, set by `parse_options()`
+    settings = None
+    # Optional on-disk `ResultCache`, enabled via `--quotes-cache-dir`
+    cache = None
+    # Optional `Profiler`, enabled via `--quotes-profile`
+    profiler = None
+    # Optional `RunStats`, enabled via `--quotes-stats`
+    stats = None
+    # One of `LEXERS`, set via `--quotes-lexer`
+    lexer = 'tokenize'
+    # Number of errors after which a file isn't looked at any further, set via `--quotes-max-errors-per-file`
+    max_errors_per_file = 0
+
+    # DEV: `settings` is keyword-only, as flake8 would otherwise look for a `settings` parameter to pass
+    def __init__(self, tree, lines=None, filename='(none)', file_tokens=None, *, settings=None):
+        # AST provided by flake8, used to find docstrings with `--quotes-docstring-detection ast`
+        self.tree = tree
         self.filename = filename
         self.lines = lines
+        # Tokens provided by flake8 3.x+, which has already read and tokenized the file
+        self.file_tokens = file_tokens
+        # Whether the file was skipped without looking at its tokens, see `_is_trivially_compliant()`
+        self.prefiltered = False
+        # Seconds spent in `_is_trivially_compliant()`, reported by `--quotes-profile`
+        self.prefilter_time = 0.0
+        # Settings of this checker only, which shadow those of the class
+        if settings is not None:
+            self.settings = settings
+            self.config = settings.config
+            self.check_string = settings.check_string
+            self.lexer = settings.lexer
+            self.max_errors_per_file = settings.max_errors_per_file
+            self.cache = settings.cache
+            self.profiler = settings.profiler
+            self.stats = settings.stats
 
     @staticmethod
     def _register_opt(parser, *args, **kwargs):
@@ -136,223 +236,469 @@ class QuoteChecker(object):
                           dest='check_inside_f_strings', default=False, action='store_true',
                           parse_from_config=True,
                           help='Check strings inside f-strings, when PEP701 is active (Python 3.12+)')
+        cls._register_opt(parser, '--quotes-cache-dir', default=None, action='store',
+                          parse_from_config=True,
+                          help='Directory to cache results in between runs (default: no caching)')
+        cls._register_opt(parser, '--quotes-cache-max-entries', default=DEFAULT_MAX_ENTRIES, action='store',
+                          type=int, parse_from_config=True,
+                          help='Number of files to keep in the cache (default: {0})'.format(DEFAULT_MAX_ENTRIES))
+        cls._register_opt(parser, '--quotes-verdict-cache-size', default=DEFAULT_VERDICT_CACHE_SIZE, action='store',
+                          type=parse_cache_size, parse_from_config=True,
+                          help='Number of string verdicts to remember while checking, 0 to disable '
+                               '(default: {0})'.format(DEFAULT_VERDICT_CACHE_SIZE))
+        cls._register_opt(parser, '--quotes-max-errors-per-file', default=0, action='store', type=int,
+                          parse_from_config=True,
+                          help='Stop checking a file after this many errors, 0 for no limit (default: 0)')
+        cls._register_opt(parser, '--quotes-profile', default=False, action='store_true',
+                          parse_from_config=False,
+                          help='Print the time spent per phase and the slowest files when done')
+        cls._register_opt(parser, '--quotes-stats', default=None, action='store',
+                          parse_from_config=False,
+                          help='Write counters of files, tokens, strings, errors and cache use to this file when done')
+        cls._register_opt(parser, '--quotes-stats-format', default='json', action='store',
+                          parse_from_config=True,
+                          choices=STATS_FORMATS,
+                          help='Format of the `--quotes-stats` file (default: json)')
+        cls._register_opt(parser, '--quotes-docstring-detection', default='tokens', action='store',
+                          parse_from_config=True,
+                          choices=cls.DOCSTRING_DETECTIONS,
+                          help='Find docstrings by looking at the tokens or at the AST parsed by flake8 '
+                               '(default: tokens)')
+        cls._register_opt(parser, '--quotes-lexer', default='tokenize', action='store',
+                          parse_from_config=True,
+                          choices=cls.LEXERS,
+                          help='Tokenize files with `tokenize` or with a scanner only looking for strings and '
+                               'comments (default: tokenize)')
 
     @classmethod
     def parse_options(cls, options):
+        # DEV: flake8 parses the options once per process, checkers created without `settings` use these
+        settings = cls.get_settings(options)
+        cls.settings = settings
+        cls.config = settings.config
+        cls.check_string = staticmethod(settings.check_string)
+        cls.lexer = settings.lexer
+        cls.max_errors_per_file = settings.max_errors_per_file
+        cls.cache = settings.cache
+        cls.profiler = settings.profiler
+        cls.stats = settings.stats
+
+    @classmethod
+    def get_settings(cls, options):
+        """Get the `QuoteSettings` for `options`, without changing those of the class."""
         # Define our default config
-        # cls.config = {good_single: ', good_multiline: ''', bad_single: ", bad_multiline: """}
-        cls.config = {}
-        cls.config.update(cls.INLINE_QUOTES["'"])
-        cls.config.update(cls.MULTILINE_QUOTES['"""'])
-        cls.config.update(cls.DOCSTRING_QUOTES['"""'])
+        # config = {good_single: ', good_multiline: ''', bad_single: ", bad_multiline: """}
+        config = {}
+        config.update(cls.INLINE_QUOTES["'"])
+        config.update(cls.MULTILINE_QUOTES['"""'])
+        config.update(cls.DOCSTRING_QUOTES['"""'])
 
         # If `options.quotes` was specified, then use it
         if hasattr(options, 'quotes') and options.quotes is not None:
             # https://docs.python.org/2/library/warnings.html#warnings.warn
             warnings.warn('flake8-quotes has deprecated `quotes` in favor of `inline-quotes`. '
                           'Please update your configuration')
-            cls.config.update(cls.INLINE_QUOTES[options.quotes])
+            config.update(cls.INLINE_QUOTES[options.quotes])
         # Otherwise, use the supported `inline_quotes`
         else:
-            # cls.config = {good_single: ', good_multiline: """, bad_single: ", bad_multiline: '''}
+            # config = {good_single: ', good_multiline: """, bad_single: ", bad_multiline: '''}
             #   -> {good_single: ", good_multiline: """, bad_single: ', bad_multiline: '''}
-            cls.config.update(cls.INLINE_QUOTES[options.inline_quotes])
+            config.update(cls.INLINE_QUOTES[options.inline_quotes])
 
         # If multiline quotes was specified, overload our config with those options
         if hasattr(options, 'multiline_quotes') and options.multiline_quotes is not None:
-            # cls.config = {good_single: ', good_multiline: """, bad_single: ", bad_multiline: '''}
+            # config = {good_single: ', good_multiline: """, bad_single: ", bad_multiline: '''}
             #   -> {good_single: ', good_multiline: ''', bad_single: ", bad_multiline: """}
-            cls.config.update(cls.MULTILINE_QUOTES[options.multiline_quotes])
+            config.update(cls.MULTILINE_QUOTES[options.multiline_quotes])
 
         # If docstring quotes was specified, overload our config with those options
         if hasattr(options, 'docstring_quotes') and options.docstring_quotes is not None:
-            cls.config.update(cls.DOCSTRING_QUOTES[options.docstring_quotes])
+            config.update(cls.DOCSTRING_QUOTES[options.docstring_quotes])
 
         # If avoid escaped specified, add to config
         if hasattr(options, 'avoid_escape') and options.avoid_escape is not None:
-            cls.config.update({'avoid_escape': options.avoid_escape})
+            config.update({'avoid_escape': options.avoid_escape})
         else:
-            cls.config.update({'avoid_escape': True})
+            config.update({'avoid_escape': True})
 
         # If check inside f-strings specified, add to config
         if hasattr(options, 'check_inside_f_strings') and options.check_inside_f_strings is not None:
-            cls.config.update({'check_inside_f_strings': options.check_inside_f_strings})
+            config.update({'check_inside_f_strings': options.check_inside_f_strings})
+        else:
+            config.update({'check_inside_f_strings': False})
+
+        # If docstring detection specified, add to config
+        if getattr(options, 'quotes_docstring_detection', None) is not None:
+            config.update({'docstring_detection': options.quotes_docstring_detection})
         else:
-            cls.config.update({'check_inside_f_strings': False})
+            config.update({'docstring_detection': 'tokens'})
+
+        # If a lexer was specified, use it
+        lexer = getattr(options, 'quotes_lexer', None) or 'tokenize'
+
+        # If an error limit was specified, stop checking files there
+        max_errors_per_file = getattr(options, 'quotes_max_errors_per_file', None) or 0
+
+        # Specialize the checks for this configuration, remembering verdicts for repeated strings
+        cache_size = getattr(options, 'quotes_verdict_cache_size', DEFAULT_VERDICT_CACHE_SIZE)
+        check_string = compile_string_check(config, cache_size)
+
+        # If a cache directory was specified, cache results there
+        cache = None
+        if hasattr(options, 'quotes_cache_dir') and options.quotes_cache_dir is not None:
+            max_entries = getattr(options, 'quotes_cache_max_entries', DEFAULT_MAX_ENTRIES)
+            cache = ResultCache(options.quotes_cache_dir, max_entries=max_entries)
+
+        # If profiling was requested, record where the time goes
+        profiler = None
+        if getattr(options, 'quotes_profile', False):
+            profiler = Profiler.from_environment()
+
+        # If stats were requested, count what is done
+        stats = None
+        if getattr(options, 'quotes_stats', None) is not None:
+            stats = RunStats.from_environment(options.quotes_stats, getattr(options, 'quotes_stats_format', 'json'))
+
+        return QuoteSettings(freeze_config(config), check_string, lexer, max_errors_per_file, cache, profiler, stats)
 
     def get_file_contents(self):
-        if self.filename in ('stdin', '-', None):
+        # DEV: Lines given by flake8 or by API users come first, even for stdin
+        if self.lines:
+            return self.lines
+        elif self.filename in ('stdin', '-', None):
             return stdin_get_value().splitlines(True)
         else:
-            if self.lines:
-                return self.lines
-            else:
-                return readlines(self.filename)
+            return readlines(self.filename)
 
     def run(self):
-        file_contents = self.get_file_contents()
+        contents = self._get_contents_for_cache() if self.cache is not None else None
+        if contents is None:
+            yield from self._run_checks()
+            return
+
+        key = self.cache.get_key(contents, self.config)
+        errors = self.cache.get(key)
+        if errors is None:
+            errors = [error[:3] for error in self._run_checks()]
+            # Errors cut short by `max_errors_per_file` aren't cached, as they wouldn't do for a higher limit
+            if not self.max_errors_per_file or len(errors) < self.max_errors_per_file:
+                self.cache.set(key, errors)
+        else:
+            if self.max_errors_per_file:
+                errors = errors[:self.max_errors_per_file]
+            if self.stats is not None:
+                file_stats = FileStats('cached')
+                for _, _, message in errors:
+                    file_stats.errors[message[:4]] = file_stats.errors.get(message[:4], 0) + 1
+                self.stats.add(file_stats)
+        for line, col, message in errors:
+            yield (line, col, message, type(self))
+
+    def _get_contents_for_cache(self):
+        if self.lines or self.filename in ('stdin', '-', None):
+            return ''.join(self.get_file_contents()).encode('utf-8', 'surrogatepass')
+        try:
+            with open(self.filename, 'rb') as f:
+                return f.read()
+        except OSError:
+            # Not a file we can read (e.g. only `file_tokens` were given), don't cache it
+            return None
+
+    def _run_checks(self):
+        for error in self._iter_records():
+            yield (error.row, error.col, error.message, type(self))
 
-        noqa_line_numbers = self.get_noqa_lines(file_contents)
-        errors = self.get_quotes_errors(file_contents)
+    def get_records(self, fix_string=None):
+        """
+        Lazily get a `QuoteError` for each error in the file which isn't suppressed.
 
+        With `fix_string(token_string, code, config)` (e.g. `fixer.fix_string()`), errors come with
+        the replacement it suggests for their string.
+        """
+        return self._iter_records(fix_string)
+
+    def _iter_records(self, fix_string=None):
+        if self.profiler is None and self.stats is None:
+            yield from self._limit_errors(self._check_tokens(self._iter_file_tokens(), fix_string=fix_string))
+            return
+
+        file_profile = FileProfile(self.filename) if self.profiler is not None else None
+        file_stats = FileStats() if self.stats is not None else None
+        # DEV: When streaming from disk, reading happens as tokens are requested and counts as `tokenize`.
+        #   The prefilter runs while getting the tokens (e.g. with flake8's) or with the first one when streaming
+        prefilter_time = self.prefilter_time
+        start = time.perf_counter()
+        tokens = self._iter_file_tokens()
+        read_time = time.perf_counter() - start
+        read_prefilter_time = self.prefilter_time - prefilter_time
+        # DEV: The verdict cache is shared by the checkers with the same settings, with `--threads` the
+        #   lookups of the files checked at the same time are counted for each of them
+        cache_stats = get_verdict_cache_stats(self.check_string)
+        errors = self._limit_errors(self._check_tokens(tokens, file_profile, fix_string, file_stats))
+        if file_stats is not None:
+            errors = file_stats.count_errors(errors)
+        yield from errors
+
+        cache_hits = cache_misses = 0
+        if cache_stats is not None:
+            new_cache_stats = get_verdict_cache_stats(self.check_string)
+            cache_hits = new_cache_stats['hits'] - cache_stats['hits']
+            cache_misses = new_cache_stats['misses'] - cache_stats['misses']
+        if file_profile is not None:
+            file_profile.times['read'] += read_time
+            file_profile.add_prefilter_time(read_prefilter_time, 'read')
+            file_profile.add_prefilter_time(self.prefilter_time - prefilter_time - read_prefilter_time, 'tokenize')
+            file_profile.verdict_cache_hits = cache_hits
+            file_profile.verdict_cache_misses = cache_misses
+            self.profiler.add(file_profile)
+        if file_stats is not None:
+            if self.prefiltered:
+                file_stats.outcome = 'prefiltered'
+            file_stats.verdict_cache_hits = cache_hits
+            file_stats.verdict_cache_misses = cache_misses
+            self.stats.add(file_stats)
+
+    def _limit_errors(self, errors):
+        # DEV: Everything is lazy, so no more tokens are read once the limit is reached
+        if not self.max_errors_per_file:
+            return errors
+        return itertools.islice(errors, self.max_errors_per_file)
+
+    def _check_tokens(self, tokens, file_profile=None, fix_string=None, file_stats=None):
+        # Stream tokens through noqa collection, docstring detection and quote
+        # checking in a single pass, without materializing the token list
+        noqa_index = NoqaIndex()
+        current_row = 0
+
+        def index_comments(tokens):
+            nonlocal current_row
+            for token in tokens:
+                current_row = token.start[0]
+                if token.type == tokenize.COMMENT:
+                    noqa_index.add_comment(token.string, current_row)
+                yield token
+
+        if file_stats is not None:
+            tokens = file_stats.count_tokens(tokens)
+        if file_profile is None:
+            strings = self._iter_strings(self._mark_docstring_tokens(index_comments(tokens)))
+            if file_stats is not None:
+                strings = file_stats.count_strings(strings)
+            errors = self._get_errors(strings, noqa_index, fix_string)
+        else:
+            errors = self._get_profiled_errors(tokens, index_comments, noqa_index, file_profile, fix_string, file_stats)
+
+        # A `noqa` comment always comes after the strings on its line, so errors are
+        # held back until the token stream has moved past their line
+        is_suppressed = noqa_index.is_suppressed
+        pending_errors = collections.deque()
+        for error in errors:
+            while pending_errors and pending_errors[0].row < current_row:
+                pending_error = pending_errors.popleft()
+                if not is_suppressed(pending_error.row, pending_error.code):
+                    yield pending_error
+            pending_errors.append(error)
+        for error in pending_errors:
+            if not is_suppressed(error.row, error.code):
+                yield error
+
+    def _get_profiled_errors(self, tokens, index_comments, noqa_index, file_profile, fix_string=None, file_stats=None):
+        """Same as `_get_errors()`, with each phase of the pipeline timed"""
+        tokens = index_comments(file_profile.timed('tokenize', tokens))
+        marked_tokens = self._mark_docstring_tokens(file_profile.timed('noqa', tokens))
+        strings = self._iter_strings(file_profile.timed('docstrings', marked_tokens))
+        if file_stats is not None:
+            strings = file_stats.count_strings(strings)
+        errors = self._get_errors(file_profile.timed('strings', strings), noqa_index, fix_string)
+        return file_profile.timed('check', errors)
+
+    def _iter_file_tokens(self):
+        # Files that cannot contain any error are skipped without looking at their tokens
+        if self.file_tokens is not None:
+            # Reuse flake8's work rather than reading and tokenizing the file again
+            if self.lines is not None and self._is_trivially_compliant(self.lines):
+                return iter(())
+            return iter(self.file_tokens)
+        if self.lines or self.filename in ('stdin', '-', None):
+            return self._get_tokens_if_needed(self.get_file_contents())
+        # Otherwise (e.g. standalone use), stream the file from disk line by line
+        return self._stream_file_tokens()
+
+    def _stream_file_tokens(self):
+        try:
+            file_contents = tokenize.open(self.filename)
+        except (LookupError, SyntaxError, UnicodeError):
+            # Improperly declared encoding, let `readlines()` apply its fallback
+            yield from self._get_tokens_if_needed(self.get_file_contents())
+            return
+        with file_contents:
+            if self._is_trivially_compliant(file_contents):
+                return
+            # Rewind after the pre-scan rather than holding on to the lines
+            file_contents.seek(0)
+            yield from self.get_tokens(file_contents)
+
+    def _is_trivially_compliant(self, file_contents):
+        start = time.perf_counter()
+        self.prefiltered = is_trivially_compliant(file_contents, self.config)
+        self.prefilter_time += time.perf_counter() - start
+        return self.prefiltered
+
+    def _get_tokens_if_needed(self, file_contents):
+        if self._is_trivially_compliant(file_contents):
+            return iter(())
+        return self.get_tokens(file_contents)
+
+    def get_tokens(self, file_contents):
+        if self.lexer == 'scanner':
+            return scan_tokens(''.join(file_contents))
+        return generate_tokens(file_contents)
+
+    def get_noqa_lines(self, file_contents, tokens=None):
+        if tokens is None:
+            tokens = self.get_tokens(file_contents)
+        # Lines with a `noqa` comment, whether it is for all codes or not
+        return sorted(NoqaIndex.from_tokens(tokens).lines)
+
+    def get_quotes_errors(self, file_contents, tokens=None):
+        """Get `{'message', 'line', 'col'}` for each error regardless of `noqa` comments, see `get_records()`"""
+        if tokens is None:
+            tokens = self.get_tokens(file_contents)
+        file_stats = FileStats() if self.stats is not None else None
+        if file_stats is not None:
+            tokens = file_stats.count_tokens(tokens)
+        strings = self._iter_strings(self._mark_docstring_tokens(tokens))
+        if file_stats is not None:
+            strings = file_stats.count_strings(strings)
+        errors = self._limit_errors(self._get_errors(strings))
+        if file_stats is not None:
+            errors = file_stats.count_errors(errors)
         for error in errors:
-            if error.get('line') not in noqa_line_numbers:
-                yield (error.get('line'), error.get('col'), error.get('message'), type(self))
-
-    def get_noqa_lines(self, file_contents):
-        tokens = [Token(t) for t in tokenize.generate_tokens(lambda L=iter(file_contents): next(L))]
-        return [token.start_row
-                for token in tokens
-                if token.type == tokenize.COMMENT and token.string.endswith('noqa')]
-
-    def get_quotes_errors(self, file_contents):
-        tokens = [Token(t) for t in tokenize.generate_tokens(lambda L=iter(file_contents): next(L))]
-        docstring_tokens = get_docstring_tokens(tokens)
+            yield {'message': error.message, 'line': error.row, 'col': error.col}
+        if file_stats is not None:
+            self.stats.add(file_stats)
+
+    def _mark_docstring_tokens(self, tokens):
+        # Without an AST (e.g. when not run by flake8), fall back to looking at the tokens
+        if self.config['docstring_detection'] == 'ast' and self.tree is not None:
+            return mark_docstring_positions(tokens, get_ast_docstring_positions(self.tree))
+        return mark_docstring_tokens(tokens)
+
+    def _get_errors(self, strings, noqa_index=None, fix_string=None):
+        check_string = self.check_string
+        new_error = tuple.__new__
+        for token_string, token_start, _, is_docstring in strings:
+            # Strings in regions with checks turned off aren't looked at
+            if noqa_index is not None and noqa_index.off:
+                continue
+            message = check_string(token_string, is_docstring)
+            if message is not None:
+                code = message[:4]
+                replacement = fix_string(token_string, code, self.config) if fix_string is not None else None
+                # DEV: Skips the `QuoteError.__new__()` argument handling, this runs for each error
+                yield new_error(QuoteError, (code, message, token_start[0], token_start[1], replacement))
+
+    def _iter_strings(self, marked_tokens):
+        """
+        Yield `(token_string, token_start, token_end, is_docstring)` for each string to check.
+
+        `marked_tokens` are `(token, is_docstring)` pairs, as yielded by `mark_docstring_tokens()`.
+        """
+        # non PEP701, we only check for STRING tokens
+        if not _IS_PEP701:
+            for token, is_docstring in marked_tokens:
+                if token.type == tokenize.STRING:
+                    yield token.string, token.start, token.end, is_docstring
+            return
+
+        check_inside_f_strings = self.config['check_inside_f_strings']
+
         # when PEP701 is enabled, we track when the token stream
         # is passing over an f-string
 
-        # the start of the current f-string (row, col)
+        # the start of the current top-level f-string (row, col), when
+        # it is checked as a whole
         fstring_start = None
 
         # > 0 when we are inside an f-string token stream, since
         # f-string can be arbitrarily nested, we need a counter
         fstring_nesting = 0
 
-        # the token.string part of all tokens inside the current
-        # f-string
-        fstring_buffer = []
-
-        for token in tokens:
-            is_docstring = token in docstring_tokens
+        # the source lines of the current top-level f-string, which is
+        # sliced out of them rather than joined from all of its tokens
+        fstring_lines = []
 
-            # non PEP701, we only check for STRING tokens
-            if not _IS_PEP701:
-                if token.type == tokenize.STRING:
-                    yield from self._check_string(token.string, token.start, is_docstring)
+        # the last row in `fstring_lines`
+        fstring_row = 0
 
+        for token, is_docstring in marked_tokens:
+            token_type = token.type
+            if fstring_nesting == 0 and token_type != tokenize.FSTRING_START:
+                if token_type == tokenize.STRING:
+                    yield token.string, token.start, token.end, is_docstring
                 continue
 
-            # otherwise, we track all tokens for the current f-string
-            if token.type == tokenize.FSTRING_START:
-                if fstring_nesting == 0:
+            # otherwise, we track the nesting and the lines of the current f-string,
+            # and check nested strings and f-strings when check_inside_f_strings is true.
+            # We don't check FSTRING_END since it should be legal if tokenize.FSTRING_START succeeded
+            if token_type == tokenize.FSTRING_START:
+                if fstring_nesting == 0 and not check_inside_f_strings:
                     fstring_start = token.start
+                    fstring_lines = [token.line]
+                    fstring_row = token.start[0]
 
                 fstring_nesting += 1
-                fstring_buffer.append(token.string)
-            elif token.type == tokenize.FSTRING_END:
+                if check_inside_f_strings:
+                    yield token.string, token.start, token.end, is_docstring
+            elif token_type == tokenize.FSTRING_END:
                 fstring_nesting -= 1
-                fstring_buffer.append(token.string)
-            elif fstring_nesting > 0:
-                fstring_buffer.append(token.string)
+            elif token_type == tokenize.STRING and check_inside_f_strings:
+                yield token.string, token.start, token.end, is_docstring
+
+            if fstring_start is None:
+                continue
+
+            if token.end[0] > fstring_row:
+                # DEV: `token.line` holds the lines from the token's start row to its end row. Rows
+                #   without any token on them only hold whitespace and line continuations, which
+                #   don't matter for the checks. It is split like the tokenizer splits rows, unlike
+                #   `str.splitlines()` which also splits on e.g. form feeds and U+2028
+                fstring_lines.extend('\n' for _ in range(fstring_row + 1, token.start[0]))
+                token_lines = io.StringIO(token.line, newline='').readlines()
+                fstring_lines.extend(token_lines[max(fstring_row - token.start[0] + 1, 0):])
+                fstring_row = token.end[0]
 
             # if we have reached the end of a top-level f-string, we check
             # it as if it was a single string (pre PEP701 semantics) when
             # check_inside_f_strings is false
-            if token.type == tokenize.FSTRING_END and fstring_nesting == 0:
-                token_string = ''.join(fstring_buffer)
-                fstring_buffer[:] = []
-
-                if not self.config['check_inside_f_strings']:
-                    yield from self._check_string(token_string, fstring_start, is_docstring)
-                    continue
-
-            # otherwise, we check nested strings and f-strings, we don't
-            # check FSTRING_END since it should be legal if tokenize.FSTRING_START succeeded
-            if token.type in (tokenize.STRING, tokenize.FSTRING_START,):
-                if fstring_nesting > 0:
-                    if self.config['check_inside_f_strings']:
-                        yield from self._check_string(token.string, token.start, is_docstring)
+            if token_type == tokenize.FSTRING_END and fstring_nesting == 0:
+                start_col = fstring_start[1]
+                end_col = token.end[1]
+                if len(fstring_lines) == 1:
+                    token_string = fstring_lines[0][start_col:end_col]
                 else:
-                    yield from self._check_string(token.string, token.start, is_docstring)
+                    source = ''.join(fstring_lines)
+                    token_string = source[start_col:len(source) - len(fstring_lines[-1]) + end_col]
 
-    def _check_string(self, token_string, token_start, is_docstring):
-        # Remove any prefixes in strings like `u` from `u"foo"`
-        # DEV: `last_quote_char` is 1 character, even for multiline strings
-        #   `"foo"`   -> `"foo"`
-        #   `b"foo"`  -> `"foo"`
-        #   `br"foo"` -> `"foo"`
-        #   `b"""foo"""` -> `"""foo"""`
-        last_quote_char = token_string[-1]
-        first_quote_index = token_string.index(last_quote_char)
-        prefix = token_string[:first_quote_index].lower()
-        unprefixed_string = token_string[first_quote_index:]
-
-        # Determine if our string is multiline-based
-        #   "foo"[0] * 3 = " * 3 = """
-        #   "foo"[0:3] = "fo
-        #   """foo"""[0:3] = """
-        is_multiline_string = unprefixed_string[0] * 3 == unprefixed_string[0:3]
-        start_row, start_col = token_start
-
-        # If our string is a docstring
-        # DEV: Docstring quotes must come before multiline quotes as it can as a multiline quote
-        if is_docstring:
-            if self.config['good_docstring'] in unprefixed_string:
-                return
-
-            yield {
-                'message': 'Q002 ' + self.config['docstring_error_message'],
-                'line': start_row,
-                'col': start_col,
-            }
-        # Otherwise if our string is multiline
-        elif is_multiline_string:
-            # If our string is or containing a known good string, then ignore it
-            #   (""")foo""" -> good (continue)
-            #   '''foo(""")''' -> good (continue)
-            #   (''')foo''' -> possibly bad
-            if self.config['good_multiline'] in unprefixed_string:
-                return
+                yield token_string, fstring_start, token.end, is_docstring
+                fstring_start = None
+                fstring_lines = []
 
-            # If our string ends with a known good ending, then ignore it
-            #   '''foo("''') -> good (continue)
-            #     Opposite, """foo"""", would break our parser (cannot handle """" ending)
-            if unprefixed_string.endswith(self.config['good_multiline_ending']):
-                return
+    def _check_string(self, token_string, token_start, is_docstring):
+        message = self.check_string(token_string, is_docstring)
+        if message is not None:
+            yield QuoteError(message[:4], message, token_start[0], token_start[1], None)
 
-            # Output our error
-            yield {
-                'message': 'Q001 ' + self.config['multiline_error_message'],
-                'line': start_row,
-                'col': start_col,
-            }
-        # Otherwise (string is inline quote)
-        else:
-            #   'This is a string'       -> Good
-            #   'This is a "string"'     -> Good
-            #   'This is a \"string\"'   -> Good
-            #   'This is a \'string\''   -> Bad (Q003)  Escaped inner quotes
-            #   '"This" is a \'string\'' -> Good        Changing outer quotes would not avoid escaping
-            #   "This is a string"       -> Bad (Q000)
-            #   "This is a 'string'"     -> Good        Avoids escaped inner quotes
-            #   "This is a \"string\""   -> Bad (Q000)
-            #   "\"This\" is a 'string'" -> Good
-
-            string_contents = unprefixed_string[1:-1]
-            # If string preferred type, check for escapes
-            if last_quote_char == self.config['good_single']:
-                if not self.config['avoid_escape'] or 'r' in prefix:
-                    return
-                if (self.config['good_single'] in string_contents and
-                        not self.config['bad_single'] in string_contents):
-                    yield {
-                        'message': 'Q003 Change outer quotes to avoid escaping inner quotes',
-                        'line': start_row,
-                        'col': start_col,
-                    }
-                return
 
-            # If not preferred type, only allow use to avoid escapes.
-            if self.config['good_single'] not in string_contents:
-                yield {
-                    'message': 'Q000 ' + self.config['single_error_message'],
-                    'line': start_row,
-                    'col': start_col,
-                }
+class Token:
+    """
+    Python 2 and 3 compatible token
 
+    The checker works on plain `tokenize.TokenInfo` tuples, this wrapper is only kept
+    for backwards compatibility.
+    """
+    __slots__ = ('token',)
 
-class Token:
-    """Python 2 and 3 compatible token"""
     def __init__(self, token):
         self.token = token
 
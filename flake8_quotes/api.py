@@ -0,0 +1,132 @@
+"""
+Checking sources held in memory, e.g. by code review bots, without files or flake8:
+
+    from flake8_quotes.api import check_sources
+
+    for name, line, col, message in check_sources([('a.py', 'x = "foo"\\n')], {'inline-quotes': 'single'}):
+        ...
+"""
+import argparse
+import concurrent.futures
+import functools
+import io
+import itertools
+import multiprocessing
+import tokenize
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.cli import OptionParser
+
+# Batches smaller than this are checked in the calling process, as starting workers costs more
+POOL_MIN_SOURCES = 200
+# Number of sources sent to a worker at once
+POOL_CHUNK_SIZE = 32
+
+
+def get_options(config=None):
+    """
+    Get the options for `QuoteChecker.parse_options()` from a `config` mapping of option names
+    (e.g. `inline-quotes` or `inline_quotes`) to values, with defaults for the others.
+
+    Values are converted like on the command line, e.g. `'3'` to `3`, and `None` is accepted
+    where it is the default. Raises `ValueError` for unknown options or invalid values.
+    """
+    parser = OptionParser(argparse.ArgumentParser())
+    QuoteChecker.add_options(parser)
+    actions = {action.dest: action for action in parser.parser._actions}
+    options = parser.parser.parse_args([])
+
+    for name, value in (config or {}).items():
+        dest = name.lstrip('-').replace('-', '_')
+        action = actions.get(dest)
+        if action is None or dest == 'help':
+            raise ValueError('Unknown flake8-quotes option: {0!r}'.format(name))
+        if value is not None or action.default is not None:
+            value = _convert_value(name, action, value)
+        setattr(options, dest, value)
+    return options
+
+
+def _convert_value(name, action, value):
+    # DEV: Flags (e.g. `--avoid-escape`) take no value on the command line, only booleans make sense for them
+    if action.nargs == 0:
+        if not isinstance(value, bool):
+            raise ValueError('Invalid value for {0!r}: {1!r} (expected True or False)'.format(name, value))
+        return value
+
+    if action.type is not None:
+        try:
+            value = action.type(str(value))
+        except (TypeError, ValueError, argparse.ArgumentTypeError) as e:
+            raise ValueError('Invalid value for {0!r}: {1!r} ({2})'.format(name, value, e))
+    if action.choices is not None and value not in action.choices:
+        raise ValueError('Invalid value for {0!r}: {1!r} (choose from {2})'.format(
+            name, value, ', '.join(repr(choice) for choice in action.choices)))
+    return value
+
+
+def check_source(name, text, settings=None):
+    """
+    Get `[(name, line, col, message), ...]` for the source `text`, reporting `name` as its filename.
+
+    Without `settings`, those `QuoteChecker.parse_options()` set are used.
+    """
+    # DEV: Empty `lines` would make the checker read `name` from disk
+    if not text:
+        return []
+    # DEV: Unlike `str.splitlines()`, only split where the tokenizer does, not on e.g. form feeds or U+2028
+    checker = QuoteChecker(None, lines=io.StringIO(text, newline='').readlines(), filename=name, settings=settings)
+    try:
+        return [(name, line, col, message) for line, col, message, _ in checker.run()]
+    except (SyntaxError, tokenize.TokenError) as e:
+        return [(name, 1, 0, 'E902 {0}: {1}'.format(type(e).__name__, e))]
+
+
+def _check_source(source, settings=None):
+    return check_source(*source, settings=settings)
+
+
+def _check_chunk(chunk, settings):
+    return [error for source in chunk for error in check_source(*source, settings=settings)]
+
+
+def check_sources(sources, config=None, jobs=None, threads=False):
+    """
+    Lazily yield `(name, line, col, message)` for each error in the `(name, text)` pairs of `sources`,
+    in the order of `sources`.
+
+    `config` is validated once, with `get_options()`, and applies to the whole batch. Large batches
+    are spread over `jobs` processes (default: number of CPUs), or over `jobs` threads with `threads`.
+
+    The options of `QuoteChecker` in the calling process are left as they are, so batches with different
+    configurations can be checked at the same time.
+    """
+    options = get_options(config)
+    settings = QuoteChecker.get_settings(options)
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+
+    sources = iter(sources)
+    head = list(itertools.islice(sources, POOL_MIN_SOURCES))
+    if jobs <= 1 or len(head) < POOL_MIN_SOURCES:
+        for source in itertools.chain(head, sources):
+            yield from _check_source(source, settings)
+        return
+
+    sources = itertools.chain(head, sources)
+    if threads:
+        check_chunk = functools.partial(_check_chunk, settings=settings)
+        with concurrent.futures.ThreadPoolExecutor(jobs) as executor:
+            # DEV: Sources are submitted a few chunks per thread at a time, rather than all of them up front
+            while True:
+                chunks = [list(itertools.islice(sources, POOL_CHUNK_SIZE)) for _ in range(jobs * 2)]
+                chunks = [chunk for chunk in chunks if chunk]
+                if not chunks:
+                    return
+                for errors in executor.map(check_chunk, chunks):
+                    yield from errors
+
+    # The initializer makes the options available when workers are spawned rather than forked
+    with multiprocessing.Pool(jobs, initializer=QuoteChecker.parse_options, initargs=(options,)) as pool:
+        for errors in pool.imap(_check_source, sources, chunksize=POOL_CHUNK_SIZE):
+            yield from errors
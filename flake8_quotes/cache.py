@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from flake8_quotes.__about__ import __version__
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class ResultCache(object):
+    """
+    On-disk cache of the errors reported for a file.
+
+    Each entry is a JSON file named after the hash of the file contents, the plugin version
+    and the resolved config. Entries are written to a temporary file and atomically renamed,
+    so the flake8 worker processes can share the same directory without locking: a reader
+    either sees a complete entry or none at all.
+
+    The least recently used entries (by modification time, refreshed on each hit) are evicted
+    once there are more than `max_entries` of them.
+    """
+    SUFFIX = '.json'
+
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        # Only scan the directory for eviction every so often, not on every write
+        self._writes_until_eviction = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(contents, config):
+        digest = hashlib.sha256()
+        digest.update(__version__.encode('utf-8') + b'\0')
+        digest.update(json.dumps(dict(config), sort_keys=True).encode('utf-8') + b'\0')
+        digest.update(contents)
+        return digest.hexdigest()
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key):
+        """Get the cached `[(line, col, message), ...]` for `key`, or `None` on a miss."""
+        path = self._get_path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                errors = json.load(f)
+            # Mark the entry as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            # Missing, concurrently evicted or corrupted entries are all misses
+            return None
+        return [tuple(error) for error in errors]
+
+    def set(self, key, errors):
+        fd, temporary_path = tempfile.mkstemp(dir=self.directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(errors, f)
+            os.replace(temporary_path, self._get_path(key))
+        except OSError:
+            # The cache is best effort, failing to write to it must not fail the check
+            try:
+                os.unlink(temporary_path)
+            except OSError:
+                pass
+            return
+
+        self._writes_until_eviction -= 1
+        if self._writes_until_eviction <= 0:
+            self._writes_until_eviction = max(self.max_entries // 10, 1)
+            self.evict()
+
+    def evict(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.startswith('.') or not entry.name.endswith(self.SUFFIX):
+                    continue
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.unlink(path)
+            except OSError:
+                # Most likely already evicted by another worker
+                pass
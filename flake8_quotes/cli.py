@@ -0,0 +1,286 @@
+"""
+Standalone command line interface running only the quote checks.
+
+It skips flake8's start up and plugin loading, which makes it a cheap pre-commit gate:
+
+    flake8-quotes --inline-quotes double src/
+"""
+import argparse
+import concurrent.futures
+import configparser
+import fnmatch
+import functools
+import multiprocessing
+import operator
+import os
+import sys
+import tokenize
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.__about__ import __version__
+from flake8_quotes.diff import get_changed_lines
+from flake8_quotes.fixer import fix_file, fix_string
+from flake8_quotes.output import WRITERS
+from flake8_quotes.records import QuoteError
+
+DEFAULT_EXCLUDE = '.svn,CVS,.bzr,.hg,.git,__pycache__,.tox,.nox,.eggs,*.egg'
+# Files flake8 reads its `[flake8]` section from, in order of precedence
+CONFIG_FILES = ('setup.cfg', 'tox.ini', '.flake8')
+# Number of chunks to aim for per job, so workers finishing early can pick up more work
+CHUNKS_PER_JOB = 4
+# Order of the errors in a file
+ERROR_ORDER = operator.attrgetter('row', 'col', 'message')
+
+
+class OptionParser(object):
+    """Adapter letting `QuoteChecker.add_options()` register its options on an `argparse` parser"""
+    def __init__(self, parser):
+        self.parser = parser
+        # Actions which can also be set in the configuration file
+        self.config_options = []
+
+    def add_option(self, *args, **kwargs):
+        parse_from_config = kwargs.pop('parse_from_config', False)
+        action = self.parser.add_argument(*args, **kwargs)
+        if parse_from_config:
+            self.config_options.append(action)
+        return action
+
+
+def parse_jobs(value):
+    """Parse `--jobs` like flake8 does, where `auto` (its default, often found in configurations) means all CPUs"""
+    if value.strip().lower() == 'auto':
+        return multiprocessing.cpu_count()
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected 'auto' or a number of jobs, got {0!r}".format(value))
+
+
+def get_parser():
+    parser = OptionParser(
+        argparse.ArgumentParser(prog='flake8-quotes', description='Lint Python files for quotes.'))
+    parser.parser.add_argument('paths', nargs='*', default=['.'],
+                               help='Files and directories to check (default: .)')
+    parser.parser.add_argument('--version', action='version', version='%(prog)s {0}'.format(__version__))
+    parser.parser.add_argument('--fix', action='store_true', default=False,
+                               help='Rewrite strings to use the preferred quotes and report what is left')
+    parser.parser.add_argument('--fail-fast', action='store_true', default=False,
+                               help='Stop at the first file with errors, only reporting its first one')
+    parser.parser.add_argument('--diff-base', default=None, metavar='REVISION',
+                               help='Only check the files and lines changed since REVISION, per git')
+    parser.parser.add_argument('--format', default='default', choices=sorted(WRITERS),
+                               help='Output format, structured ones include suggested replacements (default: default)')
+    parser.add_option('-j', '--jobs', type=parse_jobs, default=None, parse_from_config=True,
+                      help='Number of processes to check files with, `auto` for the number of CPUs (default: auto)')
+    parser.add_option('--threads', action='store_true', default=False, parse_from_config=True,
+                      help='Check files in `--jobs` threads of a single process, which only runs them in parallel '
+                      'on free-threaded Python 3.13+')
+    parser.add_option('--exclude', default=DEFAULT_EXCLUDE, parse_from_config=True,
+                      help='Comma-separated patterns of files and directories to skip '
+                      '(default: {0})'.format(DEFAULT_EXCLUDE))
+    QuoteChecker.add_options(parser)
+    return parser
+
+
+def read_config_defaults(parser, directory='.'):
+    """Read our options from the `[flake8]` section of the project configuration, like flake8 does."""
+    config = configparser.RawConfigParser()
+    for filename in reversed(CONFIG_FILES):
+        config.read(os.path.join(directory, filename))
+    if not config.has_section('flake8'):
+        return {}
+
+    defaults = {}
+    for action in parser.config_options:
+        for option_string in action.option_strings:
+            name = option_string.lstrip('-')
+            for key in (name, name.replace('-', '_')):
+                if config.has_option('flake8', key):
+                    value = config.get('flake8', key)
+                    if isinstance(action, argparse._StoreTrueAction):
+                        value = value.strip().lower() in ('1', 'true', 'yes', 'on')
+                    defaults[action.dest] = value
+    return defaults
+
+
+def _get_patterns(exclude):
+    return [pattern.strip() for pattern in exclude.split(',') if pattern.strip()]
+
+
+def iter_python_files(paths, exclude):
+    patterns = _get_patterns(exclude)
+
+    def is_excluded(path):
+        return any(fnmatch.fnmatch(os.path.basename(path), pattern) for pattern in patterns)
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, directories, filenames in os.walk(path):
+                directories[:] = sorted(d for d in directories if not is_excluded(os.path.join(root, d)))
+                for filename in sorted(filenames):
+                    if filename.endswith('.py') and not is_excluded(filename):
+                        yield os.path.join(root, filename)
+        else:
+            # Explicitly given files are always checked, like in flake8
+            yield path
+
+
+def filter_python_files(filenames, exclude):
+    """Keep the Python files among `filenames` which aren't in an excluded directory, like `iter_python_files()`"""
+    patterns = _get_patterns(exclude)
+    for filename in filenames:
+        parts = os.path.normpath(filename).split(os.sep)
+        if filename.endswith('.py') and not any(fnmatch.fnmatch(part, pattern)
+                                                for part in parts for pattern in patterns):
+            yield filename
+
+
+def make_chunks(filenames, jobs):
+    """
+    Split files into chunks of roughly equal total size.
+
+    The biggest files come first, so that they get started early and small files
+    fill the gaps at the end rather than a single big file delaying the run.
+    """
+    sizes = {}
+    for filename in filenames:
+        try:
+            sizes[filename] = os.path.getsize(filename)
+        except OSError:
+            # Reported when checking the file
+            sizes[filename] = 0
+    target_size = max(sum(sizes.values()) // (jobs * CHUNKS_PER_JOB), 1)
+
+    chunks = []
+    chunk = []
+    chunk_size = 0
+    for filename in sorted(filenames, key=sizes.get, reverse=True):
+        chunk.append(filename)
+        chunk_size += sizes[filename]
+        if chunk_size >= target_size:
+            chunks.append(chunk)
+            chunk = []
+            chunk_size = 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def check_file(filename, fix=False, suggest=False, settings=None):
+    """
+    Get the `QuoteError`s for `filename`, after fixing what we can when `fix` is set.
+
+    With `suggest`, errors come with the replacement suggested for their string. Without `settings`,
+    those `QuoteChecker.parse_options()` set are used.
+    """
+    try:
+        if fix:
+            fix_file(filename, settings)
+        checker = QuoteChecker(None, filename=filename, settings=settings)
+        if suggest:
+            errors = checker.get_records(fix_string)
+        else:
+            # DEV: `run()` goes through the result cache, which doesn't hold replacements
+            errors = (QuoteError(message[:4], message, row, col, None) for row, col, message, _ in checker.run())
+        return sorted(errors, key=ERROR_ORDER)
+    except (OSError, SyntaxError, tokenize.TokenError) as e:
+        return [QuoteError('E902', 'E902 {0}: {1}'.format(type(e).__name__, e), 1, 0, None)]
+
+
+def check_files(filenames, fix=False, suggest=False, fail_fast=False, settings=None):
+    """Get `(filename, errors)` for each of `filenames`, stopping after the first one with errors if `fail_fast`"""
+    results = []
+    for filename in filenames:
+        errors = check_file(filename, fix=fix, suggest=suggest, settings=settings)
+        results.append((filename, errors))
+        if fail_fast and errors:
+            break
+    return results
+
+
+def run(filenames, options, jobs, fail_fast=False, threads=False):
+    """
+    Lazily yield `(filename, errors)` for each file, as soon as it is checked.
+
+    Files are spread over `jobs` processes, or over `jobs` threads sharing the settings of the calling
+    process with `threads`. Files still waiting to be checked are dropped when the generator is closed,
+    e.g. once an error is found with `--fail-fast`.
+    """
+    check = functools.partial(check_files, fix=options.fix, suggest=options.format != 'default', fail_fast=fail_fast)
+    if jobs <= 1 or len(filenames) <= 1:
+        for filename in filenames:
+            yield from check([filename])
+        return
+
+    chunks = make_chunks(filenames, jobs)
+    if threads:
+        yield from _run_threads(functools.partial(check, settings=QuoteChecker.settings), chunks, jobs)
+        return
+
+    # The initializer makes the options available when workers are spawned rather than forked
+    # DEV: Leaving the `with` block terminates the workers, along with the chunks they haven't got to
+    with multiprocessing.Pool(jobs, initializer=QuoteChecker.parse_options, initargs=(options,)) as pool:
+        for results in pool.imap_unordered(check, chunks):
+            yield from results
+
+
+def _run_threads(check, chunks, jobs):
+    executor = concurrent.futures.ThreadPoolExecutor(jobs)
+    futures = [executor.submit(check, chunk) for chunk in chunks]
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            yield from future.result()
+    finally:
+        # DEV: Threads can't be terminated, the chunks they haven't started are cancelled instead
+        for future in futures:
+            future.cancel()
+        executor.shutdown()
+
+
+def main(argv=None):
+    parser = get_parser()
+    parser.parser.set_defaults(**read_config_defaults(parser))
+    options = parser.parser.parse_args(argv)
+    # With `--diff-base`, the first errors in a file might not be on changed lines, so files are checked in full
+    short_circuit = options.fail_fast and options.diff_base is None
+    if short_circuit:
+        # A single error is enough to fail, there's no need to look any further in the file
+        options.quotes_max_errors_per_file = 1
+    QuoteChecker.parse_options(options)
+
+    changed_lines = None
+    if options.diff_base is not None:
+        # Files which didn't change are skipped without being looked at
+        try:
+            changed_lines = get_changed_lines(options.diff_base, options.paths)
+        except ValueError as e:
+            parser.parser.error(str(e))
+        filenames = list(filter_python_files(sorted(changed_lines), options.exclude))
+    else:
+        filenames = list(iter_python_files(options.paths, options.exclude))
+    jobs = options.jobs if options.jobs is not None else multiprocessing.cpu_count()
+
+    results = run(filenames, options, jobs, fail_fast=short_circuit, threads=options.threads)
+    if options.format == 'default' and not options.fail_fast:
+        # Like flake8, sorted by filename
+        results = sorted(results, key=operator.itemgetter(0))
+
+    writer = WRITERS[options.format](sys.stdout)
+    error_count = 0
+    try:
+        for filename, errors in results:
+            for error in errors:
+                # Only errors on changed lines are new, files which couldn't be checked are always reported
+                if changed_lines is not None and error.row not in changed_lines[filename] and error.code != 'E902':
+                    continue
+                writer.write(filename, error)
+                error_count += 1
+                if options.fail_fast:
+                    return 1
+    finally:
+        writer.close()
+        # Stop checking the files left, rather than when the generator gets garbage collected
+        if hasattr(results, 'close'):
+            results.close()
+    return 1 if error_count else 0
@@ -0,0 +1,217 @@
+"""
+Daemon keeping the options, the compiled checks and the cache warm between checks, for editors
+and pre-commit hooks which would otherwise pay for starting Python and parsing options every time.
+
+    flake8-quotes-daemon serve /tmp/flake8-quotes.sock --inline-quotes double &
+    flake8-quotes-daemon check /tmp/flake8-quotes.sock src/
+    flake8-quotes-daemon check /tmp/flake8-quotes.sock - < src/module.py
+    flake8-quotes-daemon stop /tmp/flake8-quotes.sock
+
+Requests and responses are JSON objects, one per line, over a Unix domain socket:
+
+    {"cwd": "/project", "paths": ["src/"]}          -> {"results": [[filename, line, col, message], ...]}
+    {"source": "x = 1\\n", "filename": "stdin"}      -> {"results": [...]}
+    {"shutdown": true}                              -> {"results": []}
+    Anything else                                   -> {"error": "..."}
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import socket
+import sys
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.api import check_source
+from flake8_quotes.cli import DEFAULT_EXCLUDE, OptionParser, check_file, iter_python_files, read_config_defaults
+
+# Inline sources are sent on a single line
+MAX_REQUEST_SIZE = 64 * 1024 * 1024
+# Permissions of the socket, which is only for the user running the daemon
+SOCKET_MODE = 0o600
+
+
+class DaemonError(Exception):
+    """Error reported by the daemon for a request"""
+
+
+class Daemon(object):
+    def __init__(self, socket_path, options, workers=None):
+        self.socket_path = socket_path
+        self.options = options
+        # DEV: Checks run in threads, so that a big request doesn't hold up the others' I/O.
+        #   They share the immutable `settings`, set when starting
+        self.executor = concurrent.futures.ThreadPoolExecutor(workers)
+        self.settings = None
+        self.server = None
+        self._stopped = None
+        # Writers and handlers of the open connections, which are closed on shutdown
+        self._writers = set()
+        self._handlers = set()
+
+    async def start(self):
+        self.settings = QuoteChecker.get_settings(self.options)
+        if os.path.exists(self.socket_path):
+            if is_running(self.socket_path):
+                raise DaemonError('A daemon is already listening on {0}'.format(self.socket_path))
+            # Left over by a daemon which didn't shut down cleanly
+            os.unlink(self.socket_path)
+        self._stopped = asyncio.Event()
+        # Requests read files as the daemon's user and can shut it down, only let that user connect
+        # DEV: The socket is created with these permissions rather than changed once it is already listening.
+        #   Nothing else runs yet, the umask doesn't apply to files created by anything else
+        umask = os.umask(0o777 & ~SOCKET_MODE)
+        try:
+            self.server = await asyncio.start_unix_server(self.handle, path=self.socket_path, limit=MAX_REQUEST_SIZE)
+        finally:
+            os.umask(umask)
+
+    async def serve(self):
+        await self.start()
+        try:
+            await self._stopped.wait()
+        finally:
+            self.server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self.server.wait_closed()
+            self.executor.shutdown()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def stop(self):
+        self._stopped.set()
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        self._writers.add(writer)
+        self._handlers.add(asyncio.current_task())
+        try:
+            while not self._stopped.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if request.get('shutdown'):
+                        response = {'results': []}
+                        self.stop()
+                    else:
+                        results = await loop.run_in_executor(self.executor, self.check, request)
+                        response = {'results': results}
+                except Exception as e:
+                    # Bad requests and unexpected errors alike get an answer, rather than a closed connection
+                    response = {'error': str(e) or type(e).__name__}
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # The client went away, or sent a request too big to answer
+            pass
+        finally:
+            self._writers.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    def check(self, request):
+        """Get `[(filename, line, col, message), ...]` for a check request"""
+        if 'source' in request:
+            return check_source(request.get('filename', 'stdin'), request['source'], self.settings)
+        if 'paths' not in request:
+            raise DaemonError('Expected "paths" or "source" in the request')
+
+        cwd = request.get('cwd') or os.getcwd()
+        results = []
+        for path in request['paths']:
+            for filename in iter_python_files([os.path.join(cwd, path)], self.options.exclude):
+                # Files are reported relative to the client's working directory, like it named them
+                name = filename if os.path.isabs(path) else os.path.relpath(filename, cwd)
+                errors = check_file(filename, settings=self.settings)
+                results.extend((name, error.row, error.col, error.message) for error in errors)
+        return results
+
+
+def is_running(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def send(socket_path, request):
+    """Send `request` to the daemon listening on `socket_path` and get its results"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            line = f.readline()
+    try:
+        response = json.loads(line)
+    except ValueError:
+        raise DaemonError('The daemon closed the connection without answering' if not line else
+                          'Invalid response from the daemon: {0!r}'.format(line[:100]))
+    if 'error' in response:
+        raise DaemonError(response['error'])
+    return [tuple(result) for result in response['results']]
+
+
+def check_paths(socket_path, paths):
+    return send(socket_path, {'cwd': os.getcwd(), 'paths': list(paths)})
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(prog='flake8-quotes-daemon', description='Lint Python files for quotes, warm.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    serve_parser = OptionParser(commands.add_parser('serve', help='Start a daemon listening on SOCKET'))
+    serve_parser.parser.add_argument('socket')
+    serve_parser.add_option('--exclude', default=DEFAULT_EXCLUDE, parse_from_config=True,
+                            help='Comma-separated patterns of files and directories to skip '
+                            '(default: {0})'.format(DEFAULT_EXCLUDE))
+    QuoteChecker.add_options(serve_parser)
+    serve_parser.parser.set_defaults(**read_config_defaults(serve_parser))
+
+    check_parser = commands.add_parser('check', help='Check files with the daemon listening on SOCKET')
+    check_parser.add_argument('socket')
+    check_parser.add_argument('paths', nargs='*', default=['.'],
+                              help='Files and directories to check, - for stdin (default: .)')
+    check_parser.add_argument('--stdin-display-name', default='stdin',
+                              help='Name to report the source read from stdin as (default: stdin)')
+
+    stop_parser = commands.add_parser('stop', help='Stop the daemon listening on SOCKET')
+    stop_parser.add_argument('socket')
+    return parser
+
+
+def main(argv=None):
+    options = get_parser().parse_args(argv)
+    try:
+        if options.command == 'serve':
+            asyncio.run(Daemon(options.socket, options).serve())
+            return 0
+        if options.command == 'stop':
+            send(options.socket, {'shutdown': True})
+            return 0
+
+        if options.paths == ['-']:
+            results = send(options.socket, {'source': sys.stdin.read(), 'filename': options.stdin_display_name})
+        else:
+            results = check_paths(options.socket, options.paths)
+    except (OSError, DaemonError) as e:
+        sys.stderr.write('flake8-quotes-daemon: {0}\n'.format(e))
+        return 2
+
+    for filename, line, col, message in results:
+        # Same format as flake8, which reports 1-based columns
+        sys.stdout.write('{0}:{1}:{2}: {3}\n'.format(filename, line, col + 1, message))
+    return 1 if results else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
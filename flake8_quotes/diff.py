@@ -0,0 +1,92 @@
+"""
+Find what changed since a git revision, to only check the files and lines a change touches.
+
+    flake8-quotes --diff-base origin/master
+"""
+import re
+import subprocess
+
+# `@@ -1,2 +3,4 @@`, the new side's line count being 1 when left out
+HUNK_REGEX = re.compile(r'^@@ -\d+(?:,\d+)? \+(?P<start>\d+)(?:,(?P<count>\d+))? @@')
+# Escapes git uses in C-quoted paths (e.g. `"b/q\\"t.py"`), octal ones being bytes of the UTF-8 encoded path
+ESCAPE_REGEX = re.compile(rb'\\([0-7]{3}|.)')
+ESCAPES = {b'a': b'\a', b'b': b'\b', b't': b'\t', b'n': b'\n', b'v': b'\v', b'f': b'\f', b'r': b'\r'}
+
+
+def _unescape(match):
+    escape = match.group(1)
+    if len(escape) == 3:
+        return bytes([int(escape, 8)])
+    return ESCAPES.get(escape, escape)
+
+
+def unquote_path(path):
+    """Get the path from a `git diff` header, where it is C-quoted when it has e.g. quotes or control characters"""
+    if len(path) < 2 or not path.startswith('"') or not path.endswith('"'):
+        return path
+    return ESCAPE_REGEX.sub(_unescape, path[1:-1].encode('utf-8')).decode('utf-8', 'surrogateescape')
+
+
+def parse_diff(diff_lines):
+    """Get `{filename: set of rows}` for the rows added or changed in a `git diff --unified=0` output"""
+    changed_lines = {}
+    rows = None
+    for line in diff_lines:
+        if line.startswith('+++ '):
+            # Removed files are `/dev/null` on the new side, they have nothing to check
+            filename = line[len('+++ '):].rstrip('\n')
+            # DEV: git ends paths with spaces in them with a tab, paths with tabs in them are quoted
+            if filename.endswith('\t'):
+                filename = filename[:-1]
+            filename = unquote_path(filename)
+            rows = changed_lines.setdefault(filename[len('b/'):], set()) if filename.startswith('b/') else None
+            continue
+        match = HUNK_REGEX.match(line)
+        if match and rows is not None:
+            start = int(match.group('start'))
+            count = int(match.group('count') or 1)
+            rows.update(range(start, start + count))
+    return changed_lines
+
+
+def _git(*args):
+    try:
+        result = subprocess.run(('git',) + args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                universal_newlines=True, check=True)
+    except OSError as e:
+        raise ValueError('Could not run git: {0}'.format(e))
+    except subprocess.CalledProcessError as e:
+        raise ValueError('git {0} failed: {1}'.format(args[0], e.stderr.strip()))
+    return result.stdout
+
+
+def get_changed_lines(base, paths=()):
+    """
+    Get `{filename: set of rows}` for the files under `paths` changed since `base`, relative to the
+    current directory.
+
+    Changes are taken against the merge base of `base` and `HEAD`, like a pull request's, and include
+    uncommitted ones. Untracked files (unless ignored) are new, all of their rows have changed. Raises
+    `ValueError` when git fails (e.g. an unknown revision).
+    """
+    merge_base = _git('merge-base', base, 'HEAD').strip()
+    # DEV: Prefixes and quoting are set explicitly, so that the user's git configuration doesn't change them
+    diff = _git('-c', 'core.quotePath=false', 'diff', '--unified=0', '--no-color', '--no-ext-diff', '--relative',
+                '--diff-filter=AMR', '--src-prefix=a/', '--dst-prefix=b/', merge_base, '--', *paths)
+    # DEV: Not `str.splitlines()`, which would also split the changed lines on e.g. form feeds
+    changed_lines = parse_diff(diff.split('\n'))
+
+    untracked = _git('ls-files', '--others', '--exclude-standard', '-z', '--', *paths)
+    for filename in untracked.split('\0'):
+        if filename:
+            changed_lines[filename] = set(range(1, _count_rows(filename) + 1))
+    return changed_lines
+
+
+def _count_rows(filename):
+    try:
+        with open(filename, 'rb') as f:
+            return sum(1 for _ in f)
+    except OSError:
+        # Reported when checking the file
+        return 1
@@ -1,3 +1,4 @@
+import ast
 import tokenize
 
 # I don't think this is a minimized state machine, but it's clearer this
@@ -16,6 +17,11 @@ STATE_EXPECT_FUNCTION_DOCSTRING = 4
 # Just skipping tokens until we observe a class or a def.
 STATE_OTHER = 5
 
+# Nodes which can have a docstring as their first statement
+DOCSTRING_NODES = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+# Fields of the nodes holding statements, which class and function definitions can be nested in
+STATEMENT_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
 # These tokens don't matter here - they don't get in the way of docstrings
 TOKENS_TO_IGNORE = [
     tokenize.NEWLINE,
@@ -27,54 +33,123 @@ TOKENS_TO_IGNORE = [
 
 
 def get_docstring_tokens(tokens):
-    state = STATE_EXPECT_MODULE_DOCSTRING
-    # The number of currently open parentheses, square brackets, etc.
-    # This doesn't check if they're properly balanced, i.e. there isn't ([)], but we shouldn't
-    # need to - if they aren't, it shouldn't parse at all, so we ignore the bracket type
-    bracket_count = 0
-    docstring_tokens = set()
+    return {token for token, is_docstring in mark_docstring_tokens(tokens) if is_docstring}
+
+
+def get_docstring_positions(tokens):
+    """Get the `(row, col)` start position of each docstring token."""
+    return {token.start for token, is_docstring in mark_docstring_tokens(tokens) if is_docstring}
+
+
+def mark_docstring_tokens(tokens):
+    """
+    Lazily yield `(token, is_docstring)` for each token.
+
+    Whether a string is a docstring only depends on the tokens before it, so this
+    can run as a filter over a token stream without materializing it.
+    """
+    return DocstringDetector().mark(tokens)
+
+
+def get_ast_docstring_positions(tree):
+    """
+    Get the `(row, col)` start position of each docstring in the AST `tree`, e.g. as parsed by flake8.
+
+    Like everywhere in the AST, columns are offsets in UTF-8 bytes rather than in characters.
+    """
+    positions = set()
+    # DEV: Only statements are visited, docstrings can't be nested in expressions
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, DOCSTRING_NODES) and node.body:
+            statement = node.body[0]
+            if (isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant) and
+                    isinstance(statement.value.value, str)):
+                positions.add((statement.value.lineno, statement.value.col_offset))
 
+        for field in STATEMENT_FIELDS:
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                nodes.extend(children)
+    return positions
+
+
+def mark_docstring_positions(tokens, docstring_positions):
+    """
+    Lazily yield `(token, is_docstring)` for each token, with the docstrings found beforehand
+    by `get_ast_docstring_positions()`.
+    """
+    string = tokenize.STRING
+    docstring_rows = {row for row, _ in docstring_positions}
     for token in tokens:
-        if token.type in TOKENS_TO_IGNORE:
+        if token.type != string or token.start[0] not in docstring_rows:
+            yield token, False
             continue
-        if token.type == tokenize.STRING:
-            if state in [STATE_EXPECT_MODULE_DOCSTRING, STATE_EXPECT_CLASS_DOCSTRING,
-                         STATE_EXPECT_FUNCTION_DOCSTRING]:
-                docstring_tokens.add(token)
-                state = STATE_OTHER
-        # A class means we'll expect the class token
-        elif token.type == tokenize.NAME and token.string == 'class':
-            state = STATE_EXPECT_CLASS_COLON
-            # Just in case - they should be balanced normally
-            bracket_count = 0
-        # A def means we'll expect a colon after that
-        elif token.type == tokenize.NAME and token.string == 'def':
-            state = STATE_EXPECT_FUNCTION_COLON
-            # Just in case - they should be balanced normally
-            bracket_count = 0
-        # If we get a colon and we're expecting it, move to the next state
-        elif token.type == tokenize.OP and token.string == ':':
-            # If there are still left brackets open, it must be something other than the block start
-            if bracket_count == 0:
-                if state == STATE_EXPECT_CLASS_COLON:
-                    state = STATE_EXPECT_CLASS_DOCSTRING
-                elif state == STATE_EXPECT_FUNCTION_COLON:
-                    state = STATE_EXPECT_FUNCTION_DOCSTRING
-        # Count opening and closing brackets in bracket_count
-        elif token.type == tokenize.OP and token.string in ['(', '[', '{']:
-            bracket_count += 1
-            if state in [STATE_EXPECT_MODULE_DOCSTRING, STATE_EXPECT_CLASS_DOCSTRING,
-                         STATE_EXPECT_FUNCTION_DOCSTRING]:
-                state = STATE_OTHER
-        elif token.type == tokenize.OP and token.string in [')', ']', '}']:
-            bracket_count -= 1
-            if state in [STATE_EXPECT_MODULE_DOCSTRING, STATE_EXPECT_CLASS_DOCSTRING,
-                         STATE_EXPECT_FUNCTION_DOCSTRING]:
+        row, col = token.start
+        if not token.line.isascii():
+            col = len(token.line[:col].encode('utf-8'))
+        yield token, (row, col) in docstring_positions
+
+
+class DocstringDetector(object):
+    """Docstring detection state machine, which can be resumed at the start of any logical line"""
+    def __init__(self, state=STATE_EXPECT_MODULE_DOCSTRING):
+        # The state as of the last logical line seen
+        self.state = state
+
+    def mark(self, tokens):
+        state = self.state
+        # The number of currently open parentheses, square brackets, etc.
+        # This doesn't check if they're properly balanced, i.e. there isn't ([)], but we shouldn't
+        # need to - if they aren't, it shouldn't parse at all, so we ignore the bracket type
+        bracket_count = 0
+
+        for token in tokens:
+            is_docstring = False
+            if token.type in TOKENS_TO_IGNORE:
+                # Leave the state untouched, but expose it at the end of each logical line, where
+                # brackets are balanced, so detection can be resumed from there
+                if token.type == tokenize.NEWLINE:
+                    self.state = state
+            elif token.type == tokenize.STRING:
+                if state in [STATE_EXPECT_MODULE_DOCSTRING, STATE_EXPECT_CLASS_DOCSTRING,
+                             STATE_EXPECT_FUNCTION_DOCSTRING]:
+                    is_docstring = True
+                    state = STATE_OTHER
+            # A class means we'll expect the class token
+            elif token.type == tokenize.NAME and token.string == 'class':
+                state = STATE_EXPECT_CLASS_COLON
+                # Just in case - they should be balanced normally
+                bracket_count = 0
+            # A def means we'll expect a colon after that
+            elif token.type == tokenize.NAME and token.string == 'def':
+                state = STATE_EXPECT_FUNCTION_COLON
+                # Just in case - they should be balanced normally
+                bracket_count = 0
+            # If we get a colon and we're expecting it, move to the next state
+            elif token.type == tokenize.OP and token.string == ':':
+                # If there are still left brackets open, it must be something other than the block start
+                if bracket_count == 0:
+                    if state == STATE_EXPECT_CLASS_COLON:
+                        state = STATE_EXPECT_CLASS_DOCSTRING
+                    elif state == STATE_EXPECT_FUNCTION_COLON:
+                        state = STATE_EXPECT_FUNCTION_DOCSTRING
+            # Count opening and closing brackets in bracket_count
+            elif token.type == tokenize.OP and token.string in ['(', '[', '{']:
+                bracket_count += 1
+                if state in [STATE_EXPECT_MODULE_DOCSTRING, STATE_EXPECT_CLASS_DOCSTRING,
+                             STATE_EXPECT_FUNCTION_DOCSTRING]:
+                    state = STATE_OTHER
+            elif token.type == tokenize.OP and token.string in [')', ']', '}']:
+                bracket_count -= 1
+                if state in [STATE_EXPECT_MODULE_DOCSTRING, STATE_EXPECT_CLASS_DOCSTRING,
+                             STATE_EXPECT_FUNCTION_DOCSTRING]:
+                    state = STATE_OTHER
+            # The token is not one of the recognized types. If we're expecting a colon, then all good,
+            # but if we're expecting a docstring, it would no longer be a docstring
+            elif state in [STATE_EXPECT_MODULE_DOCSTRING, STATE_EXPECT_CLASS_DOCSTRING,
+                           STATE_EXPECT_FUNCTION_DOCSTRING]:
                 state = STATE_OTHER
-        # The token is not one of the recognized types. If we're expecting a colon, then all good,
-        # but if we're expecting a docstring, it would no longer be a docstring
-        elif state in [STATE_EXPECT_MODULE_DOCSTRING, STATE_EXPECT_CLASS_DOCSTRING,
-                       STATE_EXPECT_FUNCTION_DOCSTRING]:
-            state = STATE_OTHER
 
-    return docstring_tokens
+            yield token, is_docstring
@@ -0,0 +1,181 @@
+"""
+Rewrite the strings `QuoteChecker` reports so they use the preferred quotes.
+
+Fixes are spliced into the source by token position and each file is written at most once.
+A fix is only applied when the rewritten string parses to the same value as the original,
+anything else (e.g. a raw string that would need escaping) is left for a human to fix.
+"""
+import ast
+import collections
+import io
+import os
+import shutil
+import tempfile
+import tokenize
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.docstring_detection import mark_docstring_tokens
+from flake8_quotes.noqa import NoqaIndex
+from flake8_quotes.prefilter import is_trivially_compliant
+
+
+def _unescape_quote(contents, quote):
+    """Remove backslashes escaping `quote`, which are no longer needed once it isn't the delimiter"""
+    result = []
+    index = 0
+    while index < len(contents):
+        char = contents[index]
+        if char == '\\' and index + 1 < len(contents):
+            escaped = contents[index + 1]
+            result.append(escaped if escaped == quote else char + escaped)
+            index += 2
+            continue
+        result.append(char)
+        index += 1
+    return ''.join(result)
+
+
+def _escape_for_delimiter(contents, delimiter):
+    """Escape quotes which would otherwise end a string delimited by `delimiter` early"""
+    quote = delimiter[0]
+    if len(delimiter) == 3:
+        contents = contents.replace(delimiter, '\\' + delimiter)
+        # A quote right before the closing delimiter would be read as part of it
+        if contents.endswith(quote) and not contents.endswith('\\' + quote):
+            contents = contents[:-1] + '\\' + quote
+    return contents
+
+
+def _parse(token_string):
+    try:
+        return ast.dump(ast.parse('(\n' + token_string + '\n)', mode='eval'))
+    except (SyntaxError, ValueError):
+        return None
+
+
+def fix_string(token_string, code, config):
+    """Get `token_string` rewritten to fix the error `code` (e.g. `Q000`), or `None` if it can't be fixed"""
+    last_quote_char = token_string[-1]
+    first_quote_index = token_string.index(last_quote_char)
+    prefix = token_string[:first_quote_index]
+    unprefixed_string = token_string[first_quote_index:]
+    is_multiline_string = unprefixed_string[0] * 3 == unprefixed_string[0:3]
+    delimiter = unprefixed_string[:3] if is_multiline_string else unprefixed_string[0]
+    contents = unprefixed_string[len(delimiter):-len(delimiter)]
+    is_raw = 'r' in prefix.lower()
+
+    if code == 'Q000':
+        # Bad quotes around a string which doesn't contain the good ones
+        new_delimiter = config['good_single']
+        if not is_raw:
+            contents = _unescape_quote(contents, config['bad_single'])
+    elif code == 'Q003':
+        # Good quotes which need escaping inside, while the bad ones don't
+        new_delimiter = config['bad_single']
+        contents = _unescape_quote(contents, config['good_single'])
+    elif code == 'Q001':
+        new_delimiter = config['good_multiline']
+    elif code == 'Q002':
+        new_delimiter = config['good_docstring']
+    else:
+        return None
+
+    if not is_raw:
+        contents = _escape_for_delimiter(contents, new_delimiter)
+    fixed_string = prefix + new_delimiter + contents + new_delimiter
+
+    # Never change what the string means
+    original = _parse(token_string)
+    if original is None or _parse(fixed_string) != original:
+        return None
+    return fixed_string
+
+
+def get_fixes(checker, file_contents):
+    """Yield `(start, end, replacement)` for each reported string in `file_contents` which can be fixed."""
+    if is_trivially_compliant(file_contents, checker.config):
+        return
+
+    noqa_index = NoqaIndex()
+    current_row = 0
+
+    def index_comments(tokens):
+        nonlocal current_row
+        for token in tokens:
+            current_row = token.start[0]
+            if token.type == tokenize.COMMENT:
+                noqa_index.add_comment(token.string, current_row)
+            yield token
+
+    def get_fix(token_string, token_start, token_end, error):
+        if noqa_index.is_suppressed(error.row, error.code):
+            return None
+        fixed_string = fix_string(token_string, error.code, checker.config)
+        return None if fixed_string is None else (token_start, token_end, fixed_string)
+
+    # DEV: Like in `QuoteChecker._check_tokens()`, `noqa` comments come after the strings on their line,
+    #   so the strings are held back until the token stream has moved past their line
+    tokens = index_comments(checker.get_tokens(file_contents))
+    pending_strings = collections.deque()
+    for token_string, token_start, token_end, is_docstring in checker._iter_strings(mark_docstring_tokens(tokens)):
+        while pending_strings and pending_strings[0][3].row < current_row:
+            fix = get_fix(*pending_strings.popleft())
+            if fix is not None:
+                yield fix
+        for error in checker._check_string(token_string, token_start, is_docstring):
+            pending_strings.append((token_string, token_start, token_end, error))
+    for pending_string in pending_strings:
+        fix = get_fix(*pending_string)
+        if fix is not None:
+            yield fix
+
+
+def apply_fixes(file_contents, fixes):
+    """Splice the `(start, end, replacement)` fixes into `file_contents` and get the new source."""
+    line_offsets = [0]
+    for line in file_contents:
+        line_offsets.append(line_offsets[-1] + len(line))
+    source = ''.join(file_contents)
+
+    parts = []
+    position = 0
+    for (start_row, start_col), (end_row, end_col), replacement in fixes:
+        start = line_offsets[start_row - 1] + start_col
+        if start < position:
+            # Overlaps the previous fix (e.g. a string nested in a fixed f-string)
+            continue
+        parts.append(source[position:start])
+        parts.append(replacement)
+        position = line_offsets[end_row - 1] + end_col
+    parts.append(source[position:])
+    return ''.join(parts)
+
+
+def fix_file(filename, settings=None):
+    """Fix `filename` in place and get the number of fixed strings, per the `QuoteChecker` `settings` if given."""
+    with open(filename, 'rb') as f:
+        contents = f.read()
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(contents).readline)
+    # Keep line endings as they are
+    # DEV: Unlike `str.splitlines()`, only split where the tokenizer does, not on e.g. form feeds or U+2028
+    file_contents = io.StringIO(contents.decode(encoding), newline='').readlines()
+
+    fixes = list(get_fixes(QuoteChecker(None, filename=filename, settings=settings), file_contents))
+    if not fixes:
+        return 0
+
+    fixed_contents = apply_fixes(file_contents, fixes).encode(encoding)
+    # Replace the file at once, so that it is never left half written
+    fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(fixed_contents)
+        shutil.copymode(filename, temporary_path)
+        os.replace(temporary_path, filename)
+    except BaseException:
+        try:
+            os.unlink(temporary_path)
+        except OSError:
+            pass
+        raise
+    return len(fixes)
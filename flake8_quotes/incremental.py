@@ -0,0 +1,111 @@
+"""
+Incremental checking for editors and language servers, which re-check a buffer on every change.
+
+Rather than re-tokenizing the whole buffer, `IncrementalChecker.update()` resumes tokenizing at
+the start of the logical line closest before the change, and stops as soon as the tokenizer is back
+in the same state as before at a line after the change. The errors for the rest of the buffer
+are reused, shifted by the number of inserted or removed lines.
+"""
+import bisect
+import itertools
+import tokenize
+
+from flake8_quotes import QuoteChecker, generate_tokens
+from flake8_quotes.docstring_detection import STATE_EXPECT_MODULE_DOCSTRING, DocstringDetector
+from flake8_quotes.noqa import NoqaIndex
+
+
+class IncrementalChecker(object):
+    def __init__(self, lines, checker=None):
+        self.checker = checker if checker is not None else QuoteChecker(None, lines=lines)
+        self.lines = list(lines)
+        # `(line, col, message)` for the whole buffer, sorted by position
+        self.errors = []
+        # Rows a logical line starts at, and the tokenizer state to resume from there: the
+        # docstring detection state, the indentation levels and whether checks are turned off
+        self._restart_rows = [1]
+        self._restart_states = [(STATE_EXPECT_MODULE_DOCSTRING, ('',), False)]
+        self.errors = self._check_from(0, None, 0)
+
+    def update(self, lines, start_line, old_end_line, new_end_line):
+        """
+        Re-check the buffer after lines `start_line` to `old_end_line` (1-based and inclusive)
+        were replaced by lines `start_line` to `new_end_line` of `lines`, and get all of its errors.
+        """
+        self.lines = list(lines)
+        # The last logical line starting before the change, whose state is unaffected by it
+        restart_index = bisect.bisect_right(self._restart_rows, start_line) - 1
+        self.errors = self._check_from(restart_index, new_end_line, new_end_line - old_end_line)
+        return self.errors
+
+    def _check_from(self, restart_index, new_end_line, line_delta):
+        start_row = self._restart_rows[restart_index]
+        docstring_state, indents, off = self._restart_states[restart_index]
+
+        # Lines re-creating the indentation levels, so that dedents are tokenized just like before
+        priming_lines = [indent + 'if 1:\n' for indent in indents[1:]]
+        row_offset = start_row - 1 - len(priming_lines)
+        lines = itertools.chain(priming_lines, itertools.islice(self.lines, start_row - 1, None))
+        tokens = generate_tokens(lines)
+
+        old_restarts = dict(zip(self._restart_rows[restart_index:], self._restart_states[restart_index:]))
+        restart_rows = self._restart_rows[:restart_index + 1]
+        restart_states = self._restart_states[:restart_index + 1]
+        indent_stack = list(indents)
+        noqa_index = NoqaIndex()
+        if off:
+            noqa_index.turn_off(start_row)
+        # DEV: Unbalanced closing brackets make `tokenize` skip indentation tracking for the rest
+        #   of the file, which can't be resumed from a snapshot, so no restart points are kept then
+        paren_depth = 0
+        # The first row after the change from which on the previous results are still valid
+        sync_row = None
+
+        def track_state(marked_tokens):
+            nonlocal paren_depth, sync_row
+            for token, is_docstring in marked_tokens:
+                if token.type == tokenize.INDENT:
+                    indent_stack.append(token.string)
+                elif token.type == tokenize.DEDENT:
+                    indent_stack.pop()
+                elif token.type == tokenize.COMMENT:
+                    noqa_index.add_comment(token.string, token.start[0] + row_offset)
+                elif token.type == tokenize.OP and token.string in '([{':
+                    paren_depth += 1
+                elif token.type == tokenize.OP and token.string in ')]}':
+                    paren_depth -= 1
+                elif token.type == tokenize.NEWLINE and paren_depth >= 0:
+                    row = token.end[0] + 1 + row_offset
+                    state = (detector.state, tuple(indent_stack), noqa_index.off)
+                    if new_end_line is not None and row > new_end_line and \
+                            old_restarts.get(row - line_delta) == state:
+                        # Everything from here on tokenizes exactly like before the change
+                        sync_row = row
+                        return
+                    restart_rows.append(row)
+                    restart_states.append(state)
+                yield token, is_docstring
+
+        detector = DocstringDetector(docstring_state)
+        real_tokens = (token for token in tokens if token.start[0] > len(priming_lines))
+        errors = []
+        for token_string, token_start, _, is_docstring in self.checker._iter_strings(
+                track_state(detector.mark(real_tokens))):
+            for error in self.checker._check_string(token_string, token_start, is_docstring):
+                errors.append((error.row + row_offset, error.col, error.message))
+        # All `noqa` comments for these lines have been seen, since we stop at a logical line boundary
+        errors = [error for error in errors if not noqa_index.is_suppressed(error[0], error[2][:4])]
+
+        before = [error for error in self.errors if error[0] < start_row]
+        if sync_row is None:
+            after = []
+        else:
+            old_sync_row = sync_row - line_delta
+            after = [(line + line_delta, col, message) for line, col, message in self.errors if line >= old_sync_row]
+            index = bisect.bisect_left(self._restart_rows, old_sync_row)
+            restart_rows.extend(row + line_delta for row in self._restart_rows[index:])
+            restart_states.extend(self._restart_states[index:])
+
+        self._restart_rows = restart_rows
+        self._restart_states = restart_states
+        return before + errors + after
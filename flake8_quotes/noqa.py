@@ -0,0 +1,76 @@
+"""
+Index of the errors suppressed by comments.
+
+    x = "foo"  # noqa                -> All errors on this line
+    x = "foo"  # noqa: Q000,Q003     -> Only these errors (or codes starting like them) on this line
+    # flake8-quotes: off             -> All errors from this line...
+    # flake8-quotes: on              -> ...up to this one
+"""
+import bisect
+import re
+import tokenize
+
+# Same syntax as flake8's, `# noqa:Q000 Q003` and `# NOQA : Q000, Q003` work as well
+NOQA_REGEX = re.compile(r'#\s*noqa(?:\s*:\s*(?P<codes>[A-Z]+[0-9]+(?:[,\s]+[A-Z]+[0-9]+)*))?', re.IGNORECASE)
+RANGE_REGEX = re.compile(r'#\s*flake8-quotes\s*:\s*(?P<state>off|on)\b', re.IGNORECASE)
+
+
+class NoqaIndex(object):
+    def __init__(self):
+        # Row -> tuple of suppressed codes, empty when all of them are
+        self.lines = {}
+        # Regions where checks are turned off, `_off_ends` being `None` for a region still open
+        self._off_starts = []
+        self._off_ends = []
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        noqa_index = cls()
+        for token in tokens:
+            if token.type == tokenize.COMMENT:
+                noqa_index.add_comment(token.string, token.start[0])
+        return noqa_index
+
+    @property
+    def off(self):
+        """Whether the last comment added left checks turned off"""
+        return bool(self._off_ends) and self._off_ends[-1] is None
+
+    def turn_off(self, row):
+        if not self.off:
+            self._off_starts.append(row)
+            self._off_ends.append(None)
+
+    def turn_on(self, row):
+        if self.off:
+            self._off_ends[-1] = row
+
+    def add_comment(self, comment, row):
+        # Keep recognizing anything ending in `noqa`, like before codes were supported
+        if comment.endswith('noqa'):
+            self.lines[row] = ()
+            return
+
+        match = NOQA_REGEX.search(comment)
+        if match:
+            codes = match.group('codes')
+            # DEV: There is at most one comment per line, nothing to merge
+            self.lines[row] = tuple(re.split(r'[,\s]+', codes.upper())) if codes else ()
+            return
+
+        match = RANGE_REGEX.search(comment)
+        if match:
+            if match.group('state').lower() == 'off':
+                self.turn_off(row)
+            else:
+                self.turn_on(row)
+
+    def is_suppressed(self, row, code):
+        codes = self.lines.get(row)
+        if codes is not None and (not codes or code.startswith(codes)):
+            return True
+
+        # DEV: The rows of both the `off` and the `on` comment are part of the region, as strings
+        #   before a trailing `on` comment are skipped while streaming
+        index = bisect.bisect_right(self._off_starts, row) - 1
+        return index >= 0 and (self._off_ends[index] is None or row <= self._off_ends[index])
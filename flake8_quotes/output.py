@@ -0,0 +1,84 @@
+"""
+Structured output for the standalone command, written as results come in rather than once all files are checked.
+
+    json-lines  One JSON object per error
+    sarif       A SARIF 2.1.0 log, e.g. for code scanning services
+"""
+import json
+
+from flake8_quotes.__about__ import __version__
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+INFORMATION_URI = 'https://github.com/zheller/flake8-quotes'
+RULES = (
+    ('Q000', 'Remove bad quotes'),
+    ('Q001', 'Remove bad quotes from multiline string'),
+    ('Q002', 'Remove bad quotes from docstring'),
+    ('Q003', 'Change outer quotes to avoid escaping inner quotes'),
+    ('E902', 'File could not be checked'),
+)
+
+
+class TextWriter(object):
+    """Same format as flake8"""
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, filename, error):
+        # DEV: flake8 reports 1-based columns
+        self.stream.write('{0}:{1}:{2}: {3}\n'.format(filename, error.row, error.col + 1, error.message))
+
+    def close(self):
+        pass
+
+
+class JsonLinesWriter(TextWriter):
+    def write(self, filename, error):
+        self.stream.write(json.dumps({
+            'filename': filename,
+            'code': error.code,
+            'message': error.message,
+            'line': error.row,
+            'column': error.col + 1,
+            'replacement': error.replacement,
+        }) + '\n')
+
+
+class SarifWriter(TextWriter):
+    def __init__(self, stream):
+        super(SarifWriter, self).__init__(stream)
+        driver = {
+            'name': 'flake8-quotes',
+            'version': __version__,
+            'informationUri': INFORMATION_URI,
+            'rules': [{'id': code, 'shortDescription': {'text': text}} for code, text in RULES],
+        }
+        # DEV: The log is written up to its results, which are then added one at a time
+        header = json.dumps({'version': '2.1.0', '$schema': SARIF_SCHEMA, 'runs': [{'tool': {'driver': driver}}]})
+        self.stream.write(header[:-len('}]}')] + ', "results": [')
+        self.result_count = 0
+
+    def write(self, filename, error):
+        result = {
+            'ruleId': error.code,
+            'level': 'error' if error.code.startswith('E') else 'warning',
+            'message': {'text': error.message[len(error.code):].lstrip()},
+            'locations': [{'physicalLocation': {
+                'artifactLocation': {'uri': filename.replace('\\', '/')},
+                'region': {'startLine': error.row, 'startColumn': error.col + 1},
+            }}],
+        }
+        if error.replacement is not None:
+            result['properties'] = {'replacement': error.replacement}
+        self.stream.write((',\n' if self.result_count else '\n') + json.dumps(result))
+        self.result_count += 1
+
+    def close(self):
+        self.stream.write('\n]}]}\n')
+
+
+WRITERS = {
+    'default': TextWriter,
+    'json-lines': JsonLinesWriter,
+    'sarif': SarifWriter,
+}
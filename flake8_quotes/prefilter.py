@@ -0,0 +1,61 @@
+import functools
+import re
+import sys
+
+_IS_PEP701 = sys.version_info[:2] >= (3, 12)
+
+# Any place where the tokenizer could start a docstring: the start of a (physical) line
+# or right after a colon, followed by an optional string prefix and a quote.
+# DEV: This matches far more than actual docstrings (e.g. dict values), which only
+#   means we fall back to the full check more often than strictly needed
+DOCSTRING_CANDIDATE = r'(?:^|[:\r])[ \t\f\ufeff]*[A-Za-z]{0,2}'
+
+# An f-string prefix, after which PEP 701 allows reusing the outer quotes in nested strings
+FSTRING_PREFIX = r'(?:[fF][rR]?|[rR][fF])[\'"]'
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_pattern(good_single, bad_single, good_multiline, good_docstring, avoid_escape):
+    # Each alternative is a necessary condition for one of the errors,
+    # if none of them matches, none of the errors can be reported
+    bad = re.escape(bad_single)
+    if good_multiline == bad_single * 3:
+        # Q000: A bad quote that is not part of a preferred multiline quote. The opening quote of
+        #   an inline string (or the pair of an empty one) always is in a run of 1, 2 or 4+ quotes
+        # Q001/Q002: Any other multiline string or docstring is found by the other alternatives
+        inline_bad_quote = '(?<!{0})(?!{0}{0}{0}(?!{0})){0}'.format(bad)
+    else:
+        # Q000: An inline string using the bad quote,
+        # Q001/Q002: Or a bad multiline or docstring quote built from it
+        inline_bad_quote = bad
+    alternatives = [
+        inline_bad_quote,
+        # Q002: A docstring that does not start with the preferred docstring quotes
+        DOCSTRING_CANDIDATE + '(?!' + re.escape(good_docstring) + ')[\'"]',
+    ]
+    # Q001: A multiline string built from the good inline quote, when it isn't preferred
+    if good_multiline[0] != good_single:
+        alternatives.append(re.escape(good_single * 3))
+    if avoid_escape:
+        # Q003: An escaped good quote inside a string
+        alternatives.append(re.escape('\\' + good_single))
+        # Q003: Or an unescaped one nested in an f-string
+        if _IS_PEP701:
+            alternatives.append(FSTRING_PREFIX)
+    return re.compile('|'.join(alternatives), re.MULTILINE)
+
+
+def is_trivially_compliant(lines, config):
+    """
+    Cheaply prove that none of Q000-Q003 can be reported for `lines`.
+
+    This never tokenizes, so `False` only means that the full check is needed.
+    """
+    search = _compile_pattern(
+        config['good_single'],
+        config['bad_single'],
+        config['good_multiline'],
+        config['good_docstring'],
+        config['avoid_escape'],
+    ).search
+    return not any(map(search, lines))
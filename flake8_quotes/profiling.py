@@ -0,0 +1,112 @@
+import sys
+import time
+
+from flake8_quotes.run_records import RunRecords
+
+# Set in the main process, so worker processes (forked or spawned) record into the same directory
+DIRECTORY_ENVIRONMENT_VARIABLE = 'FLAKE8_QUOTES_PROFILE_DIR'
+# Phases of the token pipeline, each consuming the output of the previous one
+PIPELINE_PHASES = ('tokenize', 'noqa', 'docstrings', 'strings', 'check')
+# DEV: The prefilter runs while reading or tokenizing, depending on where the file comes from
+PHASES = ('read', 'prefilter') + PIPELINE_PHASES
+SLOWEST_FILES = 10
+
+
+class FileProfile(object):
+    """Wall time and number of items per phase of checking a single file"""
+    def __init__(self, filename):
+        self.filename = filename
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(PHASES, 0)
+        # Time of the prefilter which was also timed as part of another phase, see `add_prefilter_time()`
+        self._prefilter_times = dict.fromkeys(PHASES, 0.0)
+        # Lookups in the process-wide verdict cache of the string checks while checking this file
+        self.verdict_cache_hits = 0
+        self.verdict_cache_misses = 0
+
+    def timed(self, phase, iterable):
+        """
+        Yield from `iterable`, adding the time spent getting each item to `phase`.
+
+        For pipeline phases this includes the time of the earlier phases, which `to_json()` takes out.
+        """
+        iterator = iter(iterable)
+        counter = time.perf_counter
+        elapsed = 0.0
+        count = 0
+        try:
+            while True:
+                start = counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += counter() - start
+                    return
+                elapsed += counter() - start
+                count += 1
+                yield item
+        finally:
+            self.times[phase] += elapsed
+            self.counts[phase] += count
+
+    def add_prefilter_time(self, elapsed, phase):
+        """Count `elapsed` seconds spent in the prefilter while timing `phase` as prefiltering only"""
+        self.times['prefilter'] += elapsed
+        self._prefilter_times[phase] += elapsed
+
+    def to_json(self):
+        times = dict(self.times)
+        for earlier_phase, phase in zip(PIPELINE_PHASES, PIPELINE_PHASES[1:]):
+            times[phase] = max(self.times[phase] - self.times[earlier_phase], 0.0)
+        for phase, elapsed in self._prefilter_times.items():
+            times[phase] = max(times[phase] - elapsed, 0.0)
+        return {
+            'filename': self.filename,
+            'times': times,
+            'tokens': self.counts['tokenize'],
+            'strings': self.counts['strings'],
+            'verdict_cache_hits': self.verdict_cache_hits,
+            'verdict_cache_misses': self.verdict_cache_misses,
+        }
+
+
+class Profiler(RunRecords):
+    """
+    Collects a `FileProfile` per checked file, across all of flake8's worker processes.
+
+    The main process reads them back to print the report when it exits.
+    """
+    DIRECTORY_ENVIRONMENT_VARIABLE = DIRECTORY_ENVIRONMENT_VARIABLE
+    DIRECTORY_PREFIX = 'flake8-quotes-profile-'
+
+    def report(self, stream):
+        records = self.get_records()
+        totals = dict.fromkeys(PHASES, 0.0)
+        for record in records:
+            for phase in PHASES:
+                totals[phase] += record['times'][phase]
+        total = sum(totals.values())
+
+        stream.write('flake8-quotes profile: {0} files, {1} tokens, {2} strings, {3:.3f}s\n'.format(
+            len(records), sum(record['tokens'] for record in records),
+            sum(record['strings'] for record in records), total))
+        for phase in PHASES:
+            stream.write('  {0:<12}{1:10.3f}s {2:6.1f}%\n'.format(
+                phase, totals[phase], 100.0 * totals[phase] / total if total else 0.0))
+        hits = sum(record['verdict_cache_hits'] for record in records)
+        lookups = hits + sum(record['verdict_cache_misses'] for record in records)
+        if lookups:
+            stream.write('Verdict cache: {0} hits, {1} misses ({2:.1f}% hit rate)\n'.format(
+                hits, lookups - hits, 100.0 * hits / lookups))
+
+        stream.write('Slowest files:\n')
+        records.sort(key=lambda record: sum(record['times'].values()), reverse=True)
+        for record in records[:SLOWEST_FILES]:
+            stream.write('  {0:10.3f}s  {1} ({2} tokens, {3} strings)\n'.format(
+                sum(record['times'].values()), record['filename'], record['tokens'], record['strings']))
+
+    def finish(self, stream=None):
+        try:
+            self.report(stream if stream is not None else sys.stderr)
+        finally:
+            self.close()
@@ -0,0 +1,9 @@
+"""
+Compact record of an error, much smaller than a dict per error on files with lots of them.
+
+`message` is the full message as reported by flake8, starting with `code`. `replacement` is the
+string suggested to replace the reported one with, `None` when there is none or it wasn't asked for.
+"""
+import collections
+
+QuoteError = collections.namedtuple('QuoteError', ('code', 'message', 'row', 'col', 'replacement'))
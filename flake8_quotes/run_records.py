@@ -0,0 +1,67 @@
+"""
+Records of a whole run (one JSON object per file), collected across flake8's worker processes.
+
+Each process appends its records to its own file in a temporary directory. The main process creates it
+and hands it over to the workers (forked or spawned) in an environment variable, then reads all the
+records back when it exits.
+"""
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+
+class RunRecords(object):
+    """Base class of `profiling.Profiler` and `stats.RunStats`, which `finish()` with the records"""
+    # Environment variable holding the directory, and prefix of its name, set by subclasses
+    DIRECTORY_ENVIRONMENT_VARIABLE = None
+    DIRECTORY_PREFIX = None
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.records_path = os.path.join(directory, '{0}.jsonl'.format(os.getpid()))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, *args, **kwargs):
+        """
+        Get the records of the main process from a worker, or set up new ones finished at exit.
+
+        `args` and `kwargs` are only given to new records, workers leave finishing to the main process.
+        """
+        directory = os.environ.get(cls.DIRECTORY_ENVIRONMENT_VARIABLE)
+        if directory is not None and os.path.isdir(directory):
+            return cls(directory)
+
+        records = cls(tempfile.mkdtemp(prefix=cls.DIRECTORY_PREFIX), *args, **kwargs)
+        os.environ[cls.DIRECTORY_ENVIRONMENT_VARIABLE] = records.directory
+        atexit.register(records.finish)
+        return records
+
+    def add(self, file_record):
+        """Add the `to_json()` of `file_record`"""
+        # DEV: Appended as soon as a file is done, as worker processes exit without cleaning up.
+        #   Threads checking files at the same time take turns, so that lines don't get interleaved
+        line = json.dumps(file_record.to_json()) + '\n'
+        with self._lock, open(self.records_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    def get_records(self):
+        records = []
+        for name in sorted(os.listdir(self.directory)):
+            with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+        return records
+
+    def finish(self):
+        """Report the records, implemented by subclasses which must `close()` even when it fails"""
+        raise NotImplementedError
+
+    def close(self):
+        """Remove the records, which can't be added to anymore"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        if os.environ.get(self.DIRECTORY_ENVIRONMENT_VARIABLE) == self.directory:
+            del os.environ[self.DIRECTORY_ENVIRONMENT_VARIABLE]
+        atexit.unregister(self.finish)
@@ -0,0 +1,258 @@
+"""
+String literal scanner, a lighter alternative to `tokenize` selected with `--quotes-lexer scanner`.
+
+The checks only look at strings, at comments (for `noqa`) and at the few tokens docstring detection
+depends on, so that's all this produces, as `tokenize.TokenInfo`:
+
+    STRING                      Strings, and f-strings before Python 3.12, like `tokenize`
+    FSTRING_START/MIDDLE/END    F-strings from Python 3.12 (PEP 701), like `tokenize`, with their nested
+                                strings and each line of code in their replacement fields as an `OP`
+    COMMENT                     Comments
+    NAME                        The `class` and `def` keywords
+    OP                          Brackets and colons, and any other code in between, as a single token
+
+Code which `tokenize` would reject isn't diagnosed, apart from unterminated multiline strings.
+"""
+import re
+import sys
+import tokenize
+
+_IS_PEP701 = sys.version_info[:2] >= (3, 12)
+if _IS_PEP701:
+    FSTRING_START, FSTRING_MIDDLE, FSTRING_END = tokenize.FSTRING_START, tokenize.FSTRING_MIDDLE, tokenize.FSTRING_END
+
+# Prefixes a string can have, in any case
+PREFIX = r'(?:[rR][bBfF]?|[bBfF][rR]?|[uU])'
+# A run of code which doesn't matter, e.g. `x = foo.bar(1) +`. It stops before anything which does,
+# including keywords and words which are a string prefix
+CODE = (r'(?:[^\w\s\'"#\\{0}]|[{1}]+|\w+\b(?![\'"])(?<!\bclass)(?<!\bdef)'
+        r'|(?!{2}[\'"])\w+(?=[\'"]))+')
+
+TOKEN_REGEX = r'''
+    (?P<space>[ \t\f\r\ufeff]+|\\\r?\n|\n)
+    |(?P<comment>\#[^\r\n]*)
+    |(?P<string>(?P<prefix>{0}?)(?P<quote>\'\'\'|"""|'|"))
+    |(?P<keyword>(?:class|def)\b)
+    |(?P<op>{1})
+    |(?P<code>{2})
+    |(?P<error>.)
+'''
+# Brackets and colons only matter in `class` and `def` statements, up to the colon starting their block.
+# Elsewhere they are part of the code, which then runs over lines too
+CODE_TOKEN_REGEX = re.compile(TOKEN_REGEX.format(PREFIX, '(?!)', CODE.format('', r' \t\f\r\n\ufeff', PREFIX)),
+                              re.VERBOSE)
+HEADER_TOKEN_REGEX = re.compile(
+    TOKEN_REGEX.format(PREFIX, r'[()\[\]{}:]', CODE.format(r'()\[\]{}:', r' \t\f\r\ufeff', PREFIX)), re.VERBOSE)
+# Most `class` and `def` statements, e.g. `def foo(self, bar=1) -> int:`, are matched at once up to their colon
+HEADER_REGEX = re.compile(r'[ \t]*([^\'"#\\:()\[\]{}\n]*(?:\([^\'"#\\()\[\]{}]*\))?[^\'"#\\:()\[\]{}\n]*)(?=:)')
+
+# The rest of a string after its opening quote, including the closing one. Backslashes
+# escape anything, quotes and line breaks included, even in raw strings
+STRING_BODIES = {
+    "'": re.compile(r"[^'\\\r\n]*(?:\\[\s\S][^'\\\r\n]*)*'"),
+    '"': re.compile(r'[^"\\\r\n]*(?:\\[\s\S][^"\\\r\n]*)*"'),
+    "'''": re.compile(r"[^'\\]*(?:(?:\\[\s\S]|'(?!''))[^'\\]*)*'''"),
+    '"""': re.compile(r'[^"\\]*(?:(?:\\[\s\S]|"(?!""))[^"\\]*)*"""'),
+}
+
+# Code in an f-string replacement field, where brackets and colons matter to find its end
+FIELD_TOKEN_REGEX = re.compile(r'''
+    (?P<space>[ \t\f\r\n\ufeff]+|\\\r?\n)
+    |(?P<comment>\#[^\r\n]*)
+    |(?P<string>(?P<prefix>{0}?)(?P<quote>\'\'\'|"""|'|"))
+    |(?P<open>[(\[{{])
+    |(?P<close>[)\]}}])
+    |(?P<colon>:)
+    |(?P<code>(?:[^\w\s\'"#()\[\]{{}}:\\]|\w+\b(?![\'"])|(?!{0}[\'"])\w+(?=[\'"]))+)
+    |(?P<error>.)
+'''.format(PREFIX), re.VERBOSE)
+
+
+def _get_literal_regex(quote, is_raw, is_format_spec):
+    """Literal text of an f-string, up to a replacement field or its closing quote"""
+    char = quote[0]
+    # DEV: A backslash doesn't escape braces, `f'\{x}'` is a backslash followed by a replacement field
+    parts = [r'\\[^{}]', r'\\(?=[{}])']
+    if not is_raw:
+        parts.insert(0, r'\\N\{[^{}\r\n]*\}')
+    if not is_format_spec:
+        parts.extend((r'\{\{', r'\}\}'))
+    if len(quote) == 3:
+        parts.extend((r'[^\\{{}}{0}]'.format(char), '{0}(?!{0}{0})'.format(char)))
+    else:
+        parts.append(r'[^\\{{}}\r\n{0}]'.format(char))
+    return re.compile('(?:{0})*'.format('|'.join(parts)))
+
+
+LITERAL_REGEXES = {
+    (quote, is_raw, is_format_spec): _get_literal_regex(quote, is_raw, is_format_spec)
+    for quote in STRING_BODIES for is_raw in (False, True) for is_format_spec in (False, True)
+}
+
+
+class Scanner(object):
+    def __init__(self, source):
+        self.source = source
+        # Position tracking: row of the line at `line_start`, the offset the last token ended at
+        self.row = 1
+        self.line_start = 0
+
+    def _position(self, offset):
+        """Get the `(row, col)` of `offset`, which must be at or after the start of the current row"""
+        source = self.source
+        newlines = source.count('\n', self.line_start, offset)
+        if newlines:
+            self.row += newlines
+            self.line_start = source.rindex('\n', self.line_start, offset) + 1
+        return self.row, offset - self.line_start
+
+    def _token(self, token_type, start, end):
+        source = self.source
+        string = source[start:end]
+        if '\n' in string:
+            start_position = self._position(start)
+            line_start = self.line_start
+            end_position = self._position(end)
+        else:
+            # DEV: Most tokens are on a single line, which saves looking for line breaks in them
+            row, col = self._position(start)
+            line_start = self.line_start
+            start_position = (row, col)
+            end_position = (row, col + end - start)
+        # DEV: Like with `tokenize`, the line of a token spanning multiple lines is all of them
+        line_end = source.find('\n', end)
+        line = source[line_start:line_end + 1 if line_end >= 0 else len(source)]
+        return tokenize.TokenInfo(token_type, string, start_position, end_position, line)
+
+    def scan(self):
+        source = self.source
+        match_token = CODE_TOKEN_REGEX.match
+        # Brackets open in the current `class` or `def` statement
+        depth = 0
+        position = 0
+        end = len(source)
+        while position < end:
+            match = match_token(source, position)
+            kind = match.lastgroup
+            token_end = match.end()
+            if kind == 'space':
+                position = token_end
+                continue
+
+            if kind == 'code' or kind == 'error':
+                yield self._token(tokenize.OP, position, token_end)
+            elif kind == 'op':
+                yield self._token(tokenize.OP, position, token_end)
+                char = source[position]
+                if char == ':':
+                    if depth == 0:
+                        match_token = CODE_TOKEN_REGEX.match
+                elif char in '([{':
+                    depth += 1
+                else:
+                    depth -= 1
+            elif kind == 'comment':
+                yield self._token(tokenize.COMMENT, position, token_end)
+            elif kind == 'keyword':
+                yield self._token(tokenize.NAME, position, token_end)
+                header = HEADER_REGEX.match(source, token_end)
+                if header and header.end(1) > header.start(1):
+                    # DEV: Without brackets, the header is a single token up to the colon docstring detection expects
+                    yield self._token(tokenize.OP, header.start(1), header.end())
+                    yield self._token(tokenize.OP, header.end(), header.end() + 1)
+                    token_end = header.end() + 1
+                else:
+                    match_token = HEADER_TOKEN_REGEX.match
+                    depth = 0
+            else:
+                token_end = yield from self._scan_string(position, match.group('prefix'), match.group('quote'))
+            position = token_end
+
+    def _scan_string(self, start, prefix, quote):
+        """Yield the tokens of the string starting at `start` and get where it ends"""
+        body_start = start + len(prefix) + len(quote)
+        if _IS_PEP701 and ('f' in prefix or 'F' in prefix):
+            return (yield from self._scan_fstring(start, body_start, prefix, quote))
+
+        match = STRING_BODIES[quote].match(self.source, body_start)
+        if match is None:
+            if len(quote) == 3:
+                raise tokenize.TokenError('EOF in multi-line string', self._position(start))
+            # An unterminated string, only its quote is reported like `tokenize` does
+            yield self._token(tokenize.OP, start, body_start)
+            return body_start
+        yield self._token(tokenize.STRING, start, match.end())
+        return match.end()
+
+    def _scan_fstring(self, start, body_start, prefix, quote):
+        source = self.source
+        is_raw = 'r' in prefix or 'R' in prefix
+        yield self._token(FSTRING_START, start, body_start)
+
+        position = body_start
+        literal_regex = LITERAL_REGEXES[quote, is_raw, False]
+        while True:
+            literal_end = literal_regex.match(source, position).end()
+            if literal_end > position:
+                yield self._token(FSTRING_MIDDLE, position, literal_end)
+            position = literal_end
+            if source.startswith(quote, position):
+                yield self._token(FSTRING_END, position, position + len(quote))
+                return position + len(quote)
+            if source.startswith('{', position):
+                position = yield from self._scan_field(position + 1, quote, is_raw)
+                continue
+            if len(quote) == 3 or position >= len(source):
+                raise tokenize.TokenError('EOF in multi-line string', self._position(start))
+            # A line break or a stray closing brace in a single-quoted f-string
+            raise tokenize.TokenError('unterminated f-string literal', self._position(start))
+
+    def _scan_field(self, position, quote, is_raw):
+        """Yield the tokens of the replacement field starting at `position` and get where it ends"""
+        source = self.source
+        match_token = FIELD_TOKEN_REGEX.match
+        depth = 0
+        while position < len(source):
+            match = match_token(source, position)
+            kind = match.lastgroup
+            token_end = match.end()
+            if kind == 'space':
+                pass
+            elif kind == 'string':
+                token_end = yield from self._scan_string(position, match.group('prefix'), match.group('quote'))
+            elif kind == 'comment':
+                yield self._token(tokenize.COMMENT, position, token_end)
+            elif kind == 'open':
+                depth += 1
+            elif kind == 'close':
+                if depth == 0:
+                    return token_end
+                depth -= 1
+            elif kind == 'colon' and depth == 0:
+                return (yield from self._scan_format_spec(token_end, quote, is_raw))
+            else:
+                # DEV: Each line of code is a token, so that `QuoteChecker._iter_strings()` gets
+                #   all lines of the f-string
+                yield self._token(tokenize.OP, position, token_end)
+            position = token_end
+        raise tokenize.TokenError('EOF in multi-line statement', self._position(position))
+
+    def _scan_format_spec(self, position, quote, is_raw):
+        source = self.source
+        literal_regex = LITERAL_REGEXES[quote, is_raw, True]
+        while True:
+            literal_end = literal_regex.match(source, position).end()
+            if literal_end > position:
+                yield self._token(FSTRING_MIDDLE, position, literal_end)
+            position = literal_end
+            if source.startswith('{', position):
+                position = yield from self._scan_field(position + 1, quote, is_raw)
+            elif source.startswith('}', position):
+                return position + 1
+            else:
+                raise tokenize.TokenError('unterminated f-string format spec', self._position(position))
+
+
+def scan_tokens(source):
+    """Lazily yield the tokens of `source` the quote checks need, see the module docstring."""
+    return Scanner(source).scan()
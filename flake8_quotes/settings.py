@@ -0,0 +1,23 @@
+"""
+Resolved settings of a check, as given to `QuoteChecker(..., settings=settings)`.
+
+They are immutable and hold no per-file state, so checkers with different settings can run side by
+side in the same process, e.g. in the threads of a pool:
+
+    settings = QuoteChecker.get_settings(options)
+    errors = list(QuoteChecker(None, filename='module.py', settings=settings).run())
+
+`config` is a read-only mapping of the quote configuration, `check_string` its compiled check,
+and `cache`, `profiler` and `stats` are `None` unless enabled.
+"""
+import collections
+import types
+
+QuoteSettings = collections.namedtuple('QuoteSettings', (
+    'config', 'check_string', 'lexer', 'max_errors_per_file', 'cache', 'profiler', 'stats',
+))
+
+
+def freeze_config(config):
+    """Get a read-only copy of the `config` dict"""
+    return types.MappingProxyType(dict(config))
@@ -0,0 +1,152 @@
+"""
+Counters of what a run did (files, tokens, strings by kind, errors by code, cache use), merged across
+flake8's worker processes and written out for dashboards when the run is over.
+
+    flake8 --quotes-stats flake8-quotes.json
+    flake8 --quotes-stats flake8-quotes.txt --quotes-stats-format openmetrics
+"""
+import json
+
+from flake8_quotes.run_records import RunRecords
+
+# Set in the main process, so worker processes (forked or spawned) record into the same directory
+DIRECTORY_ENVIRONMENT_VARIABLE = 'FLAKE8_QUOTES_STATS_DIR'
+# What happened to a file: checked, skipped by the prefilter or by the result cache
+FILE_OUTCOMES = ('checked', 'prefiltered', 'cached')
+STRING_KINDS = ('inline', 'multiline', 'docstring', 'f-string')
+FORMATS = ('json', 'openmetrics')
+
+
+class FileStats(object):
+    """Counters for a single file, only filled in while `--quotes-stats` is on"""
+    def __init__(self, outcome='checked'):
+        self.outcome = outcome
+        self.tokens = 0
+        self.strings = dict.fromkeys(STRING_KINDS, 0)
+        self.errors = {}
+        self.verdict_cache_hits = 0
+        self.verdict_cache_misses = 0
+
+    def count_tokens(self, tokens):
+        count = 0
+        try:
+            for token in tokens:
+                count += 1
+                yield token
+        finally:
+            self.tokens += count
+
+    def count_strings(self, strings):
+        """Count the `(token_string, token_start, token_end, is_docstring)` of `QuoteChecker._iter_strings()`"""
+        counts = self.strings
+        for string in strings:
+            token_string = string[0]
+            if string[3]:
+                counts['docstring'] += 1
+            else:
+                # DEV: Like in the checks, the last character is always the quote
+                quote_index = token_string.index(token_string[-1])
+                if 'f' in token_string[:quote_index].lower():
+                    counts['f-string'] += 1
+                elif token_string.startswith(token_string[-1] * 3, quote_index):
+                    counts['multiline'] += 1
+                else:
+                    counts['inline'] += 1
+            yield string
+
+    def count_errors(self, errors):
+        counts = self.errors
+        for error in errors:
+            counts[error.code] = counts.get(error.code, 0) + 1
+            yield error
+
+    def to_json(self):
+        return {
+            'outcome': self.outcome,
+            'tokens': self.tokens,
+            'strings': self.strings,
+            'errors': self.errors,
+            'verdict_cache_hits': self.verdict_cache_hits,
+            'verdict_cache_misses': self.verdict_cache_misses,
+        }
+
+
+def merge(records):
+    """Add up `FileStats.to_json()` records into the totals of a run"""
+    totals = {
+        'files': dict.fromkeys(FILE_OUTCOMES, 0),
+        'tokens': 0,
+        'strings': dict.fromkeys(STRING_KINDS, 0),
+        'errors': {},
+        'verdict_cache': {'hits': 0, 'misses': 0},
+    }
+    for record in records:
+        totals['files'][record['outcome']] += 1
+        totals['tokens'] += record['tokens']
+        for kind, count in record['strings'].items():
+            totals['strings'][kind] += count
+        for code, count in record['errors'].items():
+            totals['errors'][code] = totals['errors'].get(code, 0) + count
+        totals['verdict_cache']['hits'] += record['verdict_cache_hits']
+        totals['verdict_cache']['misses'] += record['verdict_cache_misses']
+    totals['errors'] = dict(sorted(totals['errors'].items()))
+    return totals
+
+
+def to_openmetrics(totals):
+    """Get `totals` as an OpenMetrics text exposition"""
+    lines = []
+
+    def add_counter(name, help_text, samples):
+        lines.append('# TYPE flake8_quotes_{0} counter'.format(name))
+        lines.append('# HELP flake8_quotes_{0} {1}.'.format(name, help_text))
+        for labels, value in samples:
+            label_text = ','.join('{0}="{1}"'.format(key, label_value) for key, label_value in labels)
+            lines.append('flake8_quotes_{0}_total{1} {2}'.format(name, '{' + label_text + '}' if labels else '', value))
+
+    add_counter('files', 'Files seen, by what happened to them',
+                [((('outcome', outcome),), count) for outcome, count in totals['files'].items()])
+    add_counter('tokens', 'Tokens consumed', [((), totals['tokens'])])
+    add_counter('strings', 'String literals checked, by kind',
+                [((('kind', kind),), count) for kind, count in totals['strings'].items()])
+    add_counter('errors', 'Errors reported, by code',
+                [((('code', code),), count) for code, count in totals['errors'].items()])
+    add_counter('verdict_cache_lookups', 'Lookups in the string verdict cache, by result',
+                [((('result', 'hit'),), totals['verdict_cache']['hits']),
+                 ((('result', 'miss'),), totals['verdict_cache']['misses'])])
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+class RunStats(RunRecords):
+    """
+    Collects a `FileStats` per file, across all of flake8's worker processes.
+
+    The main process merges them into `path` when it exits.
+    """
+    DIRECTORY_ENVIRONMENT_VARIABLE = DIRECTORY_ENVIRONMENT_VARIABLE
+    DIRECTORY_PREFIX = 'flake8-quotes-stats-'
+
+    def __init__(self, directory, path=None, output_format='json'):
+        super(RunStats, self).__init__(directory)
+        self.path = path
+        self.output_format = output_format
+
+    def get_totals(self):
+        return merge(self.get_records())
+
+    def write(self, stream):
+        totals = self.get_totals()
+        if self.output_format == 'openmetrics':
+            stream.write(to_openmetrics(totals))
+        else:
+            json.dump(totals, stream, indent=2)
+            stream.write('\n')
+
+    def finish(self):
+        try:
+            if self.path is not None:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    self.write(f)
+        finally:
+            self.close()
@@ -0,0 +1,125 @@
+"""
+The quote checks for a single string, specialized for the resolved quote configuration.
+
+`QuoteChecker.parse_options()` compiles the configuration once, so checking a string comes
+down to a few comparisons against constants rather than looking everything up in the config.
+"""
+import argparse
+from functools import lru_cache
+
+# Configuration keys the checks depend on, in the order `_compile()` takes them after the cache size
+CONFIG_KEYS = (
+    'good_single',
+    'bad_single',
+    'good_multiline',
+    'good_multiline_ending',
+    'good_docstring',
+    'avoid_escape',
+    'single_error_message',
+    'multiline_error_message',
+    'docstring_error_message',
+)
+
+Q003_MESSAGE = 'Q003 Change outer quotes to avoid escaping inner quotes'
+
+# Number of `(token_string, is_docstring)` verdicts to remember, see `compile_string_check()`
+DEFAULT_VERDICT_CACHE_SIZE = 4096
+# Longer strings (docstrings, data blobs...) are rarely repeated and aren't kept alive by the cache
+MAX_CACHED_STRING_LENGTH = 256
+
+
+def compile_string_check(config, cache_size=DEFAULT_VERDICT_CACHE_SIZE):
+    """
+    Get a `check(token_string, is_docstring)` function for `config`.
+
+    It returns the error message for the string, or `None` when its quotes are fine. Unless `cache_size`
+    is 0, the verdicts for the most recently seen short strings are kept, as the same literals (`''`, `'utf-8'`,
+    dict keys...) come up over and over again. The cache is shared by all checks compiled for the same
+    configuration in the process, see `get_verdict_cache_stats()`.
+    """
+    return _compile(cache_size, *(config[key] for key in CONFIG_KEYS))
+
+
+def parse_cache_size(value):
+    """Parse `--quotes-verdict-cache-size`, a number of verdicts which can't be negative"""
+    try:
+        cache_size = int(value)
+    except ValueError:
+        cache_size = -1
+    if cache_size < 0:
+        raise argparse.ArgumentTypeError('expected a number of verdicts >= 0, got {0!r}'.format(value))
+    return cache_size
+
+
+def get_verdict_cache_stats(check):
+    """Get `{'hits', 'misses', 'size', 'max_size'}` for the verdict cache of `check`, or `None` without one"""
+    if not hasattr(check, 'cache_info'):
+        return None
+    info = check.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize}
+
+
+@lru_cache(16)
+def _compile(cache_size, good_single, bad_single, good_multiline, good_multiline_ending, good_docstring, avoid_escape,
+             single_error_message, multiline_error_message, docstring_error_message):
+    q000_message = 'Q000 ' + single_error_message
+    q001_message = 'Q001 ' + multiline_error_message
+    q002_message = 'Q002 ' + docstring_error_message
+
+    # DEV: Prefixes (e.g. `rb` in `rb"foo"`) never contain quotes, so looking for quotes in or at
+    #   the end of the whole token gives the same result as doing so in the unprefixed string
+    def check(token_string, is_docstring):
+        # DEV: Docstring quotes must come before multiline quotes as it can as a multiline quote
+        if is_docstring:
+            return None if good_docstring in token_string else q002_message
+
+        # DEV: `last_quote_char` is 1 character, even for multiline strings
+        #   `b"foo"`  -> `"`, at index 1
+        #   `b"""foo"""` -> `"`, at index 1 and followed by 2 more
+        last_quote_char = token_string[-1]
+        first_quote_index = token_string.index(last_quote_char)
+        if token_string.startswith(last_quote_char * 3, first_quote_index):
+            # If our string is or containing a known good string, then ignore it
+            #   (""")foo""" -> good
+            #   '''foo(""")''' -> good
+            # If our string ends with a known good ending, then ignore it
+            #   '''foo("''') -> good
+            if good_multiline in token_string or token_string.endswith(good_multiline_ending):
+                return None
+            return q001_message
+
+        #   'This is a string'       -> Good
+        #   'This is a "string"'     -> Good
+        #   'This is a \"string\"'   -> Good
+        #   'This is a \'string\''   -> Bad (Q003)  Escaped inner quotes
+        #   '"This" is a \'string\'' -> Good        Changing outer quotes would not avoid escaping
+        #   "This is a string"       -> Bad (Q000)
+        #   "This is a 'string'"     -> Good        Avoids escaped inner quotes
+        #   "This is a \"string\""   -> Bad (Q000)
+        #   "\"This\" is a 'string'" -> Good
+        string_contents = token_string[first_quote_index + 1:-1]
+        if last_quote_char == good_single:
+            if avoid_escape and good_single in string_contents and bad_single not in string_contents:
+                # Backslashes in raw strings are part of the string, they can't be dropped
+                prefix = token_string[:first_quote_index]
+                if 'r' not in prefix and 'R' not in prefix:
+                    return Q003_MESSAGE
+            return None
+
+        # If not preferred type, only allow use to avoid escapes
+        return None if good_single in string_contents else q000_message
+
+    if not cache_size:
+        return check
+
+    # DEV: `lru_cache` is implemented in C and thread-safe, a hit costs less than the checks themselves
+    cached_check = lru_cache(cache_size)(check)
+
+    def check_short_strings(token_string, is_docstring):
+        if len(token_string) > MAX_CACHED_STRING_LENGTH:
+            return check(token_string, is_docstring)
+        return cached_check(token_string, is_docstring)
+
+    check_short_strings.cache_info = cached_check.cache_info
+    check_short_strings.cache_clear = cached_check.cache_clear
+    return check_short_strings
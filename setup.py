@@ -41,6 +41,10 @@ setup(
         'flake8.extension': [
             'Q0 = flake8_quotes:QuoteChecker',
         ],
+        'console_scripts': [
+            'flake8-quotes = flake8_quotes.cli:main',
+            'flake8-quotes-daemon = flake8_quotes.daemon:main',
+        ],
     },
     license='MIT',
     zip_safe=True,
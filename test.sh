@@ -4,5 +4,5 @@ set -e
 set -x
 
 # Run our linter and tests
-flake8 *.py flake8_quotes/ test/*.py
+flake8 *.py flake8_quotes/ test/*.py benchmarks/
 python setup.py test $*
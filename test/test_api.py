@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.api import POOL_MIN_SOURCES, check_sources, get_options
+from test.test_checks import get_absolute_path
+
+
+class CheckSourcesTests(TestCase):
+    def test_check_sources(self):
+        sources = [('a.py', 'x = "foo"\n'), ('b.py', "x = 'foo'\n"), ('empty.py', ''), ('c.py', 'y = 1\nz = "bar"\n')]
+        self.assertEqual(list(check_sources(sources)), [
+            ('a.py', 1, 4, 'Q000 Double quotes found but single quotes preferred'),
+            ('c.py', 2, 4, 'Q000 Double quotes found but single quotes preferred'),
+        ])
+
+    def test_config(self):
+        sources = [('a.py', 'x = "foo"\n'), ('b.py', "x = 'foo'  # noqa\ny = 'bar'\n")]
+        self.assertEqual(list(check_sources(sources, {'inline-quotes': 'double'})), [
+            ('b.py', 2, 4, 'Q000 Single quotes found but double quotes preferred'),
+        ])
+        self.assertEqual(list(check_sources(sources, {'inline_quotes': '"', 'avoid_escape': False})), [
+            ('b.py', 2, 4, 'Q000 Single quotes found but double quotes preferred'),
+        ])
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            get_options({'inline-quotes': 'backtick'})
+        with self.assertRaises(ValueError):
+            get_options({'jobs': 4})
+        with self.assertRaises(ValueError):
+            list(check_sources([], {'unknown': True}))
+        for config in ({'quotes-max-errors-per-file': 'x'}, {'quotes-verdict-cache-size': -1},
+                       {'avoid-escape': 'no'}, {'inline-quotes': None}):
+            with self.subTest(config=config), self.assertRaises(ValueError):
+                get_options(config)
+
+    def test_convert_config(self):
+        options = get_options({'quotes-max-errors-per-file': '3', 'quotes_cache_max_entries': 50})
+        self.assertEqual((options.quotes_max_errors_per_file, options.quotes_cache_max_entries), (3, 50))
+        # `None` stands for the default where it is the default
+        options = get_options({'multiline-quotes': None, 'docstring-quotes': None, 'avoid-escape': None})
+        self.assertEqual((options.multiline_quotes, options.docstring_quotes, options.avoid_escape), (None, None, None))
+
+    def test_syntax_error(self):
+        # The details of the error depend on the Python version
+        name, line, col, message = list(check_sources([('a.py', 'x = "foo"\ny = """bar\n')]))[-1]
+        self.assertEqual((name, line, col), ('a.py', 1, 0))
+        self.assertTrue(message.startswith('E902 TokenError: '), message)
+
+    def test_line_breaks(self):
+        # Form feeds and U+2028 are line breaks for `str.splitlines()`, but not for the tokenizer
+        sources = [('a.py', 'x = "a"\n\x0c\ny = "b"\nz = """a\u2028b"""\nw = "c"\n')]
+        self.assertEqual([error[1:3] for error in check_sources(sources)], [(1, 4), (3, 4), (5, 4)])
+
+    def test_name_is_not_read(self):
+        # Sources are checked as given, even when a file with their name exists
+        filename = get_absolute_path('data/doubles.py')
+        self.assertEqual(list(check_sources([(filename, "x = 'foo'\n")])), [])
+
+    def test_pool(self):
+        sources = [('file_{0}.py'.format(i), 'x = "foo"\n' * (i % 3)) for i in range(POOL_MIN_SOURCES * 2)]
+        expected = list(check_sources(sources, jobs=1))
+        self.assertEqual(len(expected), sum(i % 3 for i in range(POOL_MIN_SOURCES * 2)))
+        self.assertEqual(list(check_sources(iter(sources), jobs=2)), expected)
+        self.assertEqual(list(check_sources(iter(sources), jobs=2, threads=True)), expected)
+
+    def test_options_are_left_alone(self):
+        config = QuoteChecker.config
+        self.assertEqual(len(list(check_sources([('a.py', "x = 'foo'\n")], {'inline-quotes': 'double'}))), 1)
+        self.assertIs(QuoteChecker.config, config)
+
+    def tearDown(self):
+        QuoteChecker.parse_options(get_options())
@@ -0,0 +1,23 @@
+import os
+from unittest import TestCase, skipIf
+
+from benchmarks.bench_throughput import get_python_version, get_regressions, load_baseline, measure
+
+# Timings depend on the machine and on what else it runs, so they are only compared on request:
+#   FLAKE8_QUOTES_BENCHMARKS=1 python -m pytest test/test_benchmarks.py
+RUN_BENCHMARKS = os.environ.get('FLAKE8_QUOTES_BENCHMARKS') == '1'
+
+
+class BenchmarkRegressionTests(TestCase):
+    @skipIf(not RUN_BENCHMARKS, 'Set FLAKE8_QUOTES_BENCHMARKS=1 to compare with the benchmark baseline')
+    @skipIf(load_baseline() is None, 'No benchmark baseline for this Python version')
+    def test_no_regressions(self):
+        results = measure(repeat=3)
+        self.assertEqual(get_regressions(results, load_baseline()), [],
+                         'Update benchmarks/baseline.json with `python -m benchmarks.bench_throughput '
+                         '--save-baseline` if this is intended (Python {0})'.format(get_python_version()))
+
+    def test_get_regressions(self):
+        baseline = {'run': {'relative_time': 1.0, 'peak_memory': 1000}}
+        results = {'run': {'relative_time': 1.2, 'peak_memory': 2000}}
+        self.assertEqual(get_regressions(results, baseline), ['run peak_memory regressed: 2000.000 > 1000 * 1.25'])
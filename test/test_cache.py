@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from flake8_quotes import QuoteChecker, generate_tokens
+from flake8_quotes.cache import ResultCache
+from test.test_checks import get_absolute_path
+
+
+def _write_and_read(args):
+    directory, index = args
+    cache = ResultCache(directory, max_entries=5)
+    key = ResultCache.get_key(str(index % 3).encode('utf-8'), {})
+    cache.set(key, [[index % 3, 0, 'Q000']])
+    return cache.get(key)
+
+
+class ResultCacheTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_get_set(self):
+        cache = ResultCache(self.directory.name)
+        key = ResultCache.get_key(b'x = "a"\n', {'good_single': "'"})
+        self.assertIsNone(cache.get(key))
+        cache.set(key, [(1, 4, 'Q000 Double quotes found but single quotes preferred')])
+        self.assertEqual(cache.get(key), [(1, 4, 'Q000 Double quotes found but single quotes preferred')])
+
+    def test_get_key(self):
+        key = ResultCache.get_key(b'x = "a"\n', {'good_single': "'"})
+        self.assertEqual(key, ResultCache.get_key(b'x = "a"\n', {'good_single': "'"}))
+        self.assertNotEqual(key, ResultCache.get_key(b'x = "b"\n', {'good_single': "'"}))
+        self.assertNotEqual(key, ResultCache.get_key(b'x = "a"\n', {'good_single': '"'}))
+
+    def test_corrupted_entry(self):
+        cache = ResultCache(self.directory.name)
+        key = ResultCache.get_key(b'', {})
+        with open(os.path.join(self.directory.name, key + ResultCache.SUFFIX), 'w') as f:
+            f.write('[[1, ')
+        self.assertIsNone(cache.get(key))
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(self.directory.name, max_entries=2)
+        keys = [ResultCache.get_key(str(i).encode('utf-8'), {}) for i in range(3)]
+        for mtime, key in enumerate(keys[:2]):
+            cache.set(key, [])
+            os.utime(os.path.join(self.directory.name, key + ResultCache.SUFFIX), (mtime, mtime))
+        # Using the oldest entry makes the other one the least recently used
+        self.assertEqual(cache.get(keys[0]), [])
+        cache.set(keys[2], [])
+        cache.evict()
+
+        self.assertEqual(cache.get(keys[0]), [])
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[2]), [])
+
+    def test_concurrent_access(self):
+        with multiprocessing.Pool(4) as pool:
+            results = pool.map(_write_and_read, [(self.directory.name, i) for i in range(40)])
+        for index, errors in enumerate(results):
+            self.assertEqual(errors, [(index % 3, 0, 'Q000')])
+        self.assertFalse([name for name in os.listdir(self.directory.name) if name.endswith('.tmp')])
+
+
+class CachedQuoteCheckerTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        class Options():
+            inline_quotes = "'"
+            quotes_cache_dir = directory.name
+        QuoteChecker.parse_options(Options)
+        self.addCleanup(setattr, QuoteChecker, 'cache', None)
+
+    def test_run_uses_cache(self):
+        expected = [
+            (1, 24, 'Q000 Double quotes found but single quotes preferred', QuoteChecker),
+            (2, 24, 'Q000 Double quotes found but single quotes preferred', QuoteChecker),
+            (3, 24, 'Q000 Double quotes found but single quotes preferred', QuoteChecker),
+        ]
+        checker = QuoteChecker(None, filename=get_absolute_path('data/doubles.py'))
+        self.assertEqual(list(checker.run()), expected)
+
+        checker = QuoteChecker(None, filename=get_absolute_path('data/doubles.py'))
+        with mock.patch('flake8_quotes.generate_tokens', wraps=generate_tokens) as tokenizer:
+            self.assertEqual(list(checker.run()), expected)
+        self.assertEqual(tokenizer.call_count, 0)
+
+    def test_run_with_different_config(self):
+        checker = QuoteChecker(None, filename=get_absolute_path('data/doubles.py'))
+        self.assertEqual(len(list(checker.run())), 3)
+
+        class Options():
+            inline_quotes = '"'
+            quotes_cache_dir = QuoteChecker.cache.directory
+        QuoteChecker.parse_options(Options)
+        checker = QuoteChecker(None, filename=get_absolute_path('data/doubles.py'))
+        self.assertEqual(list(checker.run()), [])
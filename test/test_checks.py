@@ -1,7 +1,10 @@
-from flake8_quotes import QuoteChecker
+import flake8_quotes
+from flake8_quotes import QuoteChecker, QuoteError, generate_tokens
+from flake8_quotes.fixer import fix_string
 import os
 import subprocess
-from unittest import TestCase
+import tokenize
+from unittest import TestCase, mock
 
 
 class TestChecks(TestCase):
@@ -9,6 +12,132 @@ class TestChecks(TestCase):
         checker = QuoteChecker(None, filename=get_absolute_path('data/no_qa.py'))
         self.assertEqual(checker.get_noqa_lines(checker.get_file_contents()), [2])
 
+    def test_run_tokenizes_once(self):
+        class Options():
+            inline_quotes = "'"
+        QuoteChecker.parse_options(Options)
+
+        checker = QuoteChecker(None, filename=get_absolute_path('data/doubles_noqa.py'))
+        with mock.patch('flake8_quotes.generate_tokens', wraps=generate_tokens) as tokenizer:
+            self.assertEqual(list(checker.run()), [])
+        self.assertEqual(tokenizer.call_count, 1)
+
+    def test_run_with_file_tokens(self):
+        class Options():
+            inline_quotes = "'"
+        QuoteChecker.parse_options(Options)
+
+        with open(get_absolute_path('data/doubles.py')) as f:
+            file_tokens = list(tokenize.generate_tokens(f.readline))
+
+        # The file must not be read or tokenized again when flake8 provides the tokens
+        checker = QuoteChecker(None, filename=get_absolute_path('data/missing.py'), file_tokens=file_tokens)
+        with mock.patch('flake8_quotes.generate_tokens') as tokenizer:
+            self.assertEqual(list(checker.run()), [
+                (1, 24, 'Q000 Double quotes found but single quotes preferred', QuoteChecker),
+                (2, 24, 'Q000 Double quotes found but single quotes preferred', QuoteChecker),
+                (3, 24, 'Q000 Double quotes found but single quotes preferred', QuoteChecker),
+            ])
+        self.assertEqual(tokenizer.call_count, 0)
+
+    def test_generate_tokens(self):
+        with open(get_absolute_path('data/docstring_singles.py')) as f:
+            file_contents = f.readlines()
+        file_contents.append('x = f"{y!r:>{z}}"  # noqa\n')
+        self.assertEqual(list(generate_tokens(file_contents)),
+                         list(tokenize.generate_tokens(lambda L=iter(file_contents): next(L))))
+
+        # Errors are the same as with `tokenize` too
+        with self.assertRaises(tokenize.TokenError) as context:
+            list(generate_tokens(['x = """foo\n']))
+        self.assertEqual(context.exception.args[0], 'EOF in multi-line string')
+        with self.assertRaises(IndentationError):
+            list(generate_tokens(['if x:\n', '        y\n', '    z\n']))
+
+    def test_generate_tokens_fallback(self):
+        # The private C tokenizer changing its signature falls back to `tokenize` for good
+        self.addCleanup(flake8_quotes._can_use_c_tokenizer.cache_clear)
+        flake8_quotes._can_use_c_tokenizer.cache_clear()
+        file_contents = ['x = "foo"\n', "y = f'{x}'\n"]
+        with mock.patch('flake8_quotes.TokenizerIter', side_effect=TypeError('unexpected keyword argument')):
+            self.assertEqual(list(generate_tokens(file_contents)),
+                             list(tokenize.generate_tokens(lambda L=iter(file_contents): next(L))))
+            self.assertFalse(flake8_quotes._can_use_c_tokenizer())
+
+    def test_max_errors_per_file(self):
+        class Options():
+            inline_quotes = "'"
+            quotes_max_errors_per_file = 2
+        QuoteChecker.parse_options(Options)
+        self.addCleanup(QuoteChecker.parse_options, type('Options', (), {'inline_quotes': "'"}))
+
+        lines = ['x = "foo"\n', 'y = "bar"  # noqa\n', 'z = "baz"\n', 'w = "qux"\n', 'v = 1\n']
+        tokens = tokenize.generate_tokens(lambda L=iter(lines): next(L))
+        checker = QuoteChecker(None, filename='test.py', file_tokens=tokens)
+        self.assertEqual([(error.row, error.col) for error in checker.get_records()], [(1, 4), (3, 4)])
+        # The rest of the file isn't tokenized once the limit is reached
+        self.assertIn('v', [token.string for token in tokens])
+        self.assertEqual(len(list(QuoteChecker(None, lines=lines).get_quotes_errors(lines))), 2)
+
+    def test_get_records(self):
+        class Options():
+            inline_quotes = "'"
+        QuoteChecker.parse_options(Options)
+
+        checker = QuoteChecker(None, lines=['x = "foo"  # noqa: Q003\n', 'y = b"\\"\\n"\n', 'z = "bar"  # noqa\n'])
+        self.assertEqual(list(checker.get_records()), [
+            QuoteError('Q000', 'Q000 Double quotes found but single quotes preferred', 1, 4, None),
+            QuoteError('Q000', 'Q000 Double quotes found but single quotes preferred', 2, 4, None),
+        ])
+        self.assertEqual(list(checker.get_records(fix_string)), [
+            QuoteError('Q000', 'Q000 Double quotes found but single quotes preferred', 1, 4, "'foo'"),
+            QuoteError('Q000', 'Q000 Double quotes found but single quotes preferred', 2, 4, "b'\"\\n'"),
+        ])
+
+    def test_iter_strings_fstring_source(self):
+        class Options():
+            inline_quotes = "'"
+        QuoteChecker.parse_options(Options)
+
+        # Top-level f-strings are checked as they are written, like before PEP 701 split them into tokens
+        lines = [
+            'x = f"{ y }" + f\'{ "a" }\'\n',
+            'z = f"""{\n',
+            '  y +\\\n',
+            ' f"{z}" }"""\n',
+        ]
+        checker = QuoteChecker(None, lines=lines)
+        strings = [string[:3] for string in checker._iter_strings(
+            (token, False) for token in checker.get_tokens(lines))]
+        self.assertEqual(strings, [
+            ('f"{ y }"', (1, 4), (1, 12)),
+            ('f\'{ "a" }\'', (1, 15), (1, 25)),
+            ('f"""{\n  y +\\\n f"{z}" }"""', (2, 4), (4, 12)),
+        ])
+
+        # Only the line breaks of the tokenizer start a new row, not form feeds or U+2028
+        lines = ['x = f"""a\u2028b\n', '{y} \x0c c\n', '"""\n']
+        strings = [string[:3] for string in checker._iter_strings(
+            (token, False) for token in checker.get_tokens(lines))]
+        self.assertEqual(strings, [('f"""a\u2028b\n{y} \x0c c\n"""', (1, 4), (3, 3))])
+
+    def test_get_quotes_errors_streams_tokens(self):
+        class Options():
+            inline_quotes = "'"
+        QuoteChecker.parse_options(Options)
+
+        def lines_then_fail():
+            yield 'this_should_be_linted = "double quote string"\n'
+            yield 'this_should_be_linted = "double quote string"\n'
+            raise AssertionError('Token stream consumed past the first error')
+
+        # The first error is produced before the rest of the file is tokenized
+        checker = QuoteChecker(None)
+        errors = checker.get_quotes_errors(lines_then_fail())
+        self.assertEqual(next(errors), {
+            'col': 24, 'line': 1, 'message': 'Q000 Double quotes found but single quotes preferred',
+        })
+
 
 class TestFlake8Stdin(TestCase):
     def test_stdin(self):
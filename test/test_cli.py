@@ -0,0 +1,179 @@
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.api import get_options
+from flake8_quotes.cli import iter_python_files, main, make_chunks, parse_jobs, read_config_defaults, get_parser
+from test.test_checks import get_absolute_path
+
+
+class CliTests(TestCase):
+    def _main(self, *argv):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            exit_code = main(list(argv))
+        return exit_code, stdout.getvalue().splitlines()
+
+    def test_doubles(self):
+        filename = get_absolute_path('data/doubles.py')
+        self.assertEqual(self._main('-j1', filename), (1, [
+            filename + ':1:25: Q000 Double quotes found but single quotes preferred',
+            filename + ':2:25: Q000 Double quotes found but single quotes preferred',
+            filename + ':3:25: Q000 Double quotes found but single quotes preferred',
+        ]))
+
+    def test_options(self):
+        filename = get_absolute_path('data/doubles.py')
+        self.assertEqual(self._main('-j1', '--inline-quotes', 'double', filename), (0, []))
+
+    def test_fix(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'doubles.py')
+            with open(filename, 'w') as f:
+                f.write('x = "foo"\ny = \'it\\\'s\'  # noqa\n')
+            self.assertEqual(self._main('-j1', '--fix', filename), (0, []))
+            with open(filename) as f:
+                self.assertEqual(f.read(), "x = 'foo'\ny = 'it\\'s'  # noqa\n")
+
+    def test_json_lines(self):
+        filename = get_absolute_path('data/doubles.py')
+        exit_code, lines = self._main('-j1', '--format', 'json-lines', filename)
+        self.assertEqual(exit_code, 1)
+        self.assertEqual([json.loads(line) for line in lines][:2], [
+            {'filename': filename, 'code': 'Q000', 'message': 'Q000 Double quotes found but single quotes preferred',
+             'line': 1, 'column': 25, 'replacement': "'double quote string'"},
+            {'filename': filename, 'code': 'Q000', 'message': 'Q000 Double quotes found but single quotes preferred',
+             'line': 2, 'column': 25, 'replacement': "u'double quote string'"},
+        ])
+
+    def test_sarif(self):
+        filename = get_absolute_path('data/doubles.py')
+        exit_code, lines = self._main('-j1', '--format', 'sarif', filename)
+        self.assertEqual(exit_code, 1)
+        sarif = json.loads('\n'.join(lines))
+        self.assertEqual(sarif['version'], '2.1.0')
+        results = sarif['runs'][0]['results']
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], {
+            'ruleId': 'Q000',
+            'level': 'warning',
+            'message': {'text': 'Double quotes found but single quotes preferred'},
+            'locations': [{'physicalLocation': {
+                'artifactLocation': {'uri': filename.replace(os.sep, '/')},
+                'region': {'startLine': 1, 'startColumn': 25},
+            }}],
+            'properties': {'replacement': "'double quote string'"},
+        })
+
+        # Still a valid log without any result
+        exit_code, lines = self._main('-j1', '--format', 'sarif', get_absolute_path('data/singles.py'))
+        self.assertEqual((exit_code, json.loads('\n'.join(lines))['runs'][0]['results']), (0, []))
+
+    def test_jobs(self):
+        directory = get_absolute_path('data')
+        exit_code, lines = self._main('-j1', directory)
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(self._main('-j3', directory), (exit_code, lines))
+        self.assertEqual(self._main('-j3', '--threads', directory), (exit_code, lines))
+
+    def test_max_errors_per_file(self):
+        filename = get_absolute_path('data/doubles.py')
+        self.assertEqual(self._main('-j1', '--quotes-max-errors-per-file', '2', filename), (1, [
+            filename + ':1:25: Q000 Double quotes found but single quotes preferred',
+            filename + ':2:25: Q000 Double quotes found but single quotes preferred',
+        ]))
+        # Values are converted when parsed, those from the configuration included
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'setup.cfg'), 'w') as f:
+                f.write('[flake8]\nquotes-max-errors-per-file = 2\n')
+            parser = get_parser()
+            parser.parser.set_defaults(**read_config_defaults(parser, directory))
+            self.assertEqual(parser.parser.parse_args([]).quotes_max_errors_per_file, 2)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            self._main('--quotes-max-errors-per-file', 'x', filename)
+
+    def test_cache(self):
+        directory = get_absolute_path('data')
+        exit_code, lines = self._main('-j1', directory)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.assertEqual(self._main('-j1', '--quotes-cache-dir', cache_dir, directory), (exit_code, lines))
+            self.assertEqual(len(os.listdir(cache_dir)), len(os.listdir(directory)))
+            # Results now come from the cache
+            self.assertEqual(self._main('-j2', '--quotes-cache-dir', cache_dir, directory), (exit_code, lines))
+        options = get_parser().parser.parse_args(['--quotes-cache-max-entries', '5'])
+        self.assertEqual(options.quotes_cache_max_entries, 5)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            self._main('--quotes-cache-max-entries', 'x', directory)
+
+    def test_fail_fast(self):
+        directory = get_absolute_path('data')
+        for jobs in (['-j1'], ['-j3'], ['-j3', '--threads']):
+            with self.subTest(jobs=jobs):
+                exit_code, lines = self._main(*jobs, '--fail-fast', directory)
+                self.assertEqual(exit_code, 1)
+                self.assertEqual(len(lines), 1)
+        self.assertEqual(self._main('-j3', '--fail-fast', get_absolute_path('data/singles.py')), (0, []))
+
+    def test_module(self):
+        p = subprocess.Popen([sys.executable, '-m', 'flake8_quotes', get_absolute_path('data/singles.py')],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = p.communicate()
+        self.assertEqual(stderr, b'')
+        self.assertEqual(p.returncode, 0)
+        self.assertEqual(stdout, b'')
+
+    def test_iter_python_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for path in ('a.py', 'b.txt', os.path.join('.git', 'c.py'), os.path.join('pkg', 'd.py')):
+                os.makedirs(os.path.dirname(os.path.join(directory, path)), exist_ok=True)
+                open(os.path.join(directory, path), 'w').close()
+            self.assertEqual(list(iter_python_files([directory], '.git')), [
+                os.path.join(directory, 'a.py'),
+                os.path.join(directory, 'pkg', 'd.py'),
+            ])
+
+    def test_make_chunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = []
+            for name, size in (('small_1.py', 10), ('big.py', 1000), ('small_2.py', 10), ('medium.py', 500)):
+                filenames.append(os.path.join(directory, name))
+                with open(filenames[-1], 'w') as f:
+                    f.write('#' * size)
+            chunks = make_chunks(filenames, jobs=1)
+        self.assertEqual([[os.path.basename(filename) for filename in chunk] for chunk in chunks], [
+            ['big.py'], ['medium.py'], ['small_1.py', 'small_2.py'],
+        ])
+
+    def test_read_config_defaults(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'setup.cfg'), 'w') as f:
+                f.write('[flake8]\ninline-quotes = double\navoid_escape = false\nno-avoid-escape = true\njobs = 2\n')
+            parser = get_parser()
+            self.assertEqual(read_config_defaults(parser, directory), {
+                'inline_quotes': 'double',
+                'avoid_escape': False,
+                'jobs': '2',
+            })
+
+    def test_jobs_auto(self):
+        self.assertEqual(parse_jobs('auto'), multiprocessing.cpu_count())
+        self.assertEqual(parse_jobs('3'), 3)
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'setup.cfg'), 'w') as f:
+                f.write('[flake8]\njobs = auto\n')
+            parser = get_parser()
+            parser.parser.set_defaults(**read_config_defaults(parser, directory))
+            self.assertEqual(parser.parser.parse_args([]).jobs, multiprocessing.cpu_count())
+            self.assertEqual(parser.parser.parse_args(['-j', '2']).jobs, 2)
+        filename = get_absolute_path('data/doubles.py')
+        self.assertEqual(self._main('--jobs', 'auto', filename), self._main('-j1', filename))
+
+    def tearDown(self):
+        QuoteChecker.parse_options(get_options())
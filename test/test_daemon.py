@@ -0,0 +1,113 @@
+import asyncio
+import os
+import socket
+import stat
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.api import get_options
+from flake8_quotes.daemon import Daemon, DaemonError, check_paths, get_parser, is_running, send
+from test.test_checks import get_absolute_path
+
+
+class DaemonTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, 'daemon.sock')
+        options = get_parser().parse_args(['serve', self.socket_path, '--inline-quotes', 'double'])
+        self.daemon = Daemon(self.socket_path, options)
+        self.thread = threading.Thread(target=asyncio.run, args=(self.daemon.serve(),))
+        self.thread.start()
+        for _ in range(500):
+            if is_running(self.socket_path):
+                break
+            time.sleep(0.01)
+
+    def test_check_paths(self):
+        filename = get_absolute_path('data/singles.py')
+        self.assertEqual(check_paths(self.socket_path, [filename]), [
+            (filename, 1, 24, 'Q000 Single quotes found but double quotes preferred'),
+            (filename, 2, 24, 'Q000 Single quotes found but double quotes preferred'),
+            (filename, 3, 24, 'Q000 Single quotes found but double quotes preferred'),
+        ])
+
+    def test_socket_mode(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode), 0o600)
+
+    def test_relative_paths(self):
+        cwd = get_absolute_path('data')
+        results = send(self.socket_path, {'cwd': cwd, 'paths': ['singles.py', 'doubles.py']})
+        self.assertEqual([result[:2] for result in results], [('singles.py', 1), ('singles.py', 2), ('singles.py', 3)])
+
+    def test_check_source(self):
+        self.assertEqual(send(self.socket_path, {'source': "x = 'foo'\n", 'filename': 'stdin'}), [
+            ('stdin', 1, 4, 'Q000 Single quotes found but double quotes preferred'),
+        ])
+
+    def test_bad_requests(self):
+        with self.assertRaises(DaemonError):
+            send(self.socket_path, {'path': 'typo.py'})
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(self.socket_path)
+            sock.sendall(b'not json\n{"source": "x = 1\\n"}\n')
+            with sock.makefile('rb') as f:
+                self.assertIn(b'"error"', f.readline())
+                # The connection is still usable
+                self.assertEqual(f.readline(), b'{"results": []}\n')
+
+    def test_unexpected_error(self):
+        def check(request):
+            raise KeyError('boom')
+        self.daemon.check = check
+        with self.assertRaises(DaemonError) as context:
+            send(self.socket_path, {'paths': ['.']})
+        self.assertIn('boom', str(context.exception))
+
+    def test_no_response(self):
+        socket_path = os.path.join(self.directory.name, 'closing.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen(1)
+
+            def read_and_close():
+                connection = server.accept()[0]
+                with connection:
+                    connection.recv(1024)
+
+            thread = threading.Thread(target=read_and_close)
+            thread.start()
+            with self.assertRaises(DaemonError):
+                send(socket_path, {'paths': ['.']})
+            thread.join()
+
+    def test_concurrent_clients(self):
+        # An idle connection doesn't hold up the others
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+            idle.connect(self.socket_path)
+            results = []
+            threads = [threading.Thread(target=lambda i=i: results.append(
+                send(self.socket_path, {'source': "x = 'foo'\n" * i, 'filename': str(i)}))) for i in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(sorted(len(result) for result in results), list(range(20)))
+
+    def test_shutdown_with_open_connection(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+            idle.connect(self.socket_path)
+            send(self.socket_path, {'shutdown': True})
+            self.thread.join(10)
+            self.assertFalse(self.thread.is_alive())
+            self.assertEqual(idle.recv(1), b'')
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            send(self.socket_path, {'shutdown': True})
+            self.thread.join()
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.directory.cleanup()
+        QuoteChecker.parse_options(get_options())
@@ -0,0 +1,112 @@
+import contextlib
+import io
+import os
+import subprocess
+import tempfile
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.api import get_options
+from flake8_quotes.cli import filter_python_files, main
+from flake8_quotes.diff import get_changed_lines, parse_diff
+
+
+class ParseDiffTests(TestCase):
+    def test_parse_diff(self):
+        diff = [
+            'diff --git a/a.py b/a.py\n',
+            '--- a/a.py\n',
+            '+++ b/a.py\n',
+            '@@ -1 +1 @@\n',
+            '-x = 1\n',
+            '+x = 2\n',
+            '@@ -5,0 +6,3 @@ def f():\n',
+            '@@ -9,2 +12,0 @@\n',
+            'diff --git a/new.py b/new.py\n',
+            '--- /dev/null\n',
+            '+++ b/new.py\n',
+            '@@ -0,0 +1,2 @@\n',
+        ]
+        self.assertEqual(parse_diff(diff), {'a.py': {1, 6, 7, 8}, 'new.py': {1, 2}})
+
+    def test_parse_diff_paths(self):
+        # Paths with spaces end with a tab, those with quotes or control characters are C-quoted
+        diff = [
+            '+++ b/sp ace.py\t\n',
+            '@@ -0,0 +1 @@\n',
+            '+++ "b/q\\"t.py"\n',
+            '@@ -0,0 +2 @@\n',
+            '+++ "b/\\303\\251t\\\\e.py"\n',
+            '@@ -0,0 +3 @@\n',
+        ]
+        self.assertEqual(parse_diff(diff), {'sp ace.py': {1}, 'q"t.py': {2}, '\xe9t\\e.py': {3}})
+
+    def test_filter_python_files(self):
+        filenames = ['a.py', 'README.rst', os.path.join('.tox', 'b.py'), os.path.join('pkg', 'c.py')]
+        self.assertEqual(list(filter_python_files(filenames, '.tox,*.egg')), ['a.py', os.path.join('pkg', 'c.py')])
+
+
+class DiffBaseTests(TestCase):
+    def _git(self, *args):
+        subprocess.run(('git', '-c', 'user.name=test', '-c', 'user.email=test@example.com') + args,
+                       cwd=self.directory.name, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+
+    def _write(self, filename, contents):
+        with open(os.path.join(self.directory.name, filename), 'w') as f:
+            f.write(contents)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self._git('init', '-q')
+        self._write('changed.py', 'a = "old"\nb = 1\nc = 2\n')
+        self._write('unchanged.py', 'x = "old"\n')
+        self._git('add', '.')
+        self._git('commit', '-q', '-m', 'Initial commit')
+        self._git('branch', 'base')
+
+        self._write('changed.py', 'a = "old"\nb = "new"\nc = 2\nd = "new"\n')
+        self._git('commit', '-q', '-am', 'Change')
+        # Uncommitted changes count as well
+        self._write('changed.py', 'a = "old"\nb = "new"\nc = "uncommitted"\nd = "new"\n')
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+
+    def test_get_changed_lines(self):
+        self.assertEqual(get_changed_lines('base'), {'changed.py': {2, 3, 4}})
+        self.assertEqual(get_changed_lines('base', ['unchanged.py']), {})
+
+    def test_special_paths(self):
+        self._write('sp ace.py', 'x = "new"\n')
+        self._write('q"t.py', 'x = "new"\n')
+        self._git('add', 'sp ace.py', 'q"t.py')
+        self._git('commit', '-q', '-m', 'Special paths')
+        changed_lines = get_changed_lines('base')
+        self.assertEqual(changed_lines['sp ace.py'], {1})
+        self.assertEqual(changed_lines['q"t.py'], {1})
+
+    def test_untracked_files(self):
+        self._write('untracked.py', 'x = "new"\ny = "new"\n')
+        self._write('.gitignore', 'ignored.py\n')
+        self._write('ignored.py', 'x = "new"\n')
+        changed_lines = get_changed_lines('base')
+        self.assertEqual(changed_lines['untracked.py'], {1, 2})
+        self.assertNotIn('ignored.py', changed_lines)
+
+    def test_unknown_revision(self):
+        with self.assertRaises(ValueError):
+            get_changed_lines('missing')
+
+    def test_main(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            exit_code = main(['-j1', '--diff-base', 'base'])
+        self.assertEqual((exit_code, stdout.getvalue().splitlines()), (1, [
+            'changed.py:2:5: Q000 Double quotes found but single quotes preferred',
+            'changed.py:3:5: Q000 Double quotes found but single quotes preferred',
+            'changed.py:4:5: Q000 Double quotes found but single quotes preferred',
+        ]))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+        QuoteChecker.parse_options(get_options())
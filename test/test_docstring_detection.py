@@ -1,14 +1,20 @@
+import ast
+import io
+import os
 import tokenize
 from unittest import TestCase
 
-from flake8_quotes import Token, get_docstring_tokens
+from flake8_quotes import (
+    QuoteChecker, Token, get_ast_docstring_positions, get_docstring_positions, get_docstring_tokens,
+    mark_docstring_positions, mark_docstring_tokens,
+)
 from test.test_checks import get_absolute_path
 
 
 class GetDocstringTokensTests(TestCase):
     def _get_docstring_tokens(self, filename):
         with open(get_absolute_path(filename), 'r') as f:
-            tokens = [Token(t) for t in tokenize.generate_tokens(f.readline)]
+            tokens = list(tokenize.generate_tokens(f.readline))
         return get_docstring_tokens(tokens)
 
     def test_get_docstring_tokens_absent(self):
@@ -26,7 +32,7 @@ class GetDocstringTokensTests(TestCase):
 
     def test_get_docstring_tokens_doubles(self):
         with open(get_absolute_path('data/docstring_doubles.py'), 'r') as f:
-            tokens = [Token(t) for t in tokenize.generate_tokens(f.readline)]
+            tokens = list(tokenize.generate_tokens(f.readline))
         docstring_tokens = {t.string for t in get_docstring_tokens(tokens)}
         self.assertEqual(docstring_tokens, {
             '"""\nDouble quotes multiline module docstring\n"""',
@@ -35,6 +41,28 @@ class GetDocstringTokensTests(TestCase):
         })
 
     def test_get_docstring_tokens_singles(self):
+        with open(get_absolute_path('data/docstring_singles.py'), 'r') as f:
+            tokens = list(tokenize.generate_tokens(f.readline))
+        docstring_tokens = {t.string for t in get_docstring_tokens(tokens)}
+        self.assertEqual(docstring_tokens, {
+            "'''\nSingle quotes multiline module docstring\n'''",
+            "'''\n    Single quotes multiline class docstring\n    '''",
+            "'''\n        Single quotes multiline function docstring\n        '''",
+        })
+
+    def test_mark_docstring_tokens(self):
+        with open(get_absolute_path('data/docstring_doubles.py'), 'r') as f:
+            tokens = list(tokenize.generate_tokens(f.readline))
+        marked = list(mark_docstring_tokens(iter(tokens)))
+        self.assertEqual([token for token, _ in marked], tokens)
+        self.assertEqual({token for token, is_docstring in marked if is_docstring}, get_docstring_tokens(tokens))
+
+    def test_get_docstring_positions(self):
+        with open(get_absolute_path('data/docstring_singles.py'), 'r') as f:
+            tokens = list(tokenize.generate_tokens(f.readline))
+        self.assertEqual(get_docstring_positions(tokens), {(1, 0), (14, 4), (26, 8)})
+
+    def test_get_docstring_tokens_legacy_token_wrapper(self):
         with open(get_absolute_path('data/docstring_singles.py'), 'r') as f:
             tokens = [Token(t) for t in tokenize.generate_tokens(f.readline)]
         docstring_tokens = {t.string for t in get_docstring_tokens(tokens)}
@@ -43,3 +71,57 @@ class GetDocstringTokensTests(TestCase):
             "'''\n    Single quotes multiline class docstring\n    '''",
             "'''\n        Single quotes multiline function docstring\n        '''",
         })
+
+
+class AstDocstringPositionsTests(TestCase):
+    def _mark_both_ways(self, source):
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+        positions = get_ast_docstring_positions(ast.parse(source))
+        return list(mark_docstring_tokens(tokens)), list(mark_docstring_positions(tokens, positions))
+
+    def test_get_ast_docstring_positions(self):
+        with open(get_absolute_path('data/docstring_singles.py'), 'r') as f:
+            tree = ast.parse(f.read())
+        self.assertEqual(get_ast_docstring_positions(tree), {(1, 0), (14, 4), (26, 8)})
+
+    def test_same_as_tokens_on_data_files(self):
+        data_dir = get_absolute_path('data')
+        for filename in sorted(os.listdir(data_dir)):
+            with open(os.path.join(data_dir, filename), 'r') as f:
+                by_tokens, by_ast = self._mark_both_ways(f.read())
+            self.assertEqual(by_ast, by_tokens, filename)
+
+    def test_nested_definitions(self):
+        by_tokens, by_ast = self._mark_both_ways(
+            'if True:\n'
+            '    class A:\n'
+            '        try:\n'
+            '            pass\n'
+            '        finally:\n'
+            '            async def f():\n'
+            '                """doc"""\n'
+        )
+        self.assertEqual(by_ast, by_tokens)
+        self.assertEqual([token.string for token, is_docstring in by_ast if is_docstring], ['"""doc"""'])
+
+    def test_non_ascii_columns(self):
+        # AST columns are in UTF-8 bytes, token columns in characters
+        by_tokens, by_ast = self._mark_both_ways('def f(): "é"; x = "é"; "doc"\nclass É: "é"\n')
+        self.assertEqual(by_ast, by_tokens)
+        self.assertEqual([token.start for token, is_docstring in by_ast if is_docstring], [(1, 9), (2, 9)])
+
+    def test_quote_checker_ast_detection(self):
+        class Options():
+            inline_quotes = 'single'
+            multiline_quotes = 'single'
+            docstring_quotes = 'double'
+            quotes_docstring_detection = 'ast'
+        QuoteChecker.parse_options(Options)
+
+        filename = get_absolute_path('data/docstring_doubles.py')
+        with open(filename, 'r') as f:
+            tree = ast.parse(f.read())
+        ast_checker = QuoteChecker(tree, filename=filename)
+        token_checker = QuoteChecker(None, filename=filename)
+        self.assertEqual(list(ast_checker.run()), list(token_checker.run()))
+        self.assertEqual(len(list(ast_checker.run())), 5)
@@ -0,0 +1,128 @@
+import ast
+import os
+import shutil
+import stat
+import tempfile
+from unittest import TestCase, mock
+
+from flake8_quotes import QuoteChecker, generate_tokens
+from flake8_quotes.fixer import apply_fixes, fix_file, fix_string, get_fixes
+from test.test_checks import get_absolute_path
+
+
+class FixerTests(TestCase):
+    def setUp(self):
+        class Options():
+            inline_quotes = "'"
+            multiline_quotes = "'"
+            docstring_quotes = '"'
+        QuoteChecker.parse_options(Options)
+        self.config = QuoteChecker.config
+
+    def test_fix_string(self):
+        self.assertEqual(fix_string('"foo"', 'Q000', self.config), "'foo'")
+        self.assertEqual(fix_string('b"foo"', 'Q000', self.config), "b'foo'")
+        self.assertEqual(fix_string('"say \\"hi\\""', 'Q000', self.config), "'say \"hi\"'")
+        self.assertEqual(fix_string("'it\\'s'", 'Q003', self.config), '"it\'s"')
+        self.assertEqual(fix_string('"""foo"""', 'Q001', self.config), "'''foo'''")
+        self.assertEqual(fix_string('"""it\'s"""', 'Q001', self.config), "'''it's'''")
+        self.assertEqual(ast.literal_eval(fix_string('"""\'\'\'"""', 'Q001', self.config)), "'''")
+        self.assertEqual(fix_string("'doc'", 'Q002', self.config), '"""doc"""')
+        self.assertEqual(fix_string("'say \"hi\"'", 'Q002', self.config), '"""say "hi\\""""')
+
+    def test_fix_string_unfixable(self):
+        # Escaping the quote would change the value of a raw string
+        self.assertIsNone(fix_string('r\'ends with "\'', 'Q002', self.config))
+
+    def test_get_fixes(self):
+        lines = [
+            'x = "foo"\n',
+            'y = "bar"  # noqa\n',
+            'z = ("baz"\n',
+            '     "qux")\n',
+        ]
+        checker = QuoteChecker(None, lines=lines)
+        fixes = list(get_fixes(checker, lines))
+        self.assertEqual(fixes, [
+            ((1, 4), (1, 9), "'foo'"),
+            ((3, 5), (3, 10), "'baz'"),
+            ((4, 5), (4, 10), "'qux'"),
+        ])
+        self.assertEqual(apply_fixes(lines, fixes), (
+            "x = 'foo'\n"
+            'y = "bar"  # noqa\n'
+            "z = ('baz'\n"
+            "     'qux')\n"
+        ))
+
+    def test_get_fixes_streams_tokens(self):
+        lines = ['x = "foo"\n', 'y = "bar"\n', 'z = 1\n']
+        checker = QuoteChecker(None, lines=lines)
+
+        def tokens_then_fail(file_contents):
+            for token in generate_tokens(file_contents):
+                if token.start[0] > 2:
+                    raise AssertionError('Token stream consumed past the second line')
+                yield token
+
+        # The first fix is produced before the rest of the file is tokenized
+        checker.get_tokens = tokens_then_fail
+        self.assertEqual(next(get_fixes(checker, lines)), ((1, 4), (1, 9), "'foo'"))
+
+    def test_fix_file(self):
+        data_directory = get_absolute_path('data')
+        with tempfile.TemporaryDirectory() as directory:
+            for filename in sorted(os.listdir(data_directory)):
+                path = os.path.join(directory, filename)
+                shutil.copy(os.path.join(data_directory, filename), path)
+                with open(path, 'rb') as f:
+                    original = f.read()
+
+                fix_file(path)
+                with open(path, 'rb') as f:
+                    fixed = f.read()
+
+                # The code means the same and only unfixable errors are left
+                self.assertEqual(ast.dump(ast.parse(fixed)), ast.dump(ast.parse(original)), filename)
+                fixed_lines = fixed.decode('utf-8').splitlines(True)
+                self.assertEqual(list(get_fixes(QuoteChecker(None, lines=fixed_lines), fixed_lines)), [], filename)
+
+    def test_fix_file_replaces_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'script.py')
+            with open(path, 'w') as f:
+                f.write('x = "foo"\n')
+            os.chmod(path, 0o754)
+            self.assertEqual(fix_file(path), 1)
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o754)
+            self.assertEqual(os.listdir(directory), ['script.py'])
+
+            # The file is left as it was when it can't be replaced
+            with open(path, 'w') as f:
+                f.write('x = "foo"\n')
+            with mock.patch('os.replace', side_effect=OSError('read-only file system')):
+                with self.assertRaises(OSError):
+                    fix_file(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), 'x = "foo"\n')
+            self.assertEqual(os.listdir(directory), ['script.py'])
+
+    def test_fix_file_keeps_line_endings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'crlf.py')
+            with open(path, 'wb') as f:
+                f.write(b'x = "foo"\r\ny = "bar"\r\n')
+            self.assertEqual(fix_file(path), 2)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b"x = 'foo'\r\ny = 'bar'\r\n")
+
+    def test_fix_file_keeps_other_line_breaks(self):
+        # Form feeds and U+2028 are line breaks for `str.splitlines()`, but not for the tokenizer
+        source = 'x = "a"\n\x0c\ny = "b"\nz = """a\u2028b\nc\n"""\nw = "d\x0ce"\n'
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'breaks.py')
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write(source)
+            self.assertEqual(fix_file(path), 4)
+            with open(path, encoding='utf-8', newline='') as f:
+                self.assertEqual(f.read(), "x = 'a'\n\x0c\ny = 'b'\nz = \'\'\'a\u2028b\nc\n\'\'\'\nw = 'd\x0ce'\n")
@@ -0,0 +1,89 @@
+import os
+import random
+from unittest import TestCase, mock
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.incremental import IncrementalChecker
+from flake8_quotes.noqa import NoqaIndex
+from test.test_checks import get_absolute_path
+
+
+def get_errors(lines):
+    checker = QuoteChecker(None, lines=lines)
+    noqa_index = NoqaIndex.from_tokens(checker.get_tokens(lines))
+    return sorted((error['line'], error['col'], error['message'])
+                  for error in checker.get_quotes_errors(lines)
+                  if not noqa_index.is_suppressed(error['line'], error['message'][:4]))
+
+
+class IncrementalCheckerTests(TestCase):
+    def setUp(self):
+        class Options():
+            inline_quotes = "'"
+            multiline_quotes = "'"
+            docstring_quotes = '"'
+        QuoteChecker.parse_options(Options)
+
+    def test_update(self):
+        lines = [
+            'def foo():\n',
+            '    """doc"""\n',
+            '    x = "bar"\n',
+            '\n',
+            'y = "baz"\n',
+        ]
+        checker = IncrementalChecker(lines)
+        self.assertEqual(checker.errors, get_errors(lines))
+
+        # Replace line 2 by two lines, the first of which is now the docstring
+        new_lines = lines[:1] + ["    'doc'\n", '    z = 1\n'] + lines[2:]
+        self.assertEqual(checker.update(new_lines, 2, 2, 3), get_errors(new_lines))
+        self.assertEqual(checker.errors, [
+            (2, 4, 'Q002 Single quote docstring found but double quotes preferred'),
+            (4, 8, 'Q000 Double quotes found but single quotes preferred'),
+            (6, 4, 'Q000 Double quotes found but single quotes preferred'),
+        ])
+
+    def test_update_stops_early(self):
+        lines = ['x = "foo"\n'] * 1000
+        checker = IncrementalChecker(lines)
+
+        new_lines = lines[:10] + ["x = 'foo'\n"] + lines[11:]
+        with mock.patch.object(checker.checker, '_check_string', wraps=checker.checker._check_string) as check_string:
+            self.assertEqual(checker.update(new_lines, 11, 11, 11), get_errors(new_lines))
+        # Only the strings around the change have been checked again
+        self.assertLess(check_string.call_count, 5)
+        self.assertEqual(checker._restart_rows, list(range(1, 1002)))
+
+    def test_update_random(self):
+        pool = []
+        data_directory = get_absolute_path('data')
+        for filename in sorted(os.listdir(data_directory)):
+            with open(os.path.join(data_directory, filename)) as f:
+                pool.extend(f.readlines())
+        pool.extend(['# flake8-quotes: off\n', '# flake8-quotes: on\n', 'x = "foo"  # noqa: Q000\n'])
+
+        random_ = random.Random(0)
+        for _ in range(50):
+            lines = [random_.choice(pool) for _ in range(random_.randint(1, 40))]
+            try:
+                expected = get_errors(lines)
+            except Exception:
+                continue
+            checker = IncrementalChecker(lines)
+            self.assertEqual(checker.errors, expected)
+
+            for _ in range(10):
+                start_line = random_.randint(1, len(lines) + 1)
+                old_end_line = max(min(len(lines), start_line + random_.randint(-1, 3)), start_line - 1)
+                inserted = [random_.choice(pool) for _ in range(random_.randint(0, 4))]
+                new_lines = lines[:start_line - 1] + inserted + lines[old_end_line:]
+                if not new_lines:
+                    continue
+                try:
+                    expected = get_errors(new_lines)
+                except Exception:
+                    break
+                errors = checker.update(new_lines, start_line, old_end_line, start_line - 1 + len(inserted))
+                self.assertEqual(sorted(errors), expected, ''.join(new_lines))
+                lines = new_lines
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.noqa import NoqaIndex
+
+
+class NoqaIndexTests(TestCase):
+    def test_noqa(self):
+        noqa_index = NoqaIndex()
+        noqa_index.add_comment('# noqa', 1)
+        noqa_index.add_comment('# NOQA: Q000, Q003', 2)
+        noqa_index.add_comment('# noqa:Q0', 3)
+        noqa_index.add_comment('# noqa: E501', 4)
+        noqa_index.add_comment('# comment', 5)
+        self.assertEqual(noqa_index.lines, {1: (), 2: ('Q000', 'Q003'), 3: ('Q0',), 4: ('E501',)})
+
+        self.assertTrue(noqa_index.is_suppressed(1, 'Q001'))
+        self.assertTrue(noqa_index.is_suppressed(2, 'Q003'))
+        self.assertFalse(noqa_index.is_suppressed(2, 'Q001'))
+        self.assertTrue(noqa_index.is_suppressed(3, 'Q002'))
+        self.assertFalse(noqa_index.is_suppressed(4, 'Q000'))
+        self.assertFalse(noqa_index.is_suppressed(5, 'Q000'))
+
+    def test_regions(self):
+        noqa_index = NoqaIndex()
+        noqa_index.add_comment('# flake8-quotes: off', 2)
+        self.assertTrue(noqa_index.off)
+        noqa_index.add_comment('# flake8-quotes: on', 4)
+        self.assertFalse(noqa_index.off)
+        noqa_index.add_comment('# flake8-quotes: off', 6)
+
+        self.assertEqual([row for row in range(1, 9) if noqa_index.is_suppressed(row, 'Q000')], [2, 3, 4, 6, 7, 8])
+
+
+class NoqaCheckTests(TestCase):
+    def setUp(self):
+        class Options():
+            inline_quotes = "'"
+        QuoteChecker.parse_options(Options)
+
+    def _run(self, lines):
+        return [error[:3] for error in QuoteChecker(None, lines=lines).run()]
+
+    def test_noqa_codes(self):
+        self.assertEqual(self._run([
+            'x = "foo"  # noqa: Q000\n',
+            'x = "foo"  # noqa: Q003\n',
+            "x = 'it\\'s' + \"foo\"  # noqa: Q003\n",
+        ]), [
+            (2, 4, 'Q000 Double quotes found but single quotes preferred'),
+            (3, 14, 'Q000 Double quotes found but single quotes preferred'),
+        ])
+
+    def test_noqa_other_plugin_codes(self):
+        # Codes with a multi-letter prefix only suppress themselves, not every error like a bare `noqa`
+        self.assertEqual(self._run([
+            'x = "foo"  # noqa: ABC123\n',
+            'x = "foo"  # noqa: PTH118, Q000\n',
+        ]), [
+            (1, 4, 'Q000 Double quotes found but single quotes preferred'),
+        ])
+
+    def test_regions(self):
+        self.assertEqual(self._run([
+            'x = "foo"\n',
+            '# flake8-quotes: off\n',
+            'x = "foo"\n',
+            'x = """foo\n',
+            '"""\n',
+            'x = "foo"  # flake8-quotes: on\n',
+            'x = "foo"\n',
+        ]), [
+            (1, 4, 'Q000 Double quotes found but single quotes preferred'),
+            (7, 4, 'Q000 Double quotes found but single quotes preferred'),
+        ])
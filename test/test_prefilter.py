@@ -0,0 +1,102 @@
+import itertools
+import os
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.prefilter import is_trivially_compliant
+from test.test_checks import get_absolute_path
+
+SNIPPETS = [
+    'x = 1\n',
+    "'Single quotes module docstring'\n",
+    '"Double quotes module docstring"\n',
+    "'''Single quotes module docstring'''\n",
+    '"""Double quotes module docstring"""\n',
+    "def f():\n    'Single quotes function docstring'\n",
+    'def f():\n    u"Prefixed function docstring"\n',
+    "def f(): 'One-liner docstring'\n",
+    "def f(x: 'int') -> 'str': 'Docstring after annotations'\n",
+    "def f(\n    x,\n): 'Docstring after a multiline signature'\n",
+    "class A:  # comment\n\n    'Class docstring after a comment'\n",
+    "def f():\n    # comment\n    '''Function docstring after a comment'''\n",
+    "if True:\n    pass\n'Not a docstring'\n",
+    "x = {'a': 'b'}\n",
+    'x = {"a": "b"}\n',
+    "x = ''\n",
+    'x = ""\n',
+    "x = 'it\\'s'\n",
+    'x = "say \\"hi\\""\n',
+    "x = r'\\''\n",
+    "x = '''multiline'''\n",
+    'x = """multiline"""\n',
+    'x = """multiline""" + "inline"\n',
+    'x = """"multiline" with a quote"""\n',
+    'def f():\n    """Docstring."""\n    return """multiline"""\n',
+    "def f():\n    '''Docstring.'''\n    return '''multiline'''\n",
+    "x = ('implicit'\n     'concatenation')\n",
+    "x = 'continued' \\\n    'line'\n",
+    "x = f'{y}'\n",
+    'x = f"{y}"\n',
+    "x = f'''{y}'''\n",
+    "x = f'{y['a']}'\n",
+    'x = f"{y["a"]}"\n',
+    "x = f'{y}' 'a'  # noqa\n",
+]
+
+
+class PrefilterTests(TestCase):
+    """Differential tests checking the pre-filter never hides errors of the full check"""
+
+    def _iter_configs(self):
+        for inline, multiline, docstring, avoid_escape, check_inside_f_strings in itertools.product(
+                ["'", '"'], ["'", '"'], ["'", '"'], [True, False], [True, False]):
+            class Options():
+                inline_quotes = inline
+                multiline_quotes = multiline
+                docstring_quotes = docstring
+            Options.avoid_escape = avoid_escape
+            Options.check_inside_f_strings = check_inside_f_strings
+            QuoteChecker.parse_options(Options)
+            yield QuoteChecker.config
+
+    def _iter_sources(self):
+        for snippet in SNIPPETS:
+            yield snippet.splitlines(True)
+        data_directory = get_absolute_path('data')
+        for filename in sorted(os.listdir(data_directory)):
+            with open(os.path.join(data_directory, filename)) as f:
+                yield f.readlines()
+
+    def test_never_skips_errors(self):
+        skipped = 0
+        for config in self._iter_configs():
+            for lines in self._iter_sources():
+                if not is_trivially_compliant(lines, config):
+                    continue
+                skipped += 1
+                checker = QuoteChecker(None, lines=lines)
+                self.assertEqual(list(checker.get_quotes_errors(lines)), [], (config, lines))
+        # Make sure the fast path is actually exercised
+        self.assertGreater(skipped, 0)
+
+    def test_run_matches_full_check(self):
+        for config in self._iter_configs():
+            for lines in self._iter_sources():
+                checker = QuoteChecker(None, lines=lines)
+                noqa_line_numbers = checker.get_noqa_lines(lines)
+                expected = [
+                    (error['line'], error['col'], error['message'], QuoteChecker)
+                    for error in checker.get_quotes_errors(lines)
+                    if error['line'] not in noqa_line_numbers
+                ]
+                self.assertEqual(list(checker.run()), expected, (config, lines))
+
+    def test_trivially_compliant(self):
+        class Options():
+            inline_quotes = "'"
+        QuoteChecker.parse_options(Options)
+        self.assertTrue(is_trivially_compliant(['x = 1\n'], QuoteChecker.config))
+        self.assertTrue(is_trivially_compliant(['"""Docstring."""\n', "x = 'a'\n"], QuoteChecker.config))
+        self.assertFalse(is_trivially_compliant(["'Docstring.'\n"], QuoteChecker.config))
+        self.assertFalse(is_trivially_compliant(['x = "a"\n'], QuoteChecker.config))
+        self.assertFalse(is_trivially_compliant(["x = 'it\\'s'\n"], QuoteChecker.config))
@@ -0,0 +1,77 @@
+import contextlib
+import io
+import os
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker, generate_tokens, readlines
+from flake8_quotes.cli import main
+from flake8_quotes.profiling import PHASES, FileProfile
+from test.test_checks import get_absolute_path
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        class Options():
+            inline_quotes = "'"
+            quotes_profile = True
+        QuoteChecker.parse_options(Options)
+        self.profiler = QuoteChecker.profiler
+        self.addCleanup(self._finish)
+
+    def _finish(self):
+        if os.path.isdir(self.profiler.directory):
+            self.profiler.finish(io.StringIO())
+        QuoteChecker.profiler = None
+
+    def test_file_profile(self):
+        file_profile = FileProfile('test.py')
+        self.assertEqual(list(file_profile.timed('tokenize', range(3))), [0, 1, 2])
+        self.assertEqual(list(file_profile.timed('noqa', file_profile.timed('tokenize', range(2)))), [0, 1])
+        record = file_profile.to_json()
+        self.assertEqual(record['tokens'], 5)
+        self.assertEqual(set(record['times']), set(PHASES))
+        self.assertTrue(all(seconds >= 0 for seconds in record['times'].values()))
+
+    def test_prefilter_time(self):
+        file_profile = FileProfile('test.py')
+        file_profile.times.update(read=1.0, tokenize=2.0, noqa=3.0)
+        file_profile.add_prefilter_time(0.5, 'read')
+        file_profile.add_prefilter_time(0.25, 'tokenize')
+        times = file_profile.to_json()['times']
+        self.assertEqual((times['read'], times['prefilter'], times['tokenize'], times['noqa']), (0.5, 0.75, 1.75, 1.0))
+
+    def test_run_with_file_tokens(self):
+        # Like under flake8, no file is read and the prefilter runs on the lines it gives
+        lines = readlines(get_absolute_path('data/singles.py'))
+        checker = QuoteChecker(None, lines=lines, file_tokens=list(generate_tokens(lines)))
+        self.assertEqual(list(checker.run()), [])
+        record = self.profiler.get_records()[0]
+        self.assertGreater(record['times']['prefilter'], 0.0)
+        self.assertEqual(record['times']['prefilter'], checker.prefilter_time)
+
+    def test_run(self):
+        filename = get_absolute_path('data/doubles.py')
+        checker = QuoteChecker(None, filename=filename)
+        self.assertEqual(len(list(checker.run())), 3)
+        records = self.profiler.get_records()
+        self.assertEqual([record['filename'] for record in records], [filename])
+        self.assertGreater(records[0]['tokens'], 0)
+        self.assertEqual(records[0]['strings'], 3)
+        self.assertEqual(records[0]['verdict_cache_hits'] + records[0]['verdict_cache_misses'], 3)
+
+    def test_report_across_jobs(self):
+        directory = get_absolute_path('data')
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(['-j2', '--quotes-profile', directory])
+        # All workers recorded into the directory of the first profiler, which reports at exit
+        self.assertEqual(QuoteChecker.profiler.directory, self.profiler.directory)
+        self.assertEqual(len(self.profiler.get_records()), len(os.listdir(directory)))
+        self.assertGreater(len(os.listdir(self.profiler.directory)), 1)
+
+        stream = io.StringIO()
+        self.profiler.finish(stream)
+        report = stream.getvalue()
+        self.assertTrue(report.startswith('flake8-quotes profile: {0} files'.format(len(os.listdir(directory)))))
+        self.assertIn('Slowest files:', report)
+        self.assertIn('Verdict cache: ', report)
+        self.assertFalse(os.path.exists(self.profiler.directory))
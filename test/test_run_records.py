@@ -0,0 +1,43 @@
+import os
+from unittest import TestCase
+
+from flake8_quotes.run_records import RunRecords
+
+
+class Record(object):
+    def __init__(self, value):
+        self.value = value
+
+    def to_json(self):
+        return {'value': self.value}
+
+
+class Records(RunRecords):
+    DIRECTORY_ENVIRONMENT_VARIABLE = 'FLAKE8_QUOTES_TEST_RECORDS_DIR'
+    DIRECTORY_PREFIX = 'flake8-quotes-test-'
+
+    def __init__(self, directory, label=None):
+        super(Records, self).__init__(directory)
+        self.label = label
+
+    def finish(self):
+        self.close()
+
+
+class RunRecordsTests(TestCase):
+    def test_from_environment(self):
+        records = Records.from_environment(label='main')
+        self.addCleanup(records.close)
+        self.assertEqual(os.environ[Records.DIRECTORY_ENVIRONMENT_VARIABLE], records.directory)
+        self.assertEqual(records.label, 'main')
+
+        # Workers record into the same directory, leaving it to the main process
+        worker = Records.from_environment(label='main')
+        self.assertEqual((worker.directory, worker.label), (records.directory, None))
+        records.add(Record(1))
+        worker.add(Record(2))
+        self.assertEqual(records.get_records(), [{'value': 1}, {'value': 2}])
+
+        records.close()
+        self.assertFalse(os.path.exists(records.directory))
+        self.assertNotIn(Records.DIRECTORY_ENVIRONMENT_VARIABLE, os.environ)
@@ -0,0 +1,109 @@
+import glob
+import io
+import os
+import sys
+import tokenize
+from unittest import TestCase, skipIf
+
+from benchmarks.corpus import make_corpus
+from flake8_quotes import QuoteChecker, mark_docstring_tokens
+from flake8_quotes.api import get_options
+from flake8_quotes.scanner import scan_tokens
+from test.test_checks import get_absolute_path
+
+_IS_PEP701 = sys.version_info[:2] >= (3, 12)
+
+SOURCES = [
+    # Prefixes, adjacent strings and strings right after keywords
+    'if"a":pass\nprint(rb"x", Rb\'y\', bR"""z""", u"w", br"\\"")\nx = """a""""b"\n',
+    # Line continuations, inside and outside strings
+    'x = 1; y = "s"\\\n  "t"\nz = "a\\\nb"\n',
+    # Docstrings after headers with brackets, annotations and decorators
+    "class A(B, metaclass=M):\n  '''doc'''\n",
+    '@dec\nasync def f(a: "int" = 1, b=lambda: (1, 2)) -> dict[str, "A"]:\n  """doc"""\n  "not"\n',
+    'def f(\n    a,  # comment with "quotes"\n): "doc"\nclass_ = "s"; defined = "t"\n',
+    'x = {"a": 1}[\'a\']\n\n\n"""Not a docstring"""\n',
+    # F-strings, with nested quotes, fields, format specs and comments
+    'x = f"{x["a"]}" + f\'{y!r:>{w}}\'\n',
+    'f"""a\n{\n  y +\\\n f"{z}" }\nb"""\n',
+    'f"\\N{DASH} {x:{y}.{z}f} {{}} {a=} {b!s}"\n',
+    'f"{ {\'a\': 1}[\'a\'] }" # c\n',
+    'f"{x:%H:%M}" "s"\n',
+    'rf"\\{x}\\d{y}"\n',
+    "f'''{x # comment\n}'''\n",
+    'def f():\n    f"doc"\n    "not"\n',
+]
+
+
+class ScannerTests(TestCase):
+    def _get_strings(self, tokens, check_inside_f_strings):
+        class Options():
+            inline_quotes = "'"
+        Options.check_inside_f_strings = check_inside_f_strings
+        QuoteChecker.parse_options(Options)
+
+        tokens = list(tokens)
+        strings = list(QuoteChecker(None)._iter_strings(mark_docstring_tokens(tokens)))
+        comments = [(token.string, token.start) for token in tokens if token.type == tokenize.COMMENT]
+        return strings, comments
+
+    def assertScansLikeTokenize(self, source):
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+        for check_inside_f_strings in (False, True):
+            self.assertEqual(self._get_strings(scan_tokens(source), check_inside_f_strings),
+                             self._get_strings(tokens, check_inside_f_strings))
+
+    def test_sources(self):
+        for source in SOURCES:
+            with self.subTest(source=source):
+                self.assertScansLikeTokenize(source)
+
+    def test_data_files(self):
+        for filename in sorted(glob.glob(get_absolute_path('data/*.py'))):
+            with self.subTest(filename=filename), open(filename) as f:
+                self.assertScansLikeTokenize(f.read())
+
+    def test_corpus(self):
+        for filename, file_contents in make_corpus(files=20):
+            with self.subTest(filename=filename):
+                self.assertScansLikeTokenize(''.join(file_contents))
+
+    def test_standard_library(self):
+        for filename in (tokenize.__file__, glob.__file__, os.__file__, io.__file__):
+            with self.subTest(filename=filename), open(filename, encoding='utf-8') as f:
+                self.assertScansLikeTokenize(f.read())
+
+    def test_unterminated_strings(self):
+        with self.assertRaises(tokenize.TokenError):
+            list(scan_tokens('x = """foo\n'))
+        # Like `tokenize`, only the quote of an unterminated single-line string is reported
+        self.assertEqual([(token.type, token.string) for token in scan_tokens('x = "foo\ny = 1\n')], [
+            (tokenize.OP, 'x = '), (tokenize.OP, '"'), (tokenize.OP, 'foo\ny = 1\n'),
+        ])
+
+    @skipIf(not _IS_PEP701, 'Python 3.12+ only')
+    def test_unterminated_fstrings(self):
+        with self.assertRaises(tokenize.TokenError):
+            list(scan_tokens('x = f"""{foo}\n'))
+        with self.assertRaises(tokenize.TokenError):
+            list(scan_tokens('x = f"{foo\n'))
+
+    def test_lexer_option(self):
+        class Options():
+            inline_quotes = "'"
+            quotes_lexer = 'scanner'
+        QuoteChecker.parse_options(Options)
+
+        lines = ['x = "foo"  # noqa\n', 'y = 1\n']
+        self.assertEqual(list(QuoteChecker(None).get_tokens(lines)), list(scan_tokens(''.join(lines))))
+        for filename in ('data/doubles.py', 'data/doubles_noqa.py', 'data/docstring_singles.py'):
+            with self.subTest(filename=filename):
+                Options.quotes_lexer = 'scanner'
+                QuoteChecker.parse_options(Options)
+                errors = list(QuoteChecker(None, filename=get_absolute_path(filename)).run())
+                Options.quotes_lexer = 'tokenize'
+                QuoteChecker.parse_options(Options)
+                self.assertEqual(errors, list(QuoteChecker(None, filename=get_absolute_path(filename)).run()))
+
+    def tearDown(self):
+        QuoteChecker.parse_options(get_options())
@@ -0,0 +1,54 @@
+import concurrent.futures
+import os
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.api import get_options
+from test.test_checks import get_absolute_path
+
+
+class SettingsTests(TestCase):
+    def setUp(self):
+        QuoteChecker.parse_options(get_options())
+
+    def test_get_settings(self):
+        config = QuoteChecker.config
+        settings = QuoteChecker.get_settings(get_options({'inline-quotes': 'double'}))
+        self.assertEqual(settings.config['good_single'], '"')
+        # The options of the class are left as they are
+        self.assertIs(QuoteChecker.config, config)
+        self.assertEqual(QuoteChecker.config['good_single'], "'")
+
+    def test_immutable(self):
+        settings = QuoteChecker.get_settings(get_options())
+        with self.assertRaises(TypeError):
+            settings.config['good_single'] = '"'
+        with self.assertRaises(AttributeError):
+            settings.lexer = 'scanner'
+
+    def test_checker_settings(self):
+        filename = get_absolute_path('data/singles.py')
+        settings = QuoteChecker.get_settings(get_options({'inline-quotes': 'double'}))
+        self.assertEqual(len(list(QuoteChecker(None, filename=filename, settings=settings).run())), 3)
+        self.assertEqual(list(QuoteChecker(None, filename=filename).run()), [])
+
+    def test_mixed_settings_in_threads(self):
+        directory = get_absolute_path('data')
+        filenames = sorted(os.path.join(directory, filename) for filename in os.listdir(directory))
+        configs = [
+            {},
+            {'inline-quotes': 'double'},
+            {'inline-quotes': 'double', 'multiline-quotes': "'''", 'docstring-quotes': "'''"},
+            {'avoid-escape': False, 'quotes-lexer': 'scanner'},
+        ]
+        all_settings = [QuoteChecker.get_settings(get_options(config)) for config in configs]
+
+        def check(settings, filename):
+            return list(QuoteChecker(None, filename=filename, settings=settings).run())
+
+        checks = [(settings, filename) for settings in all_settings for filename in filenames] * 10
+        expected = [check(settings, filename) for settings, filename in checks]
+        # Each configuration reports different errors
+        self.assertEqual(len({repr(expected[i * len(filenames):(i + 1) * len(filenames)]) for i in range(4)}), 4)
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            self.assertEqual(list(executor.map(lambda args: check(*args), checks)), expected)
@@ -0,0 +1,96 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.cli import main
+from flake8_quotes.stats import FileStats, merge, to_openmetrics
+from test.test_checks import get_absolute_path
+
+
+class StatsTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, 'stats.json')
+
+        class Options():
+            inline_quotes = "'"
+            quotes_stats = self.path
+        QuoteChecker.parse_options(Options)
+        self.stats = QuoteChecker.stats
+        self.addCleanup(self._finish)
+
+    def _finish(self):
+        if os.path.isdir(self.stats.directory):
+            self.stats.finish()
+        QuoteChecker.stats = None
+
+    def test_file_stats(self):
+        file_stats = FileStats()
+        self.assertEqual(list(file_stats.count_tokens(range(3))), [0, 1, 2])
+        strings = [
+            ('"a"', None, None, False),
+            ('rb"""a"""', None, None, False),
+            ("F'{a}'", None, None, False),
+            ('"""a"""', None, None, True),
+        ]
+        self.assertEqual(list(file_stats.count_strings(strings)), strings)
+        record = file_stats.to_json()
+        self.assertEqual(record['tokens'], 3)
+        self.assertEqual(record['strings'], {'inline': 1, 'multiline': 1, 'docstring': 1, 'f-string': 1})
+
+    def test_merge(self):
+        checked = FileStats()
+        checked.tokens = 10
+        checked.errors = {'Q003': 1, 'Q000': 2}
+        cached = FileStats('cached')
+        cached.errors = {'Q000': 1}
+        totals = merge([checked.to_json(), cached.to_json(), FileStats('prefiltered').to_json()])
+        self.assertEqual(totals['files'], {'checked': 1, 'prefiltered': 1, 'cached': 1})
+        self.assertEqual(totals['tokens'], 10)
+        self.assertEqual(list(totals['errors'].items()), [('Q000', 3), ('Q003', 1)])
+
+        metrics = to_openmetrics(totals)
+        self.assertIn('# TYPE flake8_quotes_files counter\n', metrics)
+        self.assertIn('flake8_quotes_files_total{outcome="cached"} 1\n', metrics)
+        self.assertIn('flake8_quotes_tokens_total 10\n', metrics)
+        self.assertIn('flake8_quotes_errors_total{code="Q000"} 3\n', metrics)
+        self.assertTrue(metrics.endswith('# EOF\n'))
+
+    def test_run(self):
+        self.assertEqual(len(list(QuoteChecker(None, filename=get_absolute_path('data/doubles.py')).run())), 3)
+        self.assertEqual(list(QuoteChecker(None, filename=get_absolute_path('data/singles.py')).run()), [])
+        totals = self.stats.get_totals()
+        self.assertEqual(totals['files'], {'checked': 1, 'prefiltered': 1, 'cached': 0})
+        self.assertGreater(totals['tokens'], 0)
+        self.assertEqual(totals['strings']['inline'], 3)
+        self.assertEqual(totals['errors'], {'Q000': 3})
+        self.assertEqual(totals['verdict_cache']['hits'] + totals['verdict_cache']['misses'], 3)
+
+    def test_get_quotes_errors(self):
+        checker = QuoteChecker(None)
+        errors = list(checker.get_quotes_errors(['x = "a"\n', "y = '''b'''\n"]))
+        self.assertEqual(len(errors), 2)
+        totals = self.stats.get_totals()
+        self.assertEqual(totals['strings']['multiline'], 1)
+        self.assertEqual(totals['errors'], {'Q000': 1, 'Q001': 1})
+
+    def test_across_jobs(self):
+        directory = get_absolute_path('data')
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(['-j2', '--quotes-stats', self.path, directory])
+        # All workers recorded into the directory of the first stats, which are written out at exit
+        self.assertEqual(QuoteChecker.stats.directory, self.stats.directory)
+        self.assertGreater(len(os.listdir(self.stats.directory)), 1)
+        totals = self.stats.get_totals()
+        self.assertEqual(sum(totals['files'].values()), len(os.listdir(directory)))
+
+        self.stats.finish()
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), totals)
+        self.assertFalse(os.path.exists(self.stats.directory))
@@ -0,0 +1,58 @@
+import argparse
+from unittest import TestCase
+
+from flake8_quotes import QuoteChecker
+from flake8_quotes.string_checks import (
+    MAX_CACHED_STRING_LENGTH, compile_string_check, get_verdict_cache_stats, parse_cache_size,
+)
+
+
+class CompileStringCheckTests(TestCase):
+    def setUp(self):
+        class Options():
+            inline_quotes = '"'
+            multiline_quotes = "'"
+        QuoteChecker.parse_options(Options)
+        self.config = QuoteChecker.config
+
+    def test_check(self):
+        check = compile_string_check(self.config)
+        self.assertIsNone(check('"foo"', False))
+        self.assertIsNone(check('\'say "hi"\'', False))
+        self.assertIsNone(check('r"\\"foo"', False))
+        self.assertEqual(check("b'foo'", False), 'Q000 Single quotes found but double quotes preferred')
+        self.assertEqual(check('"\\"foo\\""', False), 'Q003 Change outer quotes to avoid escaping inner quotes')
+        self.assertIsNone(check("'''foo'''", False))
+        self.assertEqual(check('"""foo"""', False), 'Q001 Double quote multiline found but single quotes preferred')
+        self.assertIsNone(check('"""foo"""', True))
+        self.assertEqual(check("'''foo'''", True), 'Q002 Single quote docstring found but double quotes preferred')
+
+    def test_compiled_once(self):
+        self.assertIs(compile_string_check(self.config), compile_string_check(dict(self.config)))
+        self.assertIs(QuoteChecker.check_string, compile_string_check(self.config))
+
+    def test_verdict_cache(self):
+        check = compile_string_check(self.config, cache_size=2)
+        check.cache_clear()
+        for token_string in ("'foo'", "'foo'", '"bar"', "'foo'", '"baz"'):
+            check(token_string, False)
+        # `"baz"` evicted `"bar"`, `'foo'` having been used since
+        self.assertEqual(check("'foo'", False), 'Q000 Single quotes found but double quotes preferred')
+        self.assertEqual(get_verdict_cache_stats(check), {'hits': 3, 'misses': 3, 'size': 2, 'max_size': 2})
+
+        # Long strings are checked without being kept in the cache
+        long_string = "'{0}'".format('x' * MAX_CACHED_STRING_LENGTH)
+        self.assertEqual(check(long_string, False), 'Q000 Single quotes found but double quotes preferred')
+        self.assertEqual(check(long_string, False), 'Q000 Single quotes found but double quotes preferred')
+        self.assertEqual(get_verdict_cache_stats(check), {'hits': 3, 'misses': 3, 'size': 2, 'max_size': 2})
+
+        # Each configuration has its own cache, which can be turned off
+        self.assertIsNot(compile_string_check(dict(self.config, avoid_escape=False), cache_size=2), check)
+        self.assertIsNone(get_verdict_cache_stats(compile_string_check(self.config, cache_size=0)))
+
+    def test_parse_cache_size(self):
+        self.assertEqual(parse_cache_size('0'), 0)
+        self.assertEqual(parse_cache_size('128'), 128)
+        for value in ('-1', 'x'):
+            with self.subTest(value=value), self.assertRaises(argparse.ArgumentTypeError):
+                parse_cache_size(value)